@@ -1,19 +1,43 @@
 #!/usr/bin/env python3
+import os
 import sys
 from spotpress.qtcompat import QApplication, QIcon
-from spotpress.ipc import send_command_to_existing_instance, setup_ipc_server
+from spotpress.ipc import send_commands_to_existing_instance, setup_ipc_server
 from spotpress.utils import load_dark_theme
+from spotpress import logger
+from spotpress.logwriter import DEFAULT_DIR as DEFAULT_LOG_DIR
 from spotpress.ui.preferences_window import (
     SpotpressPreferences,
     ICON_FILE,
 )
 
+# Só valem ao iniciar; não são repassados a uma instância em execução
+STARTUP_ONLY = ("--debug", "--log=")
+
+
+def forwarded_commands(args):
+    """(um comando IPC por argumento, com caminhos absolutos; ignorados)"""
+    commands = []
+    ignored = []
+    for arg in args:
+        if arg.startswith(STARTUP_ONLY):
+            ignored.append(arg)
+        elif arg.startswith(("--record=", "--log-file=")):
+            # O arquivo é aberto pela instância em execução, em outro diretório
+            flag, path = arg.split("=", 1)
+            commands.append(f"{flag}={os.path.abspath(os.path.expanduser(path))}")
+        else:
+            commands.append(arg)
+    return commands, ignored
+
 
 if __name__ == "__main__":
-    # Envia comando se outra instância estiver ativa
+    # Envia os comandos se outra instância estiver ativa
     if len(sys.argv) > 1:
-        command = " ".join(sys.argv[1:])
-        if send_command_to_existing_instance(command):
+        commands, ignored = forwarded_commands(sys.argv[1:])
+        if send_commands_to_existing_instance(commands):
+            for arg in ignored:
+                print(f"[IPC] {arg} só vale ao iniciar o SpotPress; ignorado")
             sys.exit(0)
 
     debug_mode = False
@@ -21,12 +45,31 @@ if __name__ == "__main__":
         print("[DEBUG] Running in debug mode...")
         debug_mode = True
 
+    record_path = None
+    log_dir = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--record="):
+            record_path = arg.split("=", 1)[1]
+        elif arg == "--log-file":
+            log_dir = DEFAULT_LOG_DIR
+        elif arg.startswith("--log-file="):
+            log_dir = arg.split("=", 1)[1]
+        elif arg.startswith("--log="):
+            # Níveis por subsistema, ex.: --log=hw=DEBUG,ipc=INFO
+            try:
+                logger.configure(subsystems=logger.parse_spec(arg.split("=", 1)[1]))
+            except ValueError as e:
+                print(f"[ERRO] {e}")
+                sys.exit(2)
+
     app = QApplication(sys.argv)
     app.setApplicationName("SpotPress")
     app.setWindowIcon(QIcon(ICON_FILE))
     load_dark_theme(app)
 
-    window = SpotpressPreferences(debug_mode)
+    window = SpotpressPreferences(
+        debug_mode, record_path=record_path, log_dir=log_dir
+    )
 
     window.ipc_server = setup_ipc_server(  # pyright: ignore
         window.handle_command_from_ipc
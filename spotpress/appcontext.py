@@ -1,16 +1,18 @@
-from spotpress.utils import MODE_MOUSE, ObservableDict
+from spotpress.utils import CONFIG_PATH, MODE_MOUSE
+from spotpress.config import ConfigStore
+from spotpress.logger import INFO, get_logger
 
 from spotpress.qtcompat import QObject, pyqtSignal
 
 
 class AppContext(QObject):
-    configChanged = pyqtSignal(str, object)  # chave, valor
+    configChanged = pyqtSignal(object)  # {chave: valor}, um por conjunto de mudanças
     currentModeChanged = pyqtSignal(int)
+    slideChanged = pyqtSignal(int)  # +1 próximo, -1 anterior
 
     def __init__(
         self,
         screen_index=0,
-        log_function=None,
         overlay_window=None,
         show_info_function=None,
         show_overlay_function=None,
@@ -22,7 +24,7 @@ class AppContext(QObject):
         super().__init__()
         self._debug_mode = debug_mode
         self._screen_index = screen_index
-        self._log_function = log_function
+        self._logger = get_logger("app")
         self._spotlight_overlay_window = overlay_window
         self._info_overlay_window = None
         self._show_info_function = show_info_function
@@ -30,7 +32,7 @@ class AppContext(QObject):
         self._hide_overlay_function = hide_overlay_function
         self._active_device_changed_function = active_device_changed_function
         self._compatible_modes = []
-        self._config = ObservableDict(callback=self._on_config_changed)
+        self._config = ConfigStore(CONFIG_PATH, parent=self)
         self._support_auto_mode = False
         self._current_mode = MODE_MOUSE
         self._main_window = main_window
@@ -38,7 +40,12 @@ class AppContext(QObject):
         self._current_screen_heigth = 600
         self._ui_ready = False
         self._device_monitor = None
+        self._ui = None
+        self._event_writer = None
+        self._recorder = None
+        self._log_writer = None
 
+        self._config.changed.connect(self.configChanged)
         self.configChanged.connect(self._on_config_changed_signal)
 
     @property
@@ -89,6 +96,7 @@ class AppContext(QObject):
     def current_mode(self, mode):
         if mode != self._current_mode:
             self._current_mode = mode
+            self._config["modes_current_mode"] = mode
             self.currentModeChanged.emit(mode)
 
     @property
@@ -107,6 +115,30 @@ class AppContext(QObject):
     def ui(self, uid):
         self._ui = uid
 
+    @property
+    def event_writer(self):
+        return self._event_writer
+
+    @event_writer.setter
+    def event_writer(self, writer):
+        self._event_writer = writer
+
+    @property
+    def recorder(self):
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, rec):
+        self._recorder = rec
+
+    @property
+    def log_writer(self):
+        return self._log_writer
+
+    @log_writer.setter
+    def log_writer(self, writer):
+        self._log_writer = writer
+
     @property
     def support_auto_mode(self):
         return self._support_auto_mode
@@ -133,14 +165,6 @@ class AppContext(QObject):
         if self._main_window:
             self._main_window.preferences_tab.update_modes_list_from_context()
 
-    @property
-    def log_function(self):
-        return self._log_function
-
-    @log_function.setter
-    def log_function(self, func):
-        self._log_function = func
-
     @property
     def overlay_window(self):
         return self._spotlight_overlay_window
@@ -173,69 +197,11 @@ class AppContext(QObject):
     def current_screen_height(self, h):
         self._current_screen_heigth = h
 
-    def _on_config_changed(self, key, value):
-        # Apenas emite o signal, não mexe direto na UI
-        self.configChanged.emit(key, value)
-
-    def _on_config_changed_signal(self, key, value):
+    def _on_config_changed_signal(self, changes):
         ui = self._main_window
         if not ui:
             return
-
-        pt = ui.preferences_tab
-
-        if key == "spotlight_shape":
-            pt.spotlight_shape.setCurrentText(value)
-        elif key == "spotlight_size":
-            pt.spotlight_size.setValue(value)
-        elif key == "spotlight_background_mode":
-            pt.spotlight_bg_mode.setCurrentIndex(value)
-        elif key == "spotlight_border":
-            pt.spotlight_border.setChecked(value)
-
-        elif key == "magnify_shape":
-            pt.magnify_shape.setCurrentText(value)
-        elif key == "magnify_size":
-            pt.magnify_size.setValue(value)
-        elif key == "magnify_border":
-            pt.magnify_border.setChecked(value)
-        elif key == "magnify_zoom":
-            pt.magnify_zoom.setValue(value)
-        elif key == "magnify_background_mode":
-            pt.magnify_bg_mode.setCurrentIndex(value)
-
-        elif key == "laser_dot_size":
-            pt.laser_dot_size.setValue(value)
-        elif key == "laser_color_index":
-            pt.laser_color.setCurrentIndex(value)
-        elif key == "laser_opacity":
-            pt.laser_opacity.setValue(value)
-        elif key == "laser_reflection":
-            pt.laser_reflection.setChecked(value)
-
-        elif key == "marker_width":
-            pt.marker_width.setValue(value)
-        elif key == "marker_color_index":
-            pt.marker_color.setCurrentIndex(value)
-        elif key == "marker_opacity":
-            pt.marker_opacity.setValue(value)
-
-        elif key == "shade_color_index":
-            pt.shade_color.setCurrentIndex(value)
-        elif key == "shade_opacity":
-            pt.shade_opacity.setValue(value)
-
-        elif key == "border_color_index":
-            pt.border_color.setCurrentIndex(value)
-        elif key == "border_opacity":
-            pt.border_opacity.setValue(value)
-        elif key == "border_width":
-            pt.border_width.setValue(value)
-
-        elif key == "general_always_capture":
-            pt.general_always_capture_screenshot.setChecked(value)
-        elif key == "general_auto_mode":
-            pt.general_enable_auto_mode.setChecked(value)
+        ui.preferences_tab.bindings.apply(changes)
 
     def set_active_device(self, device):
         if self._active_device == device:
@@ -259,9 +225,14 @@ class AppContext(QObject):
     def active_device(self):
         return self._active_device
 
-    def log(self, message):
-        if self._log_function:
-            self._log_function(message)
+    def log(self, message, *args, level=INFO):
+        logger = self._logger
+        if level >= logger.threshold:
+            logger.log(level, message, *args)
+
+    def notify_slide_change(self, step):
+        # Chamado das threads dos drivers; a conexão com o overlay é enfileirada
+        self.slideChanged.emit(step)
 
     def show_info(self, message):
         if self._show_info_function:
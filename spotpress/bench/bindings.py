@@ -0,0 +1,222 @@
+"""
+Conta sinais emitidos por mudança de configuração na aba de preferências.
+
+Monta AppContext + PreferencesTab reais (sem janela) e mede, para uma
+mudança vinda da configuração (botão segurado alterando laser_dot_size a
+10 Hz, por exemplo) e para uma edição feita no widget:
+
+- quantos configChanged foram emitidos e com quantas chaves;
+- quantos sinais de widget escaparam (eco de volta para a configuração);
+- quantas chaves foram gravadas de volta.
+
+Compara com o fluxo antigo (ObservableDict + cadeia de elif + reescrita de
+todas as chaves), reproduzido aqui sobre os mesmos widgets:
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.bindings --changes 1000
+"""
+
+import argparse
+import sys
+import time
+
+from spotpress.qtcompat import QApplication
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+        self.keys = 0
+
+    def __call__(self, *args):
+        self.count += 1
+        if args and isinstance(args[0], dict):
+            self.keys += len(args[0])
+
+
+class FakeMainWindow:
+    def __init__(self):
+        self.preferences_tab = None
+
+
+def build(app):
+    from spotpress.appcontext import AppContext
+    from spotpress.ui.preferences_tab import PreferencesTab
+
+    window = FakeMainWindow()
+    ctx = AppContext(main_window=window)
+    tab = PreferencesTab(None, ctx)
+    window.preferences_tab = tab
+    ctx.ui_ready = True
+    tab.load_defaults()
+    tab.update_context_config()
+    app.processEvents()
+    return ctx, tab
+
+
+def widget_counter(tab):
+    counter = Counter()
+    for key in tab.bindings.keys():
+        tab.bindings.get(key).signal.connect(counter)
+    return counter
+
+
+def run_new(app, changes):
+    ctx, tab = build(app)
+    emitted = Counter()
+    ctx.configChanged.connect(emitted)
+    widgets = widget_counter(tab)
+    written = tab.bindings.written
+
+    start = time.perf_counter()
+    for i in range(changes):
+        ctx.config["laser_dot_size"] = 6 + i % 10
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    config_side = (
+        emitted.count,
+        emitted.keys,
+        widgets.count,
+        tab.bindings.written - written,
+    )
+    ok = tab.laser_dot_size.value() == ctx.config["laser_dot_size"]
+
+    emitted.count = emitted.keys = widgets.count = 0
+    written = tab.bindings.written
+    for i in range(changes):
+        tab.laser_opacity.setValue(10 + i % 80)
+        app.processEvents()
+    widget_side = (
+        emitted.count,
+        emitted.keys,
+        widgets.count,
+        tab.bindings.written - written,
+    )
+    ok &= ctx.config["laser_opacity"] == tab.laser_opacity.value()
+    return config_side, widget_side, elapsed, ok
+
+
+def run_modes(app):
+    from spotpress.qtcompat import QModelIndex, Qt_CheckState_Unchecked
+
+    ctx, tab = build(app)
+    emitted = Counter()
+    ctx.configChanged.connect(emitted)
+    initial = ctx.config["modes_list"]
+
+    # Desmarcar um modo e arrastar outro gravam "modes_list" na hora
+    tab.modes_list.item(1).setCheckState(Qt_CheckState_Unchecked)
+    app.processEvents()
+    toggled = ctx.config["modes_list"] == tab.enabled_modes() and not dict(
+        ctx.config["modes_list"]
+    )[initial[1][0]]
+    tab.modes_list.model().moveRows(QModelIndex(), 0, 1, QModelIndex(), 3)
+    app.processEvents()
+    moved = ctx.config["modes_list"] == tab.enabled_modes() and (
+        ctx.config["modes_list"][2][0] == initial[0][0]
+    )
+
+    # Vindo da configuração: widgets reordenados sem eco
+    written = tab.bindings.written
+    ctx.config["modes_list"] = initial
+    app.processEvents()
+    applied = tab.enabled_modes() == initial and tab.bindings.written == written
+    return toggled, moved, applied, emitted.count
+
+
+class LegacyFlow:
+    """
+    Fluxo antigo sobre os mesmos widgets: cada escrita emite, o despacho
+    põe o valor no widget sem bloquear sinais e o sinal do widget reescreve
+    todas as chaves.
+    """
+
+    def __init__(self, tab):
+        self.tab = tab
+        self.values = {}
+        self.emitted = 0
+        self.bindings = [tab.bindings.get(k) for k in tab.bindings.keys()]
+        for b in self.bindings:
+            b.signal.disconnect()
+            b.signal.connect(self.update_context_config)
+
+    def set(self, key, value):
+        self.values[key] = value
+        self.emitted += 1
+        self.dispatch(key, value)
+
+    def dispatch(self, key, value):
+        for b in self.bindings:
+            if b.key == key:
+                b.setter(b.to_widget(value))
+                break
+
+    def update_context_config(self, *args):
+        for b in self.bindings:
+            self.set(b.key, b.from_widget(b.getter()))
+
+
+def run_legacy(app, changes):
+    _, tab = build(app)
+    legacy = LegacyFlow(tab)
+    widgets = widget_counter(tab)
+    start = time.perf_counter()
+    for i in range(changes):
+        legacy.set("laser_dot_size", 6 + i % 10)
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    return legacy.emitted, widgets.count, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--changes", type=int, default=1000)
+    args = parser.parse_args(argv)
+    n = args.changes
+
+    app = QApplication(sys.argv[:1])
+    config_side, widget_side, elapsed, ok = run_new(app, n)
+    legacy_emitted, legacy_widgets, legacy_elapsed = run_legacy(app, n)
+    toggled, moved, applied, modes_emitted = run_modes(app)
+
+    print(f"{n} mudanças de laser_dot_size vindas da configuração:")
+    print(
+        f"  bindings: {config_side[0] / n:.2f} configChanged/mudança"
+        f" ({config_side[1] / max(config_side[0], 1):.1f} chaves cada),"
+        f" {config_side[2] / n:.2f} sinais de widget,"
+        f" {config_side[3] / n:.2f} gravações de volta,"
+        f" {elapsed / n * 1e6:.1f} us/mudança"
+    )
+    print(
+        f"  antigo:   {legacy_emitted / n:.2f} configChanged/mudança,"
+        f" {legacy_widgets / n:.2f} sinais de widget,"
+        f" {legacy_elapsed / n * 1e6:.1f} us/mudança"
+    )
+    print(f"{n} edições de laser_opacity no widget:")
+    print(
+        f"  bindings: {widget_side[0] / n:.2f} configChanged/edição"
+        f" ({widget_side[1] / max(widget_side[0], 1):.1f} chaves cada),"
+        f" {widget_side[3] / n:.2f} gravações de volta"
+    )
+
+    checks = [
+        ("uma emissão por mudança vinda da configuração", config_side[0] == n),
+        ("nenhum eco de sinal de widget", config_side[2] == 0 and config_side[3] == 0),
+        (
+            "edição no widget grava só a sua chave",
+            widget_side[0] == n and widget_side[1] == n and widget_side[3] == n,
+        ),
+        ("widgets e configuração sincronizados", ok),
+        ("modos: marcar/desmarcar grava modes_list", toggled),
+        ("modos: reordenar grava modes_list", moved),
+        ("modos: configuração reordena a lista sem eco", applied and modes_emitted == 3),
+    ]
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
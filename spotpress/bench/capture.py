@@ -0,0 +1,326 @@
+"""
+Compara os backends de captura de tela (xshm, qt, synthetic, file).
+
+Mede o custo de capturar o monitor inteiro e um recorte em volta do
+cursor, com e sem a conversão para QPixmap que o overlay faz, e confere
+que os backends devolvem o mesmo conteúdo e que o XShm reaproveita o
+segmento de memória compartilhada:
+
+    python -m spotpress.bench.capture --xvfb --iterations 50
+
+Com --xvfb sobe um Xvfb próprio e usa a plataforma xcb (sem Xvfb
+instalado o benchmark é pulado); sem ele usa o display atual. Com
+QT_QPA_PLATFORM=offscreen só os backends qt, synthetic e file rodam.
+
+Num X de verdade também abre janelas coloridas e um "overlay" por cima
+delas e confere a captura que exclui o overlay e a lupa ao vivo: sem
+compositor (o Xvfb) as duas desistem; com compositor leem a janela de
+baixo.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def start_xvfb(size):
+    binary = shutil.which("Xvfb")
+    if binary is None:
+        return None, None
+    for number in range(90, 110):
+        if not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            break
+    display = f":{number}"
+    proc = subprocess.Popen(
+        [binary, display, "-screen", "0", f"{size}x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            return proc, display
+        time.sleep(0.05)
+    proc.kill()
+    return None, None
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+
+def timed(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--roi", type=int, default=256, help="lado do recorte")
+    parser.add_argument("--xvfb", action="store_true")
+    parser.add_argument("--xvfb-size", default="1920x1080")
+    args = parser.parse_args(argv)
+
+    xvfb = None
+    if args.xvfb:
+        xvfb, display = start_xvfb(args.xvfb_size)
+        if xvfb is None:
+            print("SKIP Xvfb não encontrado (pacote xvfb); nada verificado")
+            return 0
+        os.environ["DISPLAY"] = display
+        os.environ["QT_QPA_PLATFORM"] = "xcb"
+        print(f"Xvfb em {display} ({args.xvfb_size})\n")
+
+    try:
+        return run(args)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+
+def run(args):
+    from spotpress.qtcompat import QApplication, QGuiApplication, QPixmap, QRect
+    from spotpress import capture
+
+    app = QApplication(sys.argv[:1])
+    screen = QGuiApplication.screens()[0]
+    full = capture.native_rect(screen)
+    geometry = screen.geometry()
+    roi = QRect(
+        geometry.width() // 2 - args.roi // 2,
+        geometry.height() // 2 - args.roi // 2,
+        args.roi,
+        args.roi,
+    )
+
+    synthetic = capture.SyntheticCaptureBackend()
+    tmp = tempfile.NamedTemporaryFile(prefix="spotpress-capture-", suffix=".png", delete=False)
+    tmp.close()
+    synthetic.grab(screen).save(tmp.name)
+
+    backends = [capture.QtCaptureBackend(), synthetic, capture.FileCaptureBackend(tmp.name)]
+    xshm = None
+    if capture.XShmCaptureBackend.available():
+        try:
+            xshm = capture.XShmCaptureBackend()
+            backends.insert(0, xshm)
+        except OSError as e:
+            print(f"xshm indisponível: {e}")
+    else:
+        print("xshm indisponível: sem display X local")
+
+    n = args.iterations
+    print(
+        f"monitor {full.width()}x{full.height()}, recorte {args.roi}x{args.roi},"
+        f" {n} iterações (p50):"
+    )
+    print(f"  {'backend':10} {'monitor':>10} {'+QPixmap':>10} {'recorte':>10}")
+    for backend in backends:
+        grab_full = timed(lambda: backend.grab(screen), n)
+        to_pixmap = timed(lambda: QPixmap.fromImage(backend.grab(screen)), n)
+        grab_roi = timed(lambda: backend.grab(screen, roi), n)
+        print(
+            f"  {backend.name:10} {percentile(grab_full, 50) * 1e3:7.2f} ms"
+            f" {percentile(to_pixmap, 50) * 1e3:7.2f} ms"
+            f" {percentile(grab_roi, 50) * 1e3:7.2f} ms"
+        )
+
+    checks = []
+    for backend in backends:
+        image = backend.grab(screen)
+        checks.append(
+            (f"{backend.name}: captura do tamanho do monitor", image.size() == full.size())
+        )
+
+    def same_roi(backend):
+        # copy(): a imagem do xshm é reescrita na próxima captura
+        whole = backend.grab(screen).copy()
+        part = backend.grab(screen, roi)
+        crop = capture.native_rect(screen, roi).translated(-full.x(), -full.y())
+        return part == whole.copy(crop)
+
+    checks.append(("synthetic: recorte igual ao monitor recortado", same_roi(synthetic)))
+    file_backend = backends[-1]
+    checks.append(
+        ("file: devolve o conteúdo do arquivo", file_backend.grab(screen) == synthetic.grab(screen))
+    )
+    checks.append(("file: recorte consistente", same_roi(file_backend)))
+
+    if xshm is not None:
+        address = xshm.segment_address
+        for size in (16, args.roi, 64):
+            xshm.grab(screen, QRect(0, 0, size, size))
+        xshm.grab(screen)
+        checks.append(
+            (
+                "xshm: um segmento para todas as capturas",
+                xshm.segments_created == 1 and xshm.segment_address == address,
+            )
+        )
+        checks.append(("xshm: recorte igual ao monitor recortado", same_roi(xshm)))
+        qt_image = capture.QtCaptureBackend().grab(screen).convertToFormat(
+            xshm.grab(screen).format()
+        )
+        checks.append(("xshm: mesmo conteúdo que o qt", xshm.grab(screen) == qt_image))
+        checks += exclude_checks(app, capture, xshm, screen)
+
+    auto = capture.open_backend("auto")
+    expected = "xshm" if xshm is not None else "qt"
+    checks.append((f"auto escolhe {expected}", auto.name == expected))
+    auto.close()
+    checks.append(
+        ("nome desconhecido cai para qt", capture.get_backend("nenhum").name == "qt")
+    )
+    capture.close_backends()
+    if xshm is not None:
+        xshm.close()
+    os.unlink(tmp.name)
+
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+def show_window(rect, color):
+    """Janela X de topo, fora do window manager, pintada com `color`."""
+    from spotpress.qtcompat import (
+        QColor,
+        QWidget,
+        Qt_WindowType_FramelessWindowHint,
+        Qt_WindowType_X11BypassWindowManagerHint,
+    )
+
+    window = QWidget(
+        None, Qt_WindowType_FramelessWindowHint | Qt_WindowType_X11BypassWindowManagerHint
+    )
+    window.setGeometry(rect)
+    window.setAutoFillBackground(True)
+    palette = window.palette()
+    palette.setColor(window.backgroundRole(), QColor(color))
+    window.setPalette(palette)
+    window.show()
+    return window
+
+
+def settle(app, seconds=0.3):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def exclude_checks(app, capture, xshm, screen):
+    from spotpress.qtcompat import QColor, QRect
+
+    origin = screen.geometry().topLeft()
+    lens = QRect(40, 40, 64, 64)
+    windows = [
+        show_window(QRect(20, 20, 200, 160).translated(origin), 0x2080C0),
+        show_window(QRect(300, 20, 200, 160).translated(origin), 0xC08020),
+    ]
+    overlay = show_window(screen.geometry(), 0x101010)
+    windows.append(overlay)
+    settle(app)
+    overlay_id = int(overlay.winId())
+
+    checks = [
+        (
+            "xshm: sem exclusão a captura vê o overlay",
+            xshm.grab(screen, lens).pixelColor(10, 10) == QColor(0x10, 0x10, 0x10),
+        )
+    ]
+    compositor = xshm.compositor_active()
+    image = xshm.grab(screen, lens, exclude=overlay_id)
+    if compositor:
+        checks.append(
+            (
+                "xshm: com compositor, lê a janela abaixo do overlay",
+                not image.isNull()
+                and image.size() == lens.size()
+                and image.pixelColor(10, 10) == QColor(0x20, 0x80, 0xC0),
+            )
+        )
+        checks.append(
+            (
+                "xshm: lente sobre duas janelas devolve imagem nula",
+                xshm.grab(screen, QRect(180, 40, 160, 64), exclude=overlay_id).isNull(),
+            )
+        )
+    else:
+        checks.append(("xshm: sem compositor, exclusão devolve imagem nula", image.isNull()))
+    checks += live_checks(capture, screen, lens, overlay_id, compositor)
+    for window in windows:
+        window.close()
+
+    # Erro do X (janela inexistente) é contado, não encerra o processo
+    errors = xshm.errors
+    image = xshm._image_for(8, 8)
+    failed = not xshm._xext.XShmGetImage(xshm._dpy, 0x7FFFFF, image, 0, 0, capture.ALL_PLANES)
+    xshm._x11.XSync(xshm._dpy, 0)
+    checks.append(("xshm: erro do X contado", failed and xshm.errors > errors))
+    return checks
+
+
+def live_checks(capture, screen, lens, overlay, compositor):
+    """LiveCapture da lupa ao vivo com o xshm, numa conexão própria."""
+    from spotpress.livecapture import LiveCapture
+    from spotpress.qtcompat import QColor, QRect
+
+    geometry = capture.ScreenGeometry.from_screen(screen)
+
+    def run(rect, **kwargs):
+        live = LiveCapture(
+            lambda: capture.open_backend("xshm"), geometry, overlay, 30, **kwargs
+        )
+        live.request(rect)
+        live.start()
+        # Até 5 quadros ou a thread desistir
+        deadline = time.monotonic() + 3.0
+        while time.monotonic() < deadline and live.running and live.frames < 5:
+            time.sleep(0.01)
+        stats, latest = live.stats(), live.latest()
+        live.stop()
+        return stats, latest
+
+    if not compositor:
+        stats, _ = run(lens, max_failures=3)
+        return [
+            (
+                "xshm ao vivo: sem compositor desiste",
+                stats["live_gave_up"] and stats["live_frames"] == 0,
+            )
+        ]
+    stats, latest = run(lens)
+    spanning, _ = run(QRect(180, 40, 160, 64), max_failures=3)
+    return [
+        (
+            "xshm ao vivo: quadros da janela abaixo do overlay",
+            stats["live_frames"] >= 5
+            and latest is not None
+            and latest[0].pixelColor(10, 10) == QColor(0x20, 0x80, 0xC0),
+        ),
+        (
+            "xshm ao vivo: lente sobre duas janelas desiste",
+            spanning["live_gave_up"] and spanning["live_frames"] == 0,
+        ),
+    ]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
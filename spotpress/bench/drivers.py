@@ -0,0 +1,451 @@
+"""
+Benchmark e verificação dos drivers sem hardware.
+
+Injeta pacotes hidraw e reports evdev sintéticos em cada driver usando um
+AppContext falso, um overlay stub e um sink uinput que grava os eventos.
+Roda sem display:
+
+    python -m spotpress.bench.drivers --count 1000000
+"""
+
+import argparse
+import os
+import random
+import select
+import sys
+import threading
+import time
+from array import array
+
+import evdev
+from evdev import ecodes as ec
+
+from spotpress.utils import MODE_LASER, MODE_MOUSE
+from spotpress.bench.fakes import (
+    FakeAppContext,
+    RecordingSink,
+    make_fake_driver,
+    record_actions,
+)
+from spotpress.hw.lnx.baseusorangedotai import BaseusOrangeDotAI
+from spotpress.hw.lnx.eventbatch import EventBatcher
+from spotpress.hw.lnx.genericvrbox import GenericVRBoxPointer
+from spotpress.hw.lnx.gestures import SwipeRecognizer
+from spotpress.hw.lnx.idledetector import IdleDetector
+from spotpress.hw.lnx.nordicasasmartcontrol import ASASmartControlPointer
+from spotpress.hw.lnx.nordicasacompositedevice import ASACompositeDevicePointer
+
+
+def baseus_packet(status):
+    data = bytearray(16)
+    data[0] = 10
+    data[5] = status
+    data[15] = 182
+    return bytes(data)
+
+
+def smart_control_packet(*prefix):
+    return bytes(list(prefix) + [0] * (8 - len(prefix)))
+
+
+def report(*events):
+    evs = [evdev.InputEvent(0, 0, etype, code, value) for etype, code, value in events]
+    evs.append(evdev.InputEvent(0, 0, ec.EV_SYN, ec.SYN_REPORT, 0))
+    return evs
+
+
+def motion_reports(dx, dy, count=1):
+    return [report((ec.EV_REL, ec.REL_X, dx), (ec.EV_REL, ec.REL_Y, dy))] * count
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100.0))
+    return sorted_values[index]
+
+
+def run_stream(feed, items, count, events_per_item):
+    latencies = array("q")
+    append = latencies.append
+    perf = time.perf_counter_ns
+    n = len(items)
+    start = perf()
+    for i in range(count):
+        t0 = perf()
+        feed(items[i % n])
+        append(perf() - t0)
+    elapsed = (perf() - start) / 1e9
+    values = sorted(latencies)
+    return {
+        "items": count,
+        "events": count * events_per_item,
+        "elapsed": elapsed,
+        "p50": percentile(values, 50) / 1000.0,
+        "p99": percentile(values, 99) / 1000.0,
+        "p999": percentile(values, 99.9) / 1000.0,
+        "max": values[-1] / 1000.0 if values else 0,
+    }
+
+
+def hidraw_feed(dev):
+    return dev.processa_pacote_hid
+
+
+def evdev_feed(dev):
+    return dev.dispatch_input_events
+
+
+# (driver, fonte, itens, eventos por item, modo)
+SCENARIOS = [
+    (
+        BaseusOrangeDotAI,
+        "hidraw",
+        [baseus_packet(s) for s in (97, 0, 100, 0, 104, 105, 0)],
+        1,
+        MODE_MOUSE,
+    ),
+    (BaseusOrangeDotAI, "evdev", motion_reports(3, -2), 3, MODE_MOUSE),
+    (
+        ASASmartControlPointer,
+        "hidraw",
+        [smart_control_packet(1, 0, 0, 19)],
+        1,
+        MODE_MOUSE,
+    ),
+    (ASASmartControlPointer, "evdev", motion_reports(3, -2), 3, MODE_MOUSE),
+    (ASACompositeDevicePointer, "evdev", motion_reports(3, -2), 3, MODE_MOUSE),
+    (GenericVRBoxPointer, "evdev", motion_reports(3, -2), 3, MODE_MOUSE),
+]
+
+
+def run_benchmarks(count, devnull):
+    results = []
+    for cls, source, items, events_per_item, mode in SCENARIOS:
+        ctx = FakeAppContext(devnull=devnull)
+        dev = make_fake_driver(cls, ctx)
+        ctx.current_mode = mode
+        feed = hidraw_feed(dev) if source == "hidraw" else evdev_feed(dev)
+        try:
+            res = run_stream(feed, items, count, events_per_item)
+        finally:
+            dev.stop()
+        res["name"] = f"{cls.__name__} [{source}]"
+        res["writes"] = ctx.event_writer.writes
+        results.append(res)
+    return results
+
+
+# Flood hidraw -------------------------------------------------------------
+
+
+def legacy_read_reports(dev, f, report_size):
+    """Leitor antigo (select + read + bytes por report), usado como referência."""
+    fd = f.fileno()
+    os.set_blocking(fd, False)
+    while not dev._stop_hidraw_thread.is_set():
+        rlist, _, _ = select.select([fd], [], [], 0.1)
+        if fd in rlist:
+            b = f.read(report_size)
+            if not b:
+                break
+            if len(b) == report_size:
+                yield bytes(b)
+
+
+def _flood_writer(fd, packet, count, chunk=256):
+    # 256 reports de 16 bytes = 4096 bytes, escrita atômica no pipe
+    data = packet * chunk
+    sent = 0
+    while sent < count:
+        n = min(chunk, count - sent)
+        os.write(fd, data if n == chunk else packet * n)
+        sent += n
+    os.close(fd)
+
+
+def run_flood(count, legacy=False):
+    """
+    Injeta `count` reports da Baseus por um pipe e os lê com o leitor do
+    driver. Cada pacote entregue é mantido vivo em uma lista pré-alocada, de
+    forma que o aumento de blocos alocados dividido por `count` indica
+    quantos objetos o leitor aloca por pacote.
+    """
+    ctx = FakeAppContext()
+    dev = make_fake_driver(BaseusOrangeDotAI, ctx)
+    packet = baseus_packet(0)
+    r, w = os.pipe()
+    writer = threading.Thread(target=_flood_writer, args=(w, packet, count))
+    kept = [None] * count
+    with os.fdopen(r, "rb", buffering=0) as f:
+        if legacy:
+            reader = legacy_read_reports(dev, f, dev.HID_REPORT_SIZE)
+        else:
+            reader = dev.read_hid_reports(f, dev.HID_REPORT_SIZE)
+        process = dev.processa_pacote_hid
+        i = 0
+        writer.start()
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        for pacote in reader:
+            process(pacote)
+            kept[i] = pacote
+            i += 1
+        elapsed = time.perf_counter() - start
+        blocks = sys.getallocatedblocks() - blocks
+    writer.join()
+    dev.stop()
+    return {
+        "name": "legacy read()" if legacy else "readv + memoryview",
+        "packets": i,
+        "elapsed": elapsed,
+        "blocks": blocks / max(i, 1),
+        "distinct": len({id(p) for p in kept[:i]}),
+    }
+
+
+# Verificações de decodificação ------------------------------------------
+
+
+def check_baseus_single_actions():
+    ctx = FakeAppContext()
+    dev = make_fake_driver(BaseusOrangeDotAI, ctx)
+    actions = record_actions(dev)
+    expected = []
+    for status, token in sorted(dev.SINGLE_ACTION_BUTTONS.items()):
+        dev.processa_pacote_hid(baseus_packet(status))
+        expected.append(token)
+    # Pacotes com cabeçalho inválido ou curtos são ignorados
+    dev.processa_pacote_hid(b"\x00" * 16)
+    dev.processa_pacote_hid(baseus_packet(97)[:8])
+    dev.stop()
+    return actions == expected, f"{actions} != {expected}"
+
+
+def check_baseus_status_table():
+    # Compara a tabela pré-compilada com a busca antiga em dicionários
+    cls = BaseusOrangeDotAI
+    merged = cls.SINGLE_ACTION_BUTTONS | cls.MULTIPLE_ACTION_BUTTONS
+    failures = []
+    for status in range(256):
+        key = cls.STATUS_ALIASES.get(status, status)
+        expected = merged.get(key)
+        entry = cls.STATUS_TABLE[status]
+        got = entry[0] if entry else None
+        single = bool(entry and entry[1])
+        if got != expected or single != (key in cls.SINGLE_ACTION_BUTTONS):
+            failures.append(f"{status}: {entry} != {expected}")
+    return not failures, "; ".join(failures)
+
+
+def check_baseus_motion_forwarding():
+    ctx = FakeAppContext()
+    dev = make_fake_driver(BaseusOrangeDotAI, ctx)
+    for evs in motion_reports(3, -2, 10):
+        dev.dispatch_input_events(evs)
+    dev.stop()
+    dx = sum(v for t, c, v in ctx.ui.events if (t, c) == (ec.EV_REL, ec.REL_X))
+    dy = sum(v for t, c, v in ctx.ui.events if (t, c) == (ec.EV_REL, ec.REL_Y))
+    return (dx, dy) == (30, -20), f"movimento repassado ({dx}, {dy})"
+
+
+def check_smart_control_gestures():
+    expected = {
+        "G_LEFT": (-4, 0),
+        "G_RIGHT": (4, 0),
+        "G_UP": (0, -4),
+        "G_DOWN": (0, 4),
+    }
+    failures = []
+    for gesture, (dx, dy) in expected.items():
+        ctx = FakeAppContext()
+        dev = make_fake_driver(ASASmartControlPointer, ctx)
+        ctx.current_mode = MODE_LASER
+        actions = record_actions(dev)
+        dev.dispatch_input_events(report((ec.EV_KEY, ec.BTN_LEFT, 1)))
+        for _ in range(dev._swipe.window):
+            events = []
+            if dx:
+                events.append((ec.EV_REL, ec.REL_X, dx))
+            if dy:
+                events.append((ec.EV_REL, ec.REL_Y, dy))
+            dev.dispatch_input_events(report(*events))
+        dev.dispatch_input_events(report((ec.EV_KEY, ec.BTN_LEFT, 0)))
+        dev.stop()
+        gestures = [a for a in actions if a.startswith("G_")]
+        if gestures[:1] != [gesture]:
+            failures.append(f"{gesture}: {gestures}")
+    return not failures, "; ".join(failures)
+
+
+def legacy_swipes(samples, size=15, trigger=8):
+    """Algoritmo antigo (listas + pop(0) + recontagem) para comparação."""
+    xs, ys, out = [], [], []
+    for code, value in samples:
+        buf = xs if code == ec.REL_X else ys
+        buf.append(value)
+        if len(buf) > size:
+            buf.pop(0)
+        for axis, neg, pos in ((xs, "G_LEFT", "G_RIGHT"), (ys, "G_UP", "G_DOWN")):
+            if len(axis) != size:
+                continue
+            if sum(1 for v in axis if v < 0) >= trigger:
+                out.append(neg)
+            elif sum(1 for v in axis if v > 0) >= trigger:
+                out.append(pos)
+            else:
+                continue
+            xs.clear()
+            ys.clear()
+            break
+    return out
+
+
+def check_swipe_recognizer():
+    rng = random.Random(1234)
+    samples = [
+        (rng.choice((ec.REL_X, ec.REL_Y)), rng.randint(-4, 4)) for _ in range(20000)
+    ]
+    swipe = SwipeRecognizer()
+    got = []
+    for code, value in samples:
+        swipe.push(code, value)
+        gesture = swipe.detect()
+        if gesture:
+            got.append(gesture)
+    expected = legacy_swipes(samples)
+    return got == expected, f"{len(got)} gestos != {len(expected)} esperados"
+
+
+def check_idle_detector():
+    fired = []
+    idle = IdleDetector(0.1, lambda: fired.append(time.monotonic()))
+    threads = threading.active_count()
+    for _ in range(200):
+        last_touch = time.monotonic()
+        idle.touch()
+        time.sleep(0.001)
+    churn = threading.active_count() - threads
+    time.sleep(0.3)
+    idle.stop()
+    ok = churn <= 1 and len(fired) == 1 and fired[0] - last_touch >= 0.1
+    return ok, f"threads extras {churn}, disparos {len(fired)}"
+
+
+def check_smart_control_buttons():
+    ctx = FakeAppContext()
+    dev = make_fake_driver(ASASmartControlPointer, ctx)
+    actions = record_actions(dev)
+    dev.processa_pacote_hid(smart_control_packet(0, 0, 75, 0))
+    dev.processa_pacote_hid(smart_control_packet())
+    time.sleep(dev.DOUBLE_CLICK_INTERVAL + 0.1)
+    dev.stop()
+    page_up = (ec.EV_KEY, ec.KEY_PAGEUP, 1) in ctx.ui.events
+    return actions == ["PREV"] and page_up, f"ações {actions}, PAGEUP={page_up}"
+
+
+def check_composite_keys():
+    ctx = FakeAppContext()
+    dev = make_fake_driver(ASACompositeDevicePointer, ctx)
+    actions = record_actions(dev)
+    dev.dispatch_input_events(report((ec.EV_KEY, ec.KEY_RIGHT, 1)))
+    dev.dispatch_input_events(report((ec.EV_KEY, ec.KEY_RIGHT, 0)))
+    dev.stop()
+    expected = ["KEY_RIGHT+PRESS", "KEY_RIGHT+RELEASE"]
+    page_down = (ec.EV_KEY, ec.KEY_PAGEDOWN, 1) in ctx.ui.events
+    return actions == expected and page_down, f"ações {actions}"
+
+
+def check_batcher_order():
+    # Teclas sintéticas saem depois do que já foi encaminhado do mesmo bloco
+    sink = RecordingSink()
+    batcher = EventBatcher(ui=sink)
+    batcher.emit(ec.EV_KEY, ec.BTN_LEFT, 1)
+    batcher.syn()
+    batcher.write_reports([[(ec.EV_KEY, ec.KEY_F5, 1)], [(ec.EV_KEY, ec.KEY_F5, 0)]])
+    batcher.flush()
+    order = [(t, c, v) for t, c, v in sink.events if t == ec.EV_KEY]
+    expected = [
+        (ec.EV_KEY, ec.BTN_LEFT, 1),
+        (ec.EV_KEY, ec.KEY_F5, 1),
+        (ec.EV_KEY, ec.KEY_F5, 0),
+    ]
+    return order == expected, f"{order}"
+
+
+CHECKS = [
+    check_batcher_order,
+    check_baseus_single_actions,
+    check_baseus_status_table,
+    check_baseus_motion_forwarding,
+    check_smart_control_gestures,
+    check_swipe_recognizer,
+    check_idle_detector,
+    check_smart_control_buttons,
+    check_composite_keys,
+]
+
+
+def run_checks():
+    results = []
+    for check in CHECKS:
+        try:
+            ok, detail = check()
+        except Exception as e:
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        results.append((check.__name__, ok, detail))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument(
+        "--devnull",
+        action="store_true",
+        help="grava os reports em /dev/null para contar o custo do write()",
+    )
+    parser.add_argument("--skip-bench", action="store_true")
+    parser.add_argument(
+        "--flood",
+        type=int,
+        default=0,
+        metavar="N",
+        help="mede alocações do leitor hidraw com N reports via pipe",
+    )
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, ok, detail in run_checks():
+        print(f"{'OK  ' if ok else 'FAIL'} {name}" + ("" if ok else f": {detail}"))
+        failed |= not ok
+
+    if not args.skip_bench:
+        print()
+        print(
+            f"{'driver':42} {'items/s':>12} {'events/s':>12} {'writes/s':>10}"
+            f" {'p50us':>7} {'p99us':>7} {'p999us':>7} {'maxus':>9}"
+        )
+        for r in run_benchmarks(args.count, args.devnull):
+            print(
+                f"{r['name']:42} {r['items'] / r['elapsed']:12.0f}"
+                f" {r['events'] / r['elapsed']:12.0f}"
+                f" {r['writes'] / r['elapsed']:10.0f}"
+                f" {r['p50']:7.1f} {r['p99']:7.1f} {r['p999']:7.1f} {r['max']:9.1f}"
+            )
+
+    if args.flood:
+        print()
+        print(f"{'leitor hidraw':24} {'pkts/s':>12} {'blocos/pkt':>11} {'objetos':>9}")
+        for legacy in (True, False):
+            r = run_flood(args.flood, legacy=legacy)
+            print(
+                f"{r['name']:24} {r['packets'] / r['elapsed']:12.0f}"
+                f" {r['blocks']:11.3f} {r['distinct']:9d}"
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import os
+
+from spotpress.utils import MODE_MOUSE
+from spotpress.hw.lnx.eventbatch import EventBatcher
+
+
+class RecordingSink:
+    """Substitui o uinput.Device: guarda tudo o que seria emitido."""
+
+    def __init__(self):
+        self.events = []
+        self.syns = 0
+
+    def emit(self, event, value, syn=True):
+        self.events.append((event[0], event[1], value))
+        if syn:
+            self.syn()
+
+    def syn(self):
+        self.syns += 1
+
+    def clear(self):
+        self.events.clear()
+        self.syns = 0
+
+
+class StubOverlayWindow:
+    """
+    Janela de overlay sem Qt. Qualquer método chamado pelos drivers é
+    registrado em `calls` como (nome, args).
+    """
+
+    def __init__(self, ctx):
+        self._ctx = ctx
+        self.visible = False
+        self.drawing = False
+        self.calls = []
+
+    def is_overlay_actually_visible(self):
+        return self.visible
+
+    def auto_mode_enabled(self):
+        return self._ctx.config.get("general_auto_mode", False) and (
+            self._ctx.support_auto_mode
+        )
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            self.calls.append((name, args))
+
+        return record
+
+
+class FakeAppContext:
+    """AppContext sem Qt para rodar drivers em testes e benchmarks."""
+
+    def __init__(self, config=None, devnull=False, log=False):
+        self.config = dict(config or {})
+        self.current_mode = MODE_MOUSE
+        self.support_auto_mode = False
+        self.compatible_modes = []
+        self.debug_mode = False
+        self.active_device = None
+        self.recorder = None
+        self.log_writer = None
+        self.device_monitor = None
+        self.ui = RecordingSink()
+        # Com devnull=True os reports são gravados de verdade (em /dev/null),
+        # medindo também o custo das syscalls de write
+        fd = os.open(os.devnull, os.O_WRONLY) if devnull else None
+        self.event_writer = EventBatcher(self.ui, fd=fd)
+        self.overlay_window = StubOverlayWindow(self)
+        self.messages = [] if log else None
+        self.overlay_shown = 0
+        self.overlay_hidden = 0
+        self.slide_changes = 0
+
+    def log(self, message, *args, level=None):
+        if self.messages is not None:
+            self.messages.append(message % args if args else message)
+
+    def notify_slide_change(self, step):
+        self.slide_changes += 1
+
+    def show_info(self, message):
+        pass
+
+    def show_overlay(self):
+        self.overlay_shown += 1
+
+    def hide_overlay(self):
+        self.overlay_hidden += 1
+
+    def set_active_device(self, device):
+        self.active_device = device
+
+
+def make_fake_driver(cls, ctx):
+    """
+    Instancia um driver sem hardware: a subclasse gerada não procura
+    dispositivos em /dev/input nem consulta o udevadm.
+    """
+    fake_cls = type(
+        cls.__name__,
+        (cls,),
+        {
+            "find_all_event_devices_for_known": lambda self: [],
+            "is_known_device": classmethod(lambda c, device_info: False),
+        },
+    )
+    dev = fake_cls(app_ctx=ctx, hidraw_path=None)
+    ctx.active_device = dev
+    return dev
+
+
+def record_actions(dev):
+    """Intercepta do_action do driver, retornando a lista de ações emitidas."""
+    actions = []
+    do_action = dev.do_action
+
+    def recorder(button, *args, **kwargs):
+        actions.append(button)
+        return do_action(button, *args, **kwargs)
+
+    dev.do_action = recorder
+    return actions
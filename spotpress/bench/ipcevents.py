@@ -0,0 +1,202 @@
+"""
+Teste de carga das assinaturas de eventos do socket de controle.
+
+Sobe um IpcServer num socket temporário, conecta vários assinantes (um por
+thread, com o cliente stdlib) e um assinante que nunca lê, e transmite uma
+rajada de eventos. Verifica que todos os assinantes recebem todos os
+eventos em ordem e que o assinante lento é desconectado sem travar os
+outros; confere também o limite de tamanho de linha do decodificador:
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.ipcevents --subscribers 200
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+from spotpress.qtcompat import QApplication
+from spotpress.ipc import setup_ipc_server
+from spotpress.ipcclient import IpcClient
+from spotpress.ipcprotocol import CommandError, LineDecoder, ProtocolError
+
+
+def handler(command):
+    if command == "--get-mode":
+        return {"mode": 2, "name": "laser", "label": "Laser"}
+    raise CommandError(f"Comando desconhecido: {command}")
+
+
+def subscriber(name, expected, results, index):
+    client = IpcClient(name, timeout=10)
+    seqs = []
+    latencies = []
+    try:
+        client.request("--subscribe=currentModeChanged")
+        while len(seqs) < expected:
+            event = client.next_event(timeout=10)
+            if event is None:
+                break
+            now = time.perf_counter()
+            seqs.append(event["data"]["seq"])
+            latencies.append(now - event["data"]["t"])
+    finally:
+        client.close()
+    results[index] = (seqs, latencies)
+
+
+def slow_subscriber(name, stop):
+    client = IpcClient(name, timeout=10)
+    client.request("--subscribe")
+    stop.wait()
+    client.close()
+
+
+def pump(app, predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if predicate():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+
+def decoder_limits():
+    def rejects(*chunks):
+        decoder = LineDecoder(max_line=64)
+        try:
+            for chunk in chunks:
+                decoder.feed(chunk)
+        except ProtocolError:
+            return True
+        return False
+
+    decoder = LineDecoder(max_line=64)
+    normal = decoder.feed(b"--get-mode\n--get-") + decoder.feed(b"stats\n")
+    return (
+        normal == [b"--get-mode", b"--get-stats"]
+        and rejects(b"x" * 65)
+        # Resto grande depois de uma quebra de linha no mesmo bloco
+        and rejects(b"--get-mode\n" + b"x" * 65)
+        and rejects(b"--get-mode\n" + b"x" * 40, b"x" * 40)
+        # Linha completa grande num único bloco
+        and rejects(b"x" * 65 + b"\n")
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=200)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--payload", type=int, default=200, help="bytes extras por evento")
+    parser.add_argument("--max-pending", type=int, default=256 * 1024)
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    name = f"spotpress_bench_{os.getpid()}"
+    server = setup_ipc_server(handler, name=name)
+    if server is None:
+        print(f"Não foi possível escutar em {name}")
+        return 2
+    server.MAX_PENDING_BYTES = args.max_pending
+
+    failed = False
+
+    def check(label, ok):
+        nonlocal failed
+        print(f"{'OK  ' if ok else 'FAIL'} {label}")
+        failed |= not ok
+
+    check("decodificador: limite de linha em qualquer bloco", decoder_limits())
+
+    results = [None] * args.subscribers
+    threads = [
+        threading.Thread(
+            target=subscriber, args=(name, args.events, results, i), daemon=True
+        )
+        for i in range(args.subscribers)
+    ]
+    stop_slow = threading.Event()
+    slow = threading.Thread(target=slow_subscriber, args=(name, stop_slow), daemon=True)
+    for t in threads + [slow]:
+        t.start()
+
+    total = args.subscribers + 1
+    check(
+        f"{total} assinantes registrados",
+        pump(app, lambda: server.subscriber_count == total, 20),
+    )
+
+    pad = "x" * args.payload
+    start = time.perf_counter()
+    for seq in range(args.events):
+        data = {"seq": seq, "t": time.perf_counter(), "pad": pad}
+        server.broadcast("currentModeChanged", data)
+        if seq % 16 == 0:
+            app.processEvents()
+    broadcast_time = time.perf_counter() - start
+    done = pump(app, lambda: not any(t.is_alive() for t in threads), 60)
+    elapsed = time.perf_counter() - start
+
+    expected = list(range(args.events))
+    complete = sum(1 for r in results if r is not None and r[0] == expected)
+    check("todos os assinantes terminaram", done)
+    check(
+        f"{complete}/{args.subscribers} assinantes receberam todos os eventos em ordem",
+        complete == args.subscribers,
+    )
+    check(
+        "assinante lento desconectado",
+        pump(app, lambda: server.subscriber_count == 0, 5),
+    )
+
+    latencies = [lat for r in results if r for lat in r[1]]
+    delivered = len(latencies)
+    print(
+        f"\n{args.events} eventos x {args.subscribers} assinantes:"
+        f" transmissão {broadcast_time * 1e3:.1f} ms,"
+        f" entrega completa {elapsed * 1e3:.1f} ms"
+        f" ({delivered / elapsed:,.0f} eventos entregues/s)"
+    )
+    print(
+        f"latência p50 {percentile(latencies, 50) * 1e3:.2f} ms,"
+        f" p99 {percentile(latencies, 99) * 1e3:.2f} ms,"
+        f" máx {max(latencies, default=0) * 1e3:.2f} ms"
+    )
+
+    # Consultas em pipeline enquanto o servidor segue ativo
+    box = {}
+
+    def query():
+        with IpcClient(name, timeout=10) as client:
+            ids = [client.send("--get-mode") for _ in range(1000)]
+            box["ok"] = all(client.wait(i)["name"] == "laser" for i in ids)
+            try:
+                client.request("--get-nada")
+            except CommandError:
+                box["error"] = True
+
+    q = threading.Thread(target=query, daemon=True)
+    qstart = time.perf_counter()
+    q.start()
+    pump(app, lambda: not q.is_alive(), 10)
+    print(f"1000 consultas --get-mode em {(time.perf_counter() - qstart) * 1e3:.1f} ms")
+    check("consultas e erro de consulta", box.get("ok") and box.get("error"))
+
+    stop_slow.set()
+    slow.join(1)
+    server.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Lupa ao vivo: captura contínua da área sob a lente numa thread.
+
+Roda o LiveCapture com um backend "animado" (o conteúdo muda a cada
+captura, como um vídeo) e confere a taxa de captura, que o quadro mais
+recente acompanha a área pedida, que capturas sem a exclusão do overlay
+contam como falha, com o intervalo dobrando a cada falha seguida até a
+thread desistir. Depois liga a lupa ao vivo no SpotlightOverlayWindow
+real, com o backend sintético, e mede o custo por quadro com e sem ela. Por
+fim confere que a aba de preferências desabilita a opção com um backend
+que não exclui o overlay:
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.livemagnifier --seconds 2
+"""
+
+import argparse
+import sys
+import time
+
+from spotpress.qtcompat import QApplication, QColor, QImage, QImage_Format_RGB32, QRect
+from spotpress.utils import MODE_MAG_GLASS
+
+
+def make_animated_backend(cost):
+    from spotpress.capture import CaptureBackend, native_rect
+
+    class AnimatedCaptureBackend(CaptureBackend):
+        """Cada captura tem uma cor diferente; `cost` simula o tempo do X."""
+
+        name = "animated"
+
+        def __init__(self):
+            self.count = 0
+            self.excluded = []
+
+        def grab(self, screen, rect=None, exclude=None):
+            time.sleep(cost)
+            self.count += 1
+            self.excluded.append(exclude)
+            native = native_rect(screen, rect)
+            image = QImage(native.width(), native.height(), QImage_Format_RGB32)
+            image.fill(QColor(self.count % 256, 0, 0))
+            return image
+
+    return AnimatedCaptureBackend
+
+
+def run_worker(app, backend_factory, screen, fps, seconds, rects, **kwargs):
+    from spotpress.livecapture import LiveCapture
+
+    backends = []
+
+    def open_backend():
+        backends.append(backend_factory())
+        return backends[-1]
+
+    live = LiveCapture(open_backend, screen, 1234, fps, **kwargs)
+    live.start()
+    colors = set()
+    deadline = time.monotonic() + seconds
+    step = seconds / len(rects)
+    while time.monotonic() < deadline:
+        index = min(len(rects) - 1, int((seconds - (deadline - time.monotonic())) / step))
+        live.request(rects[index])
+        app.processEvents()
+        latest = live.latest()
+        if latest is not None:
+            colors.add(latest[0].pixelColor(0, 0).red())
+        time.sleep(0.005)
+    stats = live.stats()
+    last = live.latest()
+    live.stop()
+    return live, backends, colors, stats, last
+
+
+def worker_checks(app, args):
+    from spotpress.capture import QtCaptureBackend, ScreenGeometry
+
+    screen = ScreenGeometry(QRect(0, 0, 1920, 1080))
+    rects = [QRect(100, 100, 200, 130), QRect(900, 500, 200, 130)]
+    live, backends, colors, stats, last = run_worker(
+        app, make_animated_backend(args.cost), screen, args.fps, args.seconds, rects
+    )
+    print(
+        f"captura ao vivo a {args.fps} fps por {args.seconds:.1f} s"
+        f" (captura simulada de {args.cost * 1e3:.1f} ms):"
+    )
+    print(
+        f"  {stats['live_frames']} quadros, {stats['live_fps']} fps,"
+        f" captura p50 {stats['live_capture_p50_ms']:.2f} ms,"
+        f" máx {stats['live_capture_max_ms']:.2f} ms, {len(colors)} quadros distintos vistos"
+    )
+
+    class NoExcludeBackend(QtCaptureBackend):
+        # Como o qt: sem exclusão devolve imagem nula
+        def grab(self, screen, rect=None, exclude=None):
+            return QImage()
+
+    failing, _, _, failing_stats, failing_last = run_worker(
+        app, NoExcludeBackend, screen, args.fps, 0.5, rects
+    )
+    # Limite baixo para ver a thread desistir dentro do benchmark; com o
+    # intervalo dobrando, 4 falhas a 30 fps levam ~0,5 s
+    _, _, _, gave_up_stats, _ = run_worker(
+        app, NoExcludeBackend, screen, args.fps, 1.0, rects, max_failures=4
+    )
+    print(
+        f"  sem exclusão: {failing_stats['live_failures']} capturas nulas em 0,5 s"
+        f" (sem espera seriam ~{int(args.fps * 0.5)})"
+    )
+    return [
+        (
+            "taxa perto da pedida",
+            stats["live_fps"] >= args.fps * 0.7 and stats["live_fps"] <= args.fps * 1.2,
+        ),
+        ("quadro mais recente muda como a tela", len(colors) >= args.fps * args.seconds * 0.5),
+        ("acompanha a área pedida", last is not None and last[1] == rects[-1]),
+        (
+            "backend aberto na thread, capturas excluem o overlay",
+            len(backends) == 1 and set(backends[0].excluded) == {1234},
+        ),
+        ("thread para", not live.running),
+        (
+            "sem exclusão: falhas contadas, sem quadro",
+            failing_stats["live_failures"] > 0 and failing_last is None,
+        ),
+        (
+            "sem exclusão: intervalo dobra a cada falha",
+            failing_stats["live_failures"] <= 6,
+        ),
+        (
+            "sem exclusão: thread desiste depois de falhas seguidas",
+            gave_up_stats["live_gave_up"]
+            and gave_up_stats["live_failures"] == 4
+            and not gave_up_stats["live_active"],
+        ),
+    ]
+
+
+def run_overlay(app, overlay, seconds):
+    overlay.frame_stats.reset()
+    overlay.show_overlay()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+    stats = overlay.stats()
+    image = overlay.grab().toImage()
+    overlay.hide_overlay()
+    app.processEvents()
+    return stats, image
+
+
+def overlay_checks(app, args):
+    from spotpress.appcontext import AppContext
+    from spotpress.capture import SyntheticCaptureBackend
+    from spotpress.spotlight import SpotlightOverlayWindow
+
+    ctx = AppContext()
+    ctx.config.update(
+        general_always_capture=False,
+        general_auto_mode=False,
+        general_capture_backend="synthetic",
+        magnify_background_mode=2,
+        magnify_live=False,
+        magnify_live_fps=args.fps,
+    )
+    ctx.current_mode = MODE_MAG_GLASS
+    overlay = SpotlightOverlayWindow(ctx, QRect(0, 0, 800, 600))
+    ctx.overlay_window = overlay
+    ctx.current_screen_height = 600
+
+    static, _ = run_overlay(app, overlay, args.seconds)
+    ctx.config["magnify_live"] = True
+    live, image = run_overlay(app, overlay, args.seconds)
+    stopped = overlay.live is None and not overlay.stats()["live_active"]
+
+    cursor = overlay.mapFromGlobal(overlay.center_screen)
+    expected = SyntheticCaptureBackend().color_at(cursor.x(), cursor.y())
+
+    # Thread que desistiu: não recomeça a cada quadro, só no próximo show
+    overlay.show_overlay()
+    for _ in range(5):
+        app.processEvents()
+        time.sleep(0.016)
+    gave_up = overlay.live
+    gave_up.stop()
+    for _ in range(10):
+        app.processEvents()
+        time.sleep(0.016)
+    kept_stopped = overlay.live is gave_up and overlay._live_frame() is None
+    overlay.hide_overlay()
+    overlay.show_overlay()
+    for _ in range(5):
+        app.processEvents()
+        time.sleep(0.016)
+    restarted = overlay.live is not None and overlay.live is not gave_up and overlay.live.running
+    overlay.hide_overlay()
+    app.processEvents()
+
+    ctx.config["general_capture_backend"] = "qt"
+    overlay.show_overlay()
+    for _ in range(5):
+        app.processEvents()
+        time.sleep(0.02)
+    qt_static = overlay.live is None
+    overlay.hide_overlay()
+
+    print(f"\noverlay 800x600, lupa 35% zoom 2, {args.seconds:.1f} s cada:")
+    for label, stats in (("estática", static), ("ao vivo", live)):
+        print(
+            f"  {label:9} {stats['fps']:5.1f} fps, pintura p50 {stats['paint_p50_ms']:.2f} ms,"
+            f" p95 {stats['paint_p95_ms']:.2f} ms"
+        )
+    print(
+        f"  captura ao vivo: {live['live_frames']} quadros, {live['live_fps']} fps,"
+        f" p50 {live['live_capture_p50_ms']:.2f} ms"
+    )
+    return [
+        ("overlay: thread capturando com a lupa visível", live["live_frames"] > 0),
+        ("overlay: lente mostra o conteúdo sob o cursor", image.pixelColor(cursor) == expected),
+        ("overlay: taxa de quadros mantida", live["fps"] >= static["fps"] * 0.8),
+        ("overlay: thread para ao esconder", stopped),
+        ("overlay: thread parada não recomeça sozinha", kept_stopped),
+        ("overlay: thread recomeça no próximo show", restarted),
+        ("overlay: backend qt fica na imagem estática", qt_static),
+    ]
+
+
+def preferences_checks(app):
+    from spotpress.appcontext import AppContext
+    from spotpress.ui.preferences_tab import PreferencesTab
+
+    ctx = AppContext()
+    ctx.config["general_capture_backend"] = "synthetic"
+    tab = PreferencesTab(None, ctx)
+    offered = tab.magnify_live.isEnabled() and tab.magnify_live_fps.isEnabled()
+    ctx.config["general_capture_backend"] = "qt"
+    app.processEvents()
+    disabled = not tab.magnify_live.isEnabled() and not tab.magnify_live_fps.isEnabled()
+    explained = "qt" in tab.magnify_live.toolTip()
+    ctx.config["general_capture_backend"] = "synthetic"
+    app.processEvents()
+    return [
+        ("preferências: opção ao vivo com backend que exclui", offered),
+        ("preferências: desabilitada com o backend qt", disabled and explained),
+        ("preferências: volta ao trocar o backend", tab.magnify_live.isEnabled()),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument(
+        "--cost", type=float, default=0.002, help="segundos por captura simulada"
+    )
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    checks = (
+        worker_checks(app, args) + overlay_checks(app, args) + preferences_checks(app)
+    )
+
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
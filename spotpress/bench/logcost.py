@@ -0,0 +1,169 @@
+"""
+Custo do log nos caminhos quentes dos drivers fora do modo debug.
+
+Compara, por chamada, o caminho antigo (f-string + AppContext.log + sinal
+Qt emitido da thread de entrada, descartado depois em append_log) com o
+logger por níveis (PointerDevice.log_action com DEBUG desabilitado), e roda
+um driver inteiro com o log desligado e ligado:
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.logcost --calls 1000000
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from spotpress import logger
+from spotpress.bench.drivers import SCENARIOS, hidraw_feed, run_stream
+from spotpress.bench.fakes import FakeAppContext, make_fake_driver
+from spotpress.qtcompat import QApplication, QObject, pyqtSignal
+
+BUTTONS = ("OK", "PREV", "NEXT", "LASER")
+
+
+class LegacyWindow(QObject):
+    """thread_safe_log + append_log como eram: sinal por mensagem."""
+
+    log_signal = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.debug_mode = False
+        self.received = 0
+        self.log_signal.connect(self.append_log)
+
+    def append_log(self, message):
+        self.received += 1
+        if self.debug_mode:
+            print(message)
+
+    def thread_safe_log(self, message):
+        self.log_signal.emit(message)
+
+
+class LegacyDevice:
+    def __init__(self, window):
+        self._log_function = window.thread_safe_log
+
+    def ctx_log(self, message):
+        if self._log_function:
+            self._log_function(message)
+
+    def log(self, message):
+        self.ctx_log(f"[{self.__class__.__name__}] - {message}")
+
+    def do_action(self, button):
+        self.log(f"DO ACTION -> {button}")
+
+
+class Formatted:
+    """Conta quantas vezes o argumento foi de fato formatado."""
+
+    count = 0
+
+    def __str__(self):
+        Formatted.count += 1
+        return "x"
+
+
+def noop(button):
+    pass
+
+
+def time_calls(func, calls):
+    """ns por chamada de func(botão), rodando numa thread como os drivers."""
+    box = {}
+
+    def run():
+        start = time.perf_counter_ns()
+        for i in range(calls):
+            func(BUTTONS[i & 3])
+        box["ns"] = (time.perf_counter_ns() - start) / calls
+
+    t = threading.Thread(target=run)
+    t.start()
+    t.join()
+    return box["ns"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args(argv)
+    n = args.calls
+
+    app = QApplication(sys.argv[:1])
+    logger.configure(level=logger.WARN)
+    received = []
+    logger.set_sink(lambda text, level, name: received.append((text, level, name)))
+
+    window = LegacyWindow()
+    legacy = LegacyDevice(window)
+    legacy_ns = time_calls(legacy.do_action, n)
+    start = time.perf_counter()
+    app.processEvents()
+    drain_ns = (time.perf_counter() - start) * 1e9 / max(window.received, 1)
+
+    cls, _, items, _, mode = SCENARIOS[0]
+    ctx = FakeAppContext()
+    dev = make_fake_driver(cls, ctx)
+    ctx.current_mode = mode
+    noop_ns = time_calls(noop, n)
+    new_ns = time_calls(dev.log_action, n)
+    silent = len(received) == 0
+
+    print(f"{n} chamadas de log por ação, fora do modo debug (thread de entrada):")
+    print(f"  chamada vazia:        {noop_ns:7.1f} ns")
+    print(f"  logger por níveis:    {new_ns:7.1f} ns")
+    print(
+        f"  antigo (sinal):       {legacy_ns:7.1f} ns"
+        f" + {drain_ns:.1f} ns na thread da GUI para descartar"
+    )
+
+    feed = hidraw_feed(dev)
+    off = run_stream(feed, items, args.count, 1)
+    logger.configure(level=logger.DEBUG)
+    on = run_stream(feed, items, args.count, 1)
+    logger.configure(level=logger.WARN)
+    dev.stop()
+    print(f"{cls.__name__} [hidraw], {args.count} pacotes:")
+    for label, r in (("log desligado", off), ("log ligado", on)):
+        print(
+            f"  {label:14} {r['items'] / r['elapsed']:10.0f} pacotes/s,"
+            f" p50 {r['p50']:.1f} us, p99 {r['p99']:.1f} us"
+        )
+
+    received.clear()
+    log = logger.get_logger("bench.check")
+    log.debug("%s", Formatted())
+    lazy = Formatted.count == 0 and not received
+    logger.configure(subsystems={"bench": logger.DEBUG})
+    log.debug("%s", Formatted())
+    logger.get_logger("app").debug("não deve passar")
+    dev.log_action("OK")
+    scoped = Formatted.count == 1 and [r[2] for r in received] == ["bench.check"]
+
+    received.clear()
+    logger.configure(subsystems={"hw": logger.DEBUG})
+    dev.log_action("OK")
+    expected = (f"[{cls.__name__}] - DO ACTION -> OK", "DEBUG", f"hw.{cls.__name__}")
+
+    checks = [
+        ("nada chega ao sink abaixo do nível", silent),
+        ("mensagem desabilitada não é formatada", lazy),
+        ("nível por subsistema", scoped),
+        ("driver com hw=DEBUG", received == [expected]),
+        ("log desabilitado mais barato que o sinal", new_ns < legacy_ns),
+    ]
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
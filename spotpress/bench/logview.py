@@ -0,0 +1,151 @@
+"""
+Compara a aba de log antiga (QTextEdit.append por mensagem, via sinal
+enfileirado) com o buffer circular + QPlainTextEdit atualizado em lote.
+
+Uma thread produtora gera mensagens no formato dos drivers ("[Classe] -
+DO ACTION -> ...") enquanto a thread da GUI processa eventos; mede o tempo
+até a última mensagem aparecer no widget e o tamanho final do documento:
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.logview --messages 20000
+"""
+
+import argparse
+import io
+import sys
+import threading
+import time
+from datetime import datetime
+
+from spotpress.qtcompat import QApplication, QObject, QTextEdit, pyqtSignal
+
+DEVICES = ("SpotlightDevice", "VirtualPointer", "BaseusOrangeDotAI")
+
+
+def message(i):
+    if i % 50 == 0:
+        return f"! Dispositivo {i} não apareceu após o plug."
+    return f"[{DEVICES[i % len(DEVICES)]}] - DO ACTION -> {i}"
+
+
+def produce(sink, count):
+    for i in range(count):
+        sink(message(i))
+
+
+class LegacySink(QObject):
+    log_signal = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.received = 0
+        self.log_signal.connect(self.append)
+
+    def append(self, msg):
+        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        self.text.append(f"{timestamp} - {msg}")
+        self.received += 1
+
+
+def pump(app, predicate, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if predicate():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def run(app, sink, done, count):
+    producer = threading.Thread(target=produce, args=(sink, count), daemon=True)
+    start = time.perf_counter()
+    producer.start()
+    ok = pump(app, lambda: not producer.is_alive() and done())
+    return time.perf_counter() - start, ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--capacity", type=int, default=5000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args(argv)
+    n = args.messages
+    last = message(n - 1)
+
+    app = QApplication(sys.argv[:1])
+
+    from spotpress.ui.log_tab import LogTab
+
+    tab = LogTab(None, None, capacity=args.capacity)
+    tab.level_combo.setCurrentText("DEBUG")
+    tab.show()
+    new_time, new_ok = run(
+        app,
+        tab.append_log_message,
+        lambda: tab.buffer.received == n
+        and tab.log_text.toPlainText().endswith(last),
+        n,
+    )
+    blocks = tab.log_text.document().blockCount()
+    print(
+        f"buffer + lote:   {new_time * 1e3:8.1f} ms, {tab.flushes} appends,"
+        f" {blocks} linhas no widget"
+    )
+
+    if not args.skip_legacy:
+        legacy = LegacySink()
+        legacy_time, legacy_ok = run(
+            app, legacy.log_signal.emit, lambda: legacy.received == n, n
+        )
+        print(
+            f"append por linha: {legacy_time * 1e3:8.1f} ms, {legacy.received} appends,"
+            f" {legacy.text.document().blockCount()} linhas no widget"
+        )
+
+    tab.device_combo.setCurrentText(DEVICES[1])
+    filtered = tab.log_text.toPlainText().splitlines()
+    tab.device_combo.setCurrentIndex(0)
+    tab.level_combo.setCurrentText("WARN")
+    warnings = tab.log_text.toPlainText().splitlines()
+    tab.level_combo.setCurrentText("DEBUG")
+
+    saved = io.StringIO()
+    tab.buffer.write_to(saved)
+    saved_lines = saved.getvalue().splitlines()
+
+    # Mensagem de um dispositivo novo que chega antes do próximo flush:
+    # mudar o filtro tem que registrar o dispositivo também
+    tab.append_log_message("[NovoDispositivo] - DO ACTION -> 1")
+    tab.level_combo.setCurrentText("INFO")
+    tab.level_combo.setCurrentText("DEBUG")
+    devices = [tab.device_combo.itemText(i) for i in range(tab.device_combo.count())]
+
+    checks = [
+        ("última mensagem exibida", new_ok),
+        ("widget limitado à capacidade", blocks <= args.capacity),
+        (
+            "buffer guarda as mais recentes",
+            len(tab.buffer) == min(n, args.capacity) and saved_lines[-1].endswith(last),
+        ),
+        (
+            "filtro por dispositivo",
+            filtered and all(f"[{DEVICES[1]}]" in line for line in filtered),
+        ),
+        ("filtro por nível", warnings and all(" - ! " in line for line in warnings)),
+        ("dispositivo novo registrado ao refiltrar", "NovoDispositivo" in devices),
+    ]
+    if not args.skip_legacy:
+        checks.append(("fluxo antigo recebeu tudo", legacy_ok))
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
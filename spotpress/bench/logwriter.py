@@ -0,0 +1,215 @@
+"""
+Verifica o gravador assíncrono de log e traces.
+
+Várias threads produtoras (como as threads hidraw/evdev dos drivers)
+enfileiram linhas de log e traces num LogWriter apontado para um diretório
+temporário, com arquivos pequenos para forçar rotação. Mede o custo por
+chamada nas produtoras (comparado a um write() síncrono por linha) e
+confere que tudo foi gravado, em ordem, em lotes. Também simula um disco
+que falha em toda gravação e confere que o erro chega ao logger, limitado,
+sem voltar para a fila do próprio gravador:
+
+    python -m spotpress.bench.logwriter --threads 4 --records 50000
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from array import array
+
+from spotpress import logger
+from spotpress.logwriter import LOG_FILE, TRACE_FILE, LogWriter
+
+BUTTONS = ("OK", "PREV", "NEXT", "LASER")
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def producer(index, count, log, trace, latencies):
+    perf = time.perf_counter_ns
+    append = latencies.append
+    device = f"Device{index}"
+    for seq in range(count):
+        button = BUTTONS[seq & 3]
+        t0 = perf()
+        log(f"[{device}] - DO ACTION -> {button} #{seq}", "DEBUG", f"hw.{device}")
+        trace(device, button, 2, 12.5)
+        append(perf() - t0)
+
+
+def run_producers(threads, count, log, trace):
+    latencies = [array("q") for _ in range(threads)]
+    workers = [
+        threading.Thread(target=producer, args=(i, count, log, trace, latencies[i]))
+        for i in range(threads)
+    ]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, sorted(v for lat in latencies for v in lat)
+
+
+class SyncWriter:
+    """Referência: cada chamada formata e grava na hora, com lock."""
+
+    def __init__(self, directory):
+        self._lock = threading.Lock()
+        self._log = os.open(os.path.join(directory, "sync.log"), os.O_WRONLY | os.O_CREAT)
+        self._trace = os.open(os.path.join(directory, "sync.jsonl"), os.O_WRONLY | os.O_CREAT)
+
+    def log(self, text, level, subsystem):
+        line = f"{time.time():.3f} {level:5} {subsystem} {text}\n".encode()
+        with self._lock:
+            os.write(self._log, line)
+
+    def trace(self, device, token, mode, latency_us):
+        line = json.dumps(
+            {"t": time.time(), "device": device, "token": token, "mode": mode}
+        )
+        with self._lock:
+            os.write(self._trace, (line + "\n").encode())
+
+    def close(self):
+        os.close(self._log)
+        os.close(self._trace)
+
+
+def read_all(directory, name):
+    # Do mais antigo (.N) para o atual
+    paths = sorted(
+        glob.glob(os.path.join(directory, name + ".*")),
+        key=lambda p: -int(p.rsplit(".", 1)[1]),
+    )
+    lines = []
+    for path in paths + [os.path.join(directory, name)]:
+        with open(path, encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def failing_disk_checks(directory):
+    """Toda gravação falha: (erros no logger, falhas contadas, registros na fila)."""
+    reported = []
+    logger.set_sink(lambda text, level, subsystem: reported.append((text, level)))
+    writer = LogWriter(directory, interval=0.01)
+    logger.add_sink(writer.log)
+
+    def fail(chunks):
+        raise OSError(28, "No space left on device")
+
+    writer._log_file.write_batch = fail
+    try:
+        for i in range(20):
+            writer.log(f"linha {i}", "INFO", "bench")
+            time.sleep(0.02)
+        writer.flush()
+    finally:
+        logger.remove_sink(writer.log)
+        logger.set_sink(None)
+        writer.close()
+    return reported, writer.write_errors, writer.records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--records", type=int, default=50_000, help="por thread")
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024)
+    args = parser.parse_args(argv)
+    total = args.threads * args.records
+
+    failed = False
+
+    def check(label, ok):
+        nonlocal failed
+        print(f"{'OK  ' if ok else 'FAIL'} {label}")
+        failed |= not ok
+
+    with tempfile.TemporaryDirectory(prefix="spotpress-logwriter-") as directory:
+        sync = SyncWriter(directory)
+        sync_elapsed, sync_lat = run_producers(
+            args.threads, args.records, sync.log, sync.trace
+        )
+        sync.close()
+
+        writer = LogWriter(
+            directory, max_bytes=args.max_bytes, backups=1000, max_pending=2 * total
+        )
+        elapsed, lat = run_producers(args.threads, args.records, writer.log, writer.trace)
+        start = time.perf_counter()
+        flushed = writer.flush(timeout=60)
+        drain = time.perf_counter() - start
+        writer.close()
+
+        print(
+            f"{args.threads} threads x {args.records} (log + trace) por chamada:"
+        )
+        for label, e, values in (
+            ("LogWriter", elapsed, lat),
+            ("write() síncrono", sync_elapsed, sync_lat),
+        ):
+            print(
+                f"  {label:17} p50 {percentile(values, 50) / 1000:6.2f} us,"
+                f" p99 {percentile(values, 99) / 1000:6.2f} us,"
+                f" máx {values[-1] / 1000:8.1f} us,"
+                f" {total / e:10,.0f} chamadas/s"
+            )
+        print(
+            f"  gravação: {writer.records} registros em {writer.batches} lotes,"
+            f" {writer.rotations} rotações, {drain * 1e3:.1f} ms para esvaziar"
+        )
+
+        logs = read_all(directory, LOG_FILE)
+        traces = read_all(directory, TRACE_FILE)
+        try:
+            parsed = [json.loads(line) for line in traces]
+            valid = all(
+                set(p) == {"t", "device", "token", "mode", "latency_us"} for p in parsed
+            )
+        except ValueError:
+            parsed, valid = [], False
+
+        in_order = True
+        last = {}
+        for line in logs:
+            device = line.split("[", 1)[1].split("]", 1)[0]
+            seq = int(line.rsplit("#", 1)[1])
+            if seq != last.get(device, -1) + 1:
+                in_order = False
+                break
+            last[device] = seq
+
+        check("fila esvaziada", flushed)
+        check(f"{len(logs)}/{total} linhas de log gravadas", len(logs) == total)
+        check(f"{len(parsed)}/{total} traces JSON válidos", len(parsed) == total and valid)
+        check("ordem preservada por thread, através das rotações", in_order)
+        check("arquivos rotacionados", writer.rotations > 0)
+        check("gravação em lotes", writer.batches < writer.records / 100)
+        check("nada descartado", writer.dropped == 0)
+
+    with tempfile.TemporaryDirectory(prefix="spotpress-logwriter-") as directory:
+        reported, errors, records = failing_disk_checks(directory)
+    print(f"\ndisco falhando: {errors} gravações falharam, {len(reported)} erros no log")
+    check(
+        "falha de gravação chega ao logger como erro",
+        bool(reported) and reported[0][1] == "ERRO" and "No space" in reported[0][0],
+    )
+    check("falhas seguidas avisadas uma vez por intervalo", errors > 1 and len(reported) == 1)
+    check("erro não volta para a fila do gravador", records == 20)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Filtros da lupa: nearest e bilinear, ampliados direto da origem.
+
+Monta um "slide" com texto, move a lente por ele com zoom 2 a 5 e mede o
+custo por quadro de cada filtro contra o caminho antigo (pixmap com
+margem alocado a cada quadro, sem filtro). Confere que os dois filtros
+dão imagens diferentes e depois a integração com o SpotlightOverlayWindow
+real, inclusive o "smooth" de versões anteriores:
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.magnifyfilter --frames 200
+"""
+
+import argparse
+import math
+import sys
+import time
+
+from spotpress.qtcompat import (
+    QApplication,
+    QColor,
+    QFont,
+    QImage,
+    QImage_Format_RGB32,
+    QPainter,
+    QPainter_SmoothPixmapTransform,
+    QPixmap,
+    QPoint,
+    QRect,
+    QRectF,
+    Qt_Color_Transparent,
+)
+from spotpress.utils import MODE_MAG_GLASS
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+
+def make_slide(width, height):
+    image = QImage(width, height, QImage_Format_RGB32)
+    image.fill(QColor(250, 250, 245))
+    painter = QPainter(image)
+    painter.setPen(QColor(20, 20, 40))
+    for i, size in enumerate(range(10, height // 30)):
+        painter.setFont(QFont("Sans", size))
+        y = 20 + sum(range(10, 10 + i)) * 1.6
+        if y > height:
+            break
+        painter.drawText(20, int(y), "Lorem ipsum dolor sit amet, consectetur 0123456789 " * 3)
+    painter.end()
+    return QPixmap.fromImage(image)
+
+
+def lens_rects(cursor, height, zoom, size_pct=35, aspect=0.65):
+    # Mesma geometria de SpotlightOverlayWindow._magnifier_rects (retângulo)
+    width = height * size_pct / 100.0 * 2
+    lens_height = int(width * aspect)
+    src_w, src_h = int(width / zoom), int(lens_height / zoom)
+    src = QRect(cursor.x() - src_w // 2, cursor.y() - src_h // 2, src_w, src_h)
+    dest = QRect(
+        int(cursor.x() - width // 2), int(cursor.y() - lens_height // 2), int(width), lens_height
+    )
+    return src, dest
+
+
+def cursor_path(frames, width, height, speed):
+    for i in range(frames):
+        t = i * speed / max(width, height)
+        yield QPoint(
+            int(width / 2 + width * 0.4 * math.sin(t * 1.3)),
+            int(height / 2 + height * 0.4 * math.sin(t * 0.9 + 0.5)),
+        )
+
+
+def draw_old(painter, pixmap, src, dest):
+    # drawMagnifyingGlass antes dos níveis: margem de 100 px a cada quadro
+    padding = 100
+    padded = QPixmap(pixmap.width() + padding * 2, pixmap.height() + padding * 2)
+    padded.fill(Qt_Color_Transparent)
+    pad_painter = QPainter(padded)
+    pad_painter.drawPixmap(padding, padding, pixmap)
+    pad_painter.end()
+    painter.drawPixmap(dest, padded, src.translated(padding, padding))
+
+
+def draw_direct(painter, pixmap, src, dest, smooth):
+    clipped = src.intersected(pixmap.rect())
+    sx = dest.width() / src.width()
+    sy = dest.height() / src.height()
+    target = QRectF(
+        dest.x() + (clipped.x() - src.x()) * sx,
+        dest.y() + (clipped.y() - src.y()) * sy,
+        clipped.width() * sx,
+        clipped.height() * sy,
+    )
+    painter.setRenderHint(QPainter_SmoothPixmapTransform, smooth)
+    painter.drawPixmap(target, pixmap, QRectF(clipped))
+    painter.setRenderHint(QPainter_SmoothPixmapTransform, False)
+
+
+def simulate(args):
+    width, height = args.width, args.height
+    slide = make_slide(width, height)
+    target = QPixmap(width, height)
+    path = list(cursor_path(args.frames, width, height, args.speed))
+
+    print(f"slide {width}x{height}, lupa 35%, {args.frames} quadros (p50 / p95 por quadro):")
+    print(f"  {'zoom':>4} {'antigo':>15} {'nearest':>15} {'bilinear':>15}")
+    for zoom in range(2, 6):
+        costs = {"antigo": [], "nearest": [], "bilinear": []}
+        painter = QPainter(target)
+        for cursor in path:
+            src, dest = lens_rects(cursor, height, zoom)
+            for name in costs:
+                t0 = time.perf_counter()
+                if name == "antigo":
+                    draw_old(painter, slide, src, dest)
+                else:
+                    draw_direct(painter, slide, src, dest, name == "bilinear")
+                costs[name].append(time.perf_counter() - t0)
+        painter.end()
+        print(
+            f"  {zoom:>4} "
+            + " ".join(
+                f"{percentile(v, 50) * 1e3:6.2f}/{percentile(v, 95) * 1e3:6.2f}ms"
+                for v in costs.values()
+            )
+        )
+        if zoom == 2:
+            zoom2 = {name: percentile(v, 50) for name, v in costs.items()}
+
+    # O mesmo recorte com cada filtro: o bilinear tem de interpolar
+    src, dest = lens_rects(QPoint(width // 3, height // 3), height, 3)
+    lenses = {}
+    for name in ("nearest", "bilinear"):
+        image = QImage(width, height, QImage_Format_RGB32)
+        painter = QPainter(image)
+        draw_direct(painter, slide, src, dest, name == "bilinear")
+        painter.end()
+        lenses[name] = image.copy(dest)
+
+    return [
+        ("nearest e bilinear dão imagens diferentes", lenses["nearest"] != lenses["bilinear"]),
+        ("bilinear no zoom 2 mais barato que o caminho antigo", zoom2["bilinear"] < zoom2["antigo"]),
+        ("nearest no zoom 2 mais barato que o caminho antigo", zoom2["nearest"] < zoom2["antigo"]),
+    ]
+
+
+def overlay_checks(app):
+    from spotpress.appcontext import AppContext
+    from spotpress.capture import SyntheticCaptureBackend
+    from spotpress.spotlight import SpotlightOverlayWindow
+
+    ctx = AppContext()
+    ctx.config.update(
+        general_always_capture=False,
+        general_auto_mode=False,
+        general_capture_backend="synthetic",
+        magnify_background_mode=2,
+    )
+    ctx.current_mode = MODE_MAG_GLASS
+    overlay = SpotlightOverlayWindow(ctx, QRect(0, 0, 800, 600))
+    ctx.overlay_window = overlay
+    ctx.current_screen_height = 600
+    cursor = overlay.mapFromGlobal(overlay.center_screen)
+    expected = SyntheticCaptureBackend().color_at(cursor.x(), cursor.y())
+
+    def run(mag_filter, zoom):
+        ctx.config.update(magnify_filter=mag_filter, magnify_zoom=zoom)
+        overlay.frame_stats.reset()
+        overlay.show_overlay()
+        for _ in range(15):
+            app.processEvents()
+            time.sleep(0.016)
+        stats = overlay.stats()
+        lens_ok = overlay.grab().toImage().pixelColor(cursor) == expected
+        overlay.hide_overlay()
+        app.processEvents()
+        return stats, lens_ok
+
+    print("\noverlay 800x600 (tiles), pintura p50:")
+    checks = []
+    # "smooth" é o valor de versões anteriores, que vale como bilinear
+    for mag_filter in ("nearest", "bilinear", "smooth"):
+        for zoom in (2, 3):
+            stats, lens_ok = run(mag_filter, zoom)
+            print(f"  {mag_filter:8} zoom {zoom}: {stats['paint_p50_ms']:.2f} ms")
+            checks.append((f"overlay: {mag_filter} zoom {zoom} mostra o conteúdo", lens_ok))
+
+    overlay.invalidate_tiles()
+    ctx.config["magnify_background_mode"] = 1
+    ctx.current_mode = MODE_MAG_GLASS
+    overlay.capture_screenshot()
+    for mag_filter in ("nearest", "bilinear"):
+        _, lens_ok = run(mag_filter, 2)
+        checks.append((f"overlay: screenshot inteiro, {mag_filter}", lens_ok))
+    overlay.release_buffers()
+    return checks
+
+
+def preferences_checks():
+    import configparser
+
+    from spotpress.appcontext import AppContext
+    from spotpress.ui.preferences_tab import PreferencesTab
+
+    tab = PreferencesTab(None, AppContext())
+    filters = [tab.magnify_filter.itemText(i) for i in range(tab.magnify_filter.count())]
+    config = configparser.ConfigParser()
+    config.read_string("[Magnify]\nfilter = smooth\n")
+    tab.load_config(config)
+    return [
+        ("preferências: só nearest e bilinear", filters == ["Nearest", "Bilinear"]),
+        (
+            "preferências: smooth de versões anteriores vira bilinear",
+            tab.magnify_filter.currentText() == "Bilinear",
+        ),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--speed", type=float, default=30, help="pixels por quadro")
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    checks = simulate(args) + overlay_checks(app) + preferences_checks()
+
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
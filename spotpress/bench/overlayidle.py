@@ -0,0 +1,135 @@
+"""
+Confere que o overlay fica quieto enquanto está oculto.
+
+Cria o SpotlightOverlayWindow real (sem dispositivo) e conta, com um filtro
+de eventos na aplicação, quantos eventos de timer a thread da GUI recebe
+por segundo com o overlay visível, oculto e oculto com o timer antigo
+(sempre ligado). Também verifica que os screenshots são liberados depois
+de `general_release_delay` segundos oculto:
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.overlayidle --seconds 2
+"""
+
+import argparse
+import sys
+import time
+
+from spotpress.qtcompat import QApplication, QEvent, QObject, QRect
+from spotpress.utils import MODE_LASER
+
+try:
+    QEvent_Timer = QEvent.Type.Timer
+except AttributeError:
+    QEvent_Timer = QEvent.Timer
+
+
+class TimerEventCounter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, a0, a1):
+        if a1 is not None and a1.type() == QEvent_Timer:
+            self.count += 1
+        return False
+
+
+def measure(app, counter, seconds):
+    counter.count = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+    return counter.count / seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    counter = TimerEventCounter()
+    app.installEventFilter(counter)
+
+    from spotpress.appcontext import AppContext
+    from spotpress.spotlight import SpotlightOverlayWindow
+
+    ctx = AppContext()
+    ctx.config.update(
+        general_always_capture=False, general_auto_mode=True, general_release_delay=1
+    )
+    ctx.current_mode = MODE_LASER
+    overlay = SpotlightOverlayWindow(ctx, QRect(0, 0, 1280, 720))
+    ctx.overlay_window = overlay
+
+    idle_before = measure(app, counter, args.seconds)
+
+    overlay.capture_screenshot(show_after=True, blur_level=3)
+    frames = overlay.frame_stats.frames
+    visible = measure(app, counter, args.seconds)
+    painted = overlay.frame_stats.frames - frames
+    captured = overlay.buffers_bytes()
+
+    # Com general_always_capture o hide_overlay mantém o screenshot; sem
+    # ele os pixmaps já são descartados no hide
+    ctx.config["general_always_capture"] = True
+    overlay.hide_overlay()
+    released_early = overlay.buffers_bytes() == 0
+    measure(app, counter, max(args.seconds, 1.5))
+    released = overlay.buffers_bytes() == 0
+    hidden_stats = overlay.stats()
+    hidden = measure(app, counter, args.seconds)
+
+    # Timer antigo: ligado no __init__ e nunca parado
+    overlay.timer.start()
+    legacy = measure(app, counter, args.seconds)
+    overlay.timer.stop()
+
+    ctx.config["general_always_capture"] = False
+    overlay.show_overlay()
+    resumed = overlay.timer.isActive()
+    overlay.hide_overlay()
+
+    # Padrão (always_capture ligado): o clear_pixmap() do __init__ não roda
+    default_ctx = AppContext()
+    try:
+        default_stats = SpotlightOverlayWindow(default_ctx, QRect(0, 0, 320, 240)).stats()
+    except AttributeError:
+        default_stats = None
+
+    print("eventos de timer por segundo na thread da GUI:")
+    print(f"  antes de mostrar:        {idle_before:6.1f}")
+    print(f"  visível:                 {visible:6.1f} ({painted / args.seconds:.1f} quadros/s)")
+    print(f"  oculto:                  {hidden:6.1f}")
+    print(f"  oculto, timer antigo:    {legacy:6.1f}")
+    print(
+        f"screenshots: {captured / 1e6:.1f} MB visível,"
+        f" {hidden_stats['buffers_bytes']} bytes depois de"
+        f" {ctx.config['general_release_delay']} s oculto"
+    )
+
+    checks = [
+        ("timer parado antes do primeiro show", idle_before < 1),
+        ("quadros enquanto visível", visible > 20 and painted > 0),
+        ("nenhuma acordada com o overlay oculto", hidden < 1),
+        ("timer antigo acordava mesmo oculto", legacy > 20),
+        ("screenshots mantidos até o prazo", captured > 0 and not released_early),
+        ("screenshots liberados depois do prazo", released),
+        ("--get-stats mostra o timer parado", not hidden_stats["timer_active"]),
+        ("timer volta ao mostrar", resumed),
+        (
+            "--get-stats com always_capture antes da primeira captura",
+            default_stats is not None and default_stats["buffers_bytes"] == 0,
+        ),
+    ]
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
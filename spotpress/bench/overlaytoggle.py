@@ -0,0 +1,151 @@
+"""
+Latência de exibição do overlay no modo AUTO: alternância rápida (janela
+mapeada, inerte quando oculta) contra hide()/showFullScreen().
+
+Alterna o SpotlightOverlayWindow real entre oculto e visível, como os
+drivers fazem quando o movimento começa e para, e mede o tempo do
+show_overlay até o primeiro quadro pintado, o custo das chamadas e quantas
+vezes a janela foi mapeada:
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.overlaytoggle --cycles 200
+
+Com QT_QPA_PLATFORM=offscreen não há servidor X nem compositor, então o
+custo de mapear a janela aparece só em parte; rode num X real para ver a
+diferença completa.
+"""
+
+import argparse
+import sys
+import time
+
+from spotpress.qtcompat import (
+    QApplication,
+    QEvent,
+    QObject,
+    QPixmap,
+    QRect,
+    Qt_WindowType_WindowTransparentForInput,
+)
+from spotpress.utils import MODE_LASER
+
+try:
+    QEvent_Show = QEvent.Type.Show
+except AttributeError:
+    QEvent_Show = QEvent.Show
+
+
+class ShowCounter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, a0, a1):
+        if a1 is not None and a1.type() == QEvent_Show:
+            self.count += 1
+        return False
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+
+def run(app, overlay, cycles):
+    shows = ShowCounter()
+    overlay.installEventFilter(shows)
+    overlay.show_latency.clear()
+    calls = []
+    for _ in range(cycles):
+        t0 = time.perf_counter()
+        overlay.show_overlay()
+        calls.append(time.perf_counter() - t0)
+        deadline = time.monotonic() + 1
+        while overlay._show_requested is not None and time.monotonic() < deadline:
+            app.processEvents()
+        t0 = time.perf_counter()
+        overlay.hide_overlay()
+        calls.append(time.perf_counter() - t0)
+        app.processEvents()
+    overlay.removeEventFilter(shows)
+    return list(overlay.show_latency), calls, shows.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=200)
+    args = parser.parse_args(argv)
+    n = args.cycles
+
+    app = QApplication(sys.argv[:1])
+
+    from spotpress.appcontext import AppContext
+    from spotpress.spotlight import SpotlightOverlayWindow
+
+    ctx = AppContext()
+    ctx.support_auto_mode = True
+    ctx.config.update(general_always_capture=False, general_auto_mode=True)
+    ctx.current_mode = MODE_LASER
+    overlay = SpotlightOverlayWindow(ctx, QRect(0, 0, 1280, 720))
+    overlay.show_latency = type(overlay.show_latency)(maxlen=n)
+    ctx.overlay_window = overlay
+
+    results = {}
+    for label, fast in (("hide/showFullScreen", False), ("alternância rápida", True)):
+        ctx.config["general_fast_toggle"] = fast
+        results[label] = run(app, overlay, n)
+
+    print(f"{n} ciclos show/hide no modo laser:")
+    print(
+        f"  {'caminho':22} {'show→quadro p50':>16} {'p99':>9}"
+        f" {'chamada p50':>12} {'mapeamentos':>12}"
+    )
+    for label, (latency, calls, shows) in results.items():
+        print(
+            f"  {label:22} {percentile(latency, 50) * 1e3:13.3f} ms"
+            f" {percentile(latency, 99) * 1e3:6.3f} ms"
+            f" {percentile(calls, 50) * 1e6:9.1f} us {shows:12d}"
+        )
+
+    fast_latency, _, fast_shows = results["alternância rápida"]
+    _, _, legacy_shows = results["hide/showFullScreen"]
+    stats = overlay.stats()
+
+    def transparent_for_input():
+        handle = overlay.windowHandle()
+        return bool(handle.flags() & Qt_WindowType_WindowTransparentForInput)
+
+    dormant_input = transparent_for_input()
+    # Inerte a janela segue mapeada; o prazo de liberação ainda vale
+    overlay.pixmap = QPixmap(64, 64)
+    overlay.release_buffers()
+    released = overlay.isVisible() and overlay.buffers_bytes() == 0
+    overlay.show_overlay()
+    active_input = not transparent_for_input()
+    overlay.hide_overlay()
+
+    checks = [
+        ("todo show pintou um quadro", len(fast_latency) == n),
+        ("janela mapeada no máximo uma vez", fast_shows <= 1),
+        ("caminho antigo mapeia a cada show", legacy_shows == n),
+        ("inerte: timer parado", stats["dormant"] and not stats["timer_active"]),
+        ("inerte: overlay não conta como visível", not overlay.is_overlay_actually_visible()),
+        ("inerte: janela transparente para a entrada", dormant_input),
+        ("ativa: janela volta a receber entrada", active_input),
+        ("inerte: screenshots liberados com a janela mapeada", released),
+    ]
+    ctx.config["general_auto_mode"] = False
+    overlay.hide_overlay()
+    checks.append(("sem modo AUTO volta a esconder a janela", not overlay.isVisible()))
+
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
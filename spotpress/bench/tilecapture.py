@@ -0,0 +1,369 @@
+"""
+Captura por tiles em volta do cursor contra o screenshot do monitor inteiro.
+
+Simula um monitor 4K com o backend de captura sintético e move a lupa por
+ele como o overlay faz (prefetch dos tiles em volta da lente a cada quadro,
+captura com o overlay excluído quando falta um tile debaixo dela). A tela
+simulada mostra a lente pintada com alguns quadros de atraso (como um
+compositor), então uma captura sem exclusão por baixo dela guardaria a
+própria lente num tile; o mesmo percurso roda sem o histórico das áreas
+pintadas para mostrar o problema. Mede o custo da primeira captura, a
+memória residente e o custo por quadro; depois confere a integração com o
+SpotlightOverlayWindow real (sem apagar o overlay para capturar, screenshot
+inteiro quando a exclusão falha ou o backend não exclui):
+
+    QT_QPA_PLATFORM=offscreen python -m spotpress.bench.tilecapture --frames 600
+"""
+
+import argparse
+import math
+import sys
+import threading
+import time
+from collections import deque
+
+from spotpress.qtcompat import QApplication, QColor, QImage, QPainter, QPixmap, QPoint, QRect
+from spotpress.utils import MODE_LASER, MODE_MAG_GLASS, LASER_COLORS
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+
+def lens_rects(cursor, height, size_pct=35, zoom=2, aspect=0.65):
+    # Mesma geometria de SpotlightOverlayWindow._magnifier_rects (retângulo)
+    width = height * size_pct / 100.0 * 2
+    lens_height = int(width * aspect)
+    src_w, src_h = int(width / zoom), int(lens_height / zoom)
+    src = QRect(cursor.x() - src_w // 2, cursor.y() - src_h // 2, src_w, src_h)
+    dest = QRect(
+        int(cursor.x() - width // 2),
+        int(cursor.y() - lens_height // 2),
+        int(width),
+        lens_height,
+    )
+    return src, dest
+
+
+def cursor_path(frames, width, height, speed, jump_every=150):
+    # Lissajous: movimento contínuo cobrindo boa parte da tela, com um salto
+    # (ponteiro reposicionado) a cada `jump_every` quadros
+    for i in range(frames):
+        t = i * speed / max(width, height) + (i // jump_every) * 2.0
+        yield QPoint(
+            int(width / 2 + width * 0.4 * math.sin(t * 1.3)),
+            int(height / 2 + height * 0.4 * math.sin(t * 0.9 + 0.5)),
+        )
+
+
+# Cor da lente na tela simulada; o padrão sintético não a usa
+LENS_COLOR = QColor(255, 0, 255)
+
+
+class CompositedScreen:
+    """
+    Tela sintética com a lente pintada onde o overlay a desenhou `lag`
+    quadros antes; `grab(rect, exclude)` com exclude lê só o que está
+    debaixo do overlay, sem exclusão vê a lente.
+    """
+
+    def __init__(self, screen, lag):
+        from spotpress.capture import SyntheticCaptureBackend
+
+        self.screen = screen
+        self.backend = SyntheticCaptureBackend()
+        self.painted = deque(maxlen=lag + 1)
+        self.contaminated = 0
+
+    def paint(self, dest):
+        self.painted.append(dest)
+
+    def shown(self):
+        return self.painted[0] if self.painted else None
+
+    def grab(self, rect, exclude):
+        image = self.backend.grab(self.screen, rect)
+        lens = self.shown()
+        if not exclude and lens is not None and lens.intersects(rect):
+            self.contaminated += 1
+            painter = QPainter(image)
+            painter.fillRect(lens.translated(-rect.x(), -rect.y()), LENS_COLOR)
+            painter.end()
+        return image
+
+
+def run_path(args, history):
+    from spotpress.capture import ScreenGeometry
+    from spotpress.spotlight import PAINTED_HISTORY
+    from spotpress.tilecache import TileCache
+
+    width, height = args.width, args.height
+    screen = CompositedScreen(ScreenGeometry(QRect(0, 0, width, height)), args.lag)
+    full = QPixmap.fromImage(screen.backend.grab(screen.screen))
+
+    cache = TileCache(screen.grab, QRect(0, 0, width, height))
+    margin = cache.tile_size
+    path = list(cursor_path(args.frames, width, height, args.speed))
+    recent = deque(maxlen=PAINTED_HISTORY if history else 0)
+
+    src, dest = lens_rects(path[0], height)
+    t0 = time.perf_counter()
+    # Overlay ainda oculto: captura direta
+    cache.fetch(cache.missing(dest.adjusted(-margin, -margin, margin, margin)))
+    first_time = time.perf_counter() - t0
+    first_bytes = cache.bytes()
+
+    frame_costs = []
+    peak = 0
+    miss_frames = 0
+    exact = True
+    for i, cursor in enumerate(path):
+        src, dest = lens_rects(cursor, height)
+        t0 = time.perf_counter()
+        missing = cache.prefetch(src, dest, recent)
+        if missing:
+            # No overlay: captura sem ele, sem deixar de desenhar
+            miss_frames += 1
+            cache.fetch(missing, exclude=True)
+        region = cache.region(src)
+        frame_costs.append(time.perf_counter() - t0)
+        recent.append(dest)
+        screen.paint(dest)
+        peak = max(peak, cache.bytes())
+        if i % 10 == 0:
+            clipped = src.intersected(cache.bounds)
+            expected = full.copy(clipped).toImage()
+            got = region.copy(clipped.translated(-src.x(), -src.y())).toImage()
+            got = got.convertToFormat(expected.format())
+            exact &= got == expected
+    return {
+        "full": full,
+        "first_time": first_time,
+        "first_bytes": first_bytes,
+        "frame_costs": frame_costs,
+        "peak": peak,
+        "miss_frames": miss_frames,
+        "exact": exact,
+        "contaminated": screen.contaminated,
+        "cache": cache,
+    }
+
+
+def simulate(args):
+    from spotpress.capture import ScreenGeometry, SyntheticCaptureBackend
+
+    width, height = args.width, args.height
+    backend = SyntheticCaptureBackend()
+    t0 = time.perf_counter()
+    full = QPixmap.fromImage(backend.grab(ScreenGeometry(QRect(0, 0, width, height))))
+    full_time = time.perf_counter() - t0
+    full_bytes = full.width() * full.height() * full.depth() // 8
+
+    result = run_path(args, history=True)
+    without = run_path(args, history=False)
+    cache = result["cache"]
+    margin = cache.tile_size
+    frame_costs = result["frame_costs"]
+
+    print(
+        f"monitor {width}x{height}, lupa 35% zoom 2, {args.frames} quadros,"
+        f" lente na tela {args.lag} quadros depois de pintada:"
+    )
+    print(
+        f"  monitor inteiro: {full_time * 1e3:7.1f} ms, {full_bytes / 1e6:6.1f} MB"
+        " (mais o blur do fundo)"
+    )
+    print(
+        f"  tiles:           {result['first_time'] * 1e3:7.1f} ms,"
+        f" {result['first_bytes'] / 1e6:6.1f} MB"
+        f" na primeira captura, pico {result['peak'] / 1e6:.1f} MB"
+    )
+    print(
+        f"  por quadro: p50 {percentile(frame_costs, 50) * 1e3:.2f} ms,"
+        f" p99 {percentile(frame_costs, 99) * 1e3:.2f} ms;"
+        f" {cache.grabs} capturas, {result['miss_frames']} quadros capturando"
+        f" sem o overlay, {cache.evicted} tiles descartados"
+    )
+    print(
+        f"  capturas do anel sobre a lente: {result['contaminated']} com o histórico,"
+        f" {without['contaminated']} sem"
+    )
+    return [
+        ("recorte dos tiles igual ao screenshot", result["exact"]),
+        ("primeira captura menor que o monitor", result["first_bytes"] * 3 < full_bytes),
+        ("memória residente limitada", result["peak"] <= cache.max_tiles * margin * margin * 4),
+        (
+            "movimento contínuo quase sem captura excluindo o overlay",
+            result["miss_frames"] <= args.frames * 0.05,
+        ),
+        ("anel nunca capturado sobre a lente ainda na tela", result["contaminated"] == 0),
+        (
+            "sem o histórico a lente iria para os tiles (o teste vê o problema)",
+            without["contaminated"] > 0 and not without["exact"],
+        ),
+    ]
+
+
+def overlay_checks(app):
+    from spotpress.appcontext import AppContext
+    from spotpress.capture import SyntheticCaptureBackend
+    from spotpress.spotlight import SpotlightOverlayWindow
+
+    ctx = AppContext()
+    ctx.config.update(
+        general_always_capture=False,
+        general_auto_mode=False,
+        general_capture_backend="synthetic",
+        magnify_background_mode=2,
+    )
+    ctx.current_mode = MODE_MAG_GLASS
+    overlay = SpotlightOverlayWindow(ctx, QRect(0, 0, 800, 600))
+    ctx.overlay_window = overlay
+    ctx.current_screen_height = 600
+
+    overlay.show_overlay()
+    for _ in range(10):
+        app.processEvents()
+        time.sleep(0.02)
+    shown = overlay.stats()
+    image = overlay.grab().toImage()
+    cursor = overlay.mapFromGlobal(overlay.center_screen)
+    expected = SyntheticCaptureBackend().color_at(cursor.x(), cursor.y())
+    lens_ok = image.pixelColor(cursor) == expected
+
+    overlay.hide_overlay()
+    thread = threading.Thread(target=ctx.notify_slide_change, args=(1,))
+    thread.start()
+    thread.join()
+    app.processEvents()
+    invalidated = len(overlay.tiles) == 0
+
+    ctx.config["laser_color_index"] = len(LASER_COLORS) - 1
+    ctx.current_mode = MODE_LASER
+    frames = overlay.frame_stats.frames
+    overlay.show_overlay()
+    for _ in range(5):
+        app.processEvents()
+        time.sleep(0.02)
+    laser = overlay.stats()
+    overlay.hide_overlay()
+
+    ctx.config["magnify_background_mode"] = 1
+    ctx.current_mode = MODE_MAG_GLASS
+    shade_uses_tiles = overlay.tile_capture_enabled()
+    ctx.config["magnify_background_mode"] = 2
+
+    return [
+        ("lupa sem screenshot do monitor", overlay.pixmap.isNull() and shown["tiles"] > 0),
+        ("lente mostra o conteúdo sob o cursor", lens_ok),
+        ("troca de slide invalida os tiles", invalidated),
+        (
+            "laser invertido usa tiles",
+            laser["tiles"] > 0 and overlay.frame_stats.frames > frames,
+        ),
+        ("fundo com sombra volta ao screenshot inteiro", not shade_uses_tiles),
+    ] + no_blank_checks(app, ctx, overlay)
+
+
+def pump(app, frames):
+    for _ in range(frames):
+        app.processEvents()
+        time.sleep(0.02)
+
+
+def no_blank_checks(app, ctx, overlay):
+    """O overlay nunca deixa de se desenhar para capturar tiles."""
+    from spotpress import capture
+    from spotpress.capture import SyntheticCaptureBackend
+    from spotpress.spotlight import SLIDE_SETTLE_MS
+
+    cursor = overlay.mapFromGlobal(overlay.center_screen)
+    expected = SyntheticCaptureBackend().color_at(cursor.x(), cursor.y())
+
+    # Troca de slide com a lupa visível: os tiles antigos ficam na lente
+    # até o programa redesenhar, depois são recapturados sem o overlay
+    overlay.show_overlay()
+    pump(app, 5)
+    grabs = overlay.tiles.grabs
+    ctx.notify_slide_change(1)
+    settling = overlay.grab().toImage().pixelColor(cursor) == expected
+    pump(app, SLIDE_SETTLE_MS // 20 + 5)
+    refreshed = overlay.tiles.grabs > grabs and len(overlay.tiles) > 0
+    after = overlay.grab().toImage().pixelColor(cursor) == expected
+    overlay.hide_overlay()
+    app.processEvents()
+
+    class SpanningBackend(SyntheticCaptureBackend):
+        # Como o xshm com a lente sobre duas janelas: a exclusão falha
+        name = "spanning"
+
+        def grab(self, screen, rect=None, exclude=None):
+            if exclude is not None:
+                return QImage()
+            return super().grab(screen, rect)
+
+    capture._backends["bench:spanning"] = SpanningBackend()
+    ctx.config["general_capture_backend"] = "bench:spanning"
+    overlay.show_overlay()
+    pump(app, 3)
+    shown_with_tiles = overlay.pixmap.isNull() and len(overlay.tiles) > 0
+    ctx.notify_slide_change(2)
+    pump(app, SLIDE_SETTLE_MS // 20 + 5)
+    fell_back = (
+        overlay.tile_capture_enabled() is False
+        and not overlay.pixmap.isNull()
+        and overlay.is_overlay_actually_visible()
+        and overlay.grab().toImage().pixelColor(cursor) == expected
+    )
+    overlay.hide_overlay()
+    app.processEvents()
+    overlay.show_overlay()
+    pump(app, 2)
+    retried = overlay.tile_capture_enabled() and overlay.pixmap.isNull()
+    overlay.hide_overlay()
+    app.processEvents()
+    del capture._backends["bench:spanning"]
+
+    ctx.config["general_capture_backend"] = "qt"
+    qt_full = not overlay.tile_capture_enabled()
+    ctx.config["general_capture_backend"] = "synthetic"
+
+    return [
+        ("troca de slide: lente continua desenhada até recapturar", settling),
+        ("troca de slide: tiles recapturados depois da espera", refreshed and after),
+        (
+            "exclusão falhando: screenshot inteiro, sem apagar a lente",
+            shown_with_tiles and fell_back,
+        ),
+        ("exclusão falhando: próximo show tenta os tiles de novo", retried),
+        ("backend qt usa o screenshot inteiro", qt_full),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--speed", type=float, default=30, help="pixels por quadro")
+    parser.add_argument(
+        "--lag", type=int, default=2, help="quadros até a lente pintada aparecer na tela"
+    )
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    checks = simulate(args) + overlay_checks(app)
+
+    failed = False
+    print()
+    for label, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'} {label}")
+        failed |= not passed
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
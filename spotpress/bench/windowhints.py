@@ -0,0 +1,207 @@
+"""
+Benchmark do casamento de dicas de janelas com títulos sintéticos.
+
+Compara o HintMatcher pré-compilado com a busca antiga (split das
+palavras-chave e laços aninhados a cada chamada), também com uma
+apresentação em tela cheia no meio da lista, sem e com as janelas
+especiais (tela cheia e ativa) que o tracker mantém, e confere que um
+navegador em foco não passa na frente de uma apresentação reconhecida
+pelo título e que a busca que para no teto não perde a janela ativa:
+
+    python -m spotpress.bench.windowhints --windows 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import uinput
+
+from spotpress.windowhints import (
+    WINDOW_HINTS,
+    HintMatcher,
+    builtin_hints,
+    load_user_hints,
+)
+from spotpress.x11windows import WindowInfo
+
+NOISE_CLASSES = [
+    ("gnome-terminal-server", "gnome-terminal-server"),
+    ("code", "code"),
+    ("nautilus", "org.gnome.nautilus"),
+    ("slack", "slack"),
+    ("thunderbird", "thunderbird"),
+]
+
+PRESENTATION_WINDOWS = [
+    (("libreoffice", "libreoffice-impress"), "aula{}.odp - LibreOffice Impress"),
+    (("okular", "okular"), "slides{}.pdf — Okular"),
+    (("google-chrome", "google-chrome"), "Deck {} - Apresentações Google"),
+    (("evince", "evince"), "Apresentação {}"),
+]
+
+
+def synthetic_windows(count, seed=42, presentation_ratio=0.1):
+    rng = random.Random(seed)
+    windows = []
+    for i in range(count):
+        if rng.random() < presentation_ratio:
+            wm_class, title = rng.choice(PRESENTATION_WINDOWS)
+            title = title.format(i)
+        else:
+            wm_class = rng.choice(NOISE_CLASSES)
+            title = f"documento {i} - {wm_class[1]}"
+        windows.append(WindowInfo(0x1000000 + i, wm_class, title))
+    return windows
+
+
+def legacy_best_window(windows):
+    """Busca antiga: primeira dica, na ordem, com classe e título conhecidos."""
+    for hint in WINDOW_HINTS:
+        keywords = [k.strip().lower() for k in hint["name"].split("|")]
+        for info in windows:
+            if not any(hint["class"] in c for c in info.wm_class):
+                continue
+            name = info.name.lower()
+            if any(keyword in name for keyword in keywords):
+                return info
+    return None
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def check_user_hints():
+    content = (
+        "[libreoffice-impress]\n"
+        "priority = 100\n"
+        "\n"
+        "[pympress]\n"
+        "name = Pympress|presenter\n"
+        "shortcut = KEY_F5\n"
+    )
+    fd, path = tempfile.mkstemp(suffix=".ini")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        matcher = HintMatcher(load_user_hints(path, builtin_hints()))
+    finally:
+        os.unlink(path)
+    windows = [
+        WindowInfo(1, ("okular", "okular"), "a.pdf - Okular"),
+        WindowInfo(2, ("libreoffice", "libreoffice-impress"), "b.odp - Impress"),
+        WindowInfo(3, ("pympress", "pympress"), "Pympress presenter"),
+    ]
+    best, _ = matcher.best_window(windows, require_title=True)
+    custom, hint = matcher.best_window(windows[2:], with_shortcut=True)
+    active, _ = matcher.best_window(windows, active=1, require_title=True)
+    full, _ = matcher.best_window(
+        windows[:2] + [windows[2]._replace(fullscreen=True)], active=1
+    )
+    return (
+        best.wid == 2
+        and custom.wid == 3
+        and hint.shortcut == [uinput.KEY_F5]
+        and active.wid == 1
+        and full.wid == 3
+    )
+
+
+def check_focus_vs_title():
+    matcher = HintMatcher(builtin_hints())
+    deck = WindowInfo(1, ("libreoffice", "libreoffice-impress"), "aula.odp - LibreOffice Impress")
+    browser = WindowInfo(2, ("google-chrome", "google-chrome"), "YouTube - Google Chrome")
+    impress = [uinput.KEY_LEFTSHIFT, uinput.KEY_F5]
+    return (
+        # Navegador em foco com título qualquer: atalho do Impress
+        matcher.presentation_shortcut([deck, browser], active=2) == impress
+        # Só o navegador aberto: cai para a classe
+        and matcher.presentation_shortcut([browser], active=2)
+        == [uinput.KEY_LEFTCTRL, uinput.KEY_F5]
+        and matcher.presentation_shortcut([], active=None) is None
+    )
+
+
+def check_early_exit():
+    matcher = HintMatcher(builtin_hints())
+    first = WindowInfo(1, ("libreoffice", "libreoffice-impress"), "a.odp - LibreOffice Impress")
+    focused = WindowInfo(2, ("libreoffice", "libreoffice-impress"), "b.odp - LibreOffice Impress")
+    full = WindowInfo(3, ("okular", "okular"), "c.pdf — Okular", True)
+    windows = [first, focused]
+    found = [
+        matcher.best_window(windows, active=2, require_title=True)[0],
+        matcher.best_window(windows, active=2, require_title=True, special=[focused])[0],
+        matcher.best_window(windows + [full], active=2)[0],
+        matcher.best_window(windows + [full], active=2, special=[full, focused])[0],
+    ]
+    return [getattr(w, "wid", None) for w in found] == [2, 2, 3, 3]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--windows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    ok = check_user_hints()
+    print(f"{'OK  ' if ok else 'FAIL'} dicas do usuário e pontuação")
+    focus_ok = check_focus_vs_title()
+    print(f"{'OK  ' if focus_ok else 'FAIL'} título reconhecido antes do foco")
+    early_ok = check_early_exit()
+    print(f"{'OK  ' if early_ok else 'FAIL'} busca que para no teto acha a ativa e a tela cheia")
+
+    matcher = HintMatcher(builtin_hints())
+    same = True
+    for label, ratio, fullscreen in (
+        ("10% apresentações", 0.1, False),
+        ("10% apresentações, uma em tela cheia no meio", 0.1, True),
+        ("sem apresentações", 0.0, False),
+    ):
+        windows = synthetic_windows(args.windows, presentation_ratio=ratio)
+        expected = None
+        if fullscreen:
+            middle = args.windows // 2
+            expected = windows[middle] = WindowInfo(
+                windows[middle].wid, ("okular", "okular"), "aula.pdf — Okular", True
+            )
+        # O que WindowTracker.special_windows() devolve
+        special = [w for w in windows if w.fullscreen]
+        legacy, legacy_result = timed(lambda: legacy_best_window(windows), args.repeat)
+        compiled, (info, _) = timed(
+            lambda: matcher.best_window(windows, require_title=True), args.repeat
+        )
+        indexed, (indexed_info, _) = timed(
+            lambda: matcher.best_window(windows, require_title=True, special=special),
+            args.repeat,
+        )
+        same &= indexed_info is info
+        if fullscreen:
+            # A busca antiga não conhece tela cheia
+            same &= info is expected
+        else:
+            same &= getattr(legacy_result, "wid", None) == getattr(info, "wid", None)
+
+        print(f"\n{args.windows} janelas, {label}")
+        for name, elapsed in (
+            ("antigo", legacy),
+            ("compilado", compiled),
+            ("+ tracker", indexed),
+        ):
+            print(
+                f"{name:10} {elapsed * 1e3:9.3f} ms/busca"
+                f" {elapsed * 1e6 / args.windows:8.3f} us/janela"
+            )
+    print()
+    print(f"{'OK  ' if same else 'FAIL'} janela esperada escolhida")
+    return 0 if ok and focus_ok and early_ok and same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
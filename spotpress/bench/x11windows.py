@@ -0,0 +1,225 @@
+"""
+Verificação e benchmark do backend X11 nativo contra um Xvfb.
+
+Sobe um Xvfb (ou usa --display), cria janelas com WM_CLASS e _NET_WM_NAME,
+publica _NET_CLIENT_LIST na raiz como faria um window manager e compara a
+consulta via xcb com o fallback xprop. Sem Xvfb instalado (e sem
+--display) a verificação é pulada:
+
+    python -m spotpress.bench.x11windows --windows 200
+"""
+
+import argparse
+import ctypes
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from spotpress.x11windows import ATOM_STRING, ATOM_WINDOW, SubprocessBackend, XcbBackend
+from spotpress.windowtracker import WindowTracker
+
+
+def start_xvfb():
+    if shutil.which("Xvfb") is None:
+        return None, None
+    for number in range(90, 110):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            continue
+        display = f":{number}"
+        proc = subprocess.Popen(
+            ["Xvfb", display, "-screen", "0", "640x480x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                return proc, display
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+        proc.kill()
+    return None, None
+
+
+class FakeWindowManager:
+    """Cria janelas e mantém _NET_CLIENT_LIST como um window manager."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        xcb = backend._xcb
+        xcb.xcb_create_window.restype = ctypes.c_uint
+        xcb.xcb_create_window.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_uint8,
+            ctypes.c_uint32,
+            ctypes.c_uint32,
+            ctypes.c_int16,
+            ctypes.c_int16,
+            ctypes.c_uint16,
+            ctypes.c_uint16,
+            ctypes.c_uint16,
+            ctypes.c_uint16,
+            ctypes.c_uint32,
+            ctypes.c_uint32,
+            ctypes.c_void_p,
+        ]
+        self.clients = []
+
+    def create(self, wm_class, title):
+        b = self.backend
+        wid = b._xcb.xcb_generate_id(b._conn)
+        b._xcb.xcb_create_window(b._conn, 0, wid, b.root, 0, 0, 10, 10, 0, 1, 0, 0, None)
+        self.set_class(wid, wm_class)
+        self.set_title(wid, title)
+        return wid
+
+    def set_class(self, wid, wm_class):
+        data = b"\0".join(v.encode() for v in wm_class) + b"\0"
+        self.backend.change_property(wid, self.backend.WM_CLASS, ATOM_STRING, 8, data)
+
+    def set_title(self, wid, title):
+        b = self.backend
+        b.change_property(wid, b.NET_WM_NAME, b.UTF8_STRING, 8, title.encode())
+
+    def publish(self, wids):
+        self.clients = list(wids)
+        data = b"".join(w.to_bytes(4, sys.byteorder) for w in self.clients)
+        self.backend.change_property(
+            self.backend.root, self.backend.NET_CLIENT_LIST, ATOM_WINDOW, 32, data
+        )
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def run(display, count):
+    backend = XcbBackend(display)
+    wm = FakeWindowManager(backend)
+    failed = False
+
+    def check(name, ok):
+        nonlocal failed
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        failed |= not ok
+
+    wids = [
+        wm.create(("libreoffice", "libreoffice-impress"), f"slides{i}.odp - Impress")
+        for i in range(count)
+    ]
+    wm.publish(wids)
+
+    infos = backend.query_windows(wids)
+    check(
+        "query_windows lê WM_CLASS e _NET_WM_NAME",
+        [i.wm_class for i in infos] == [("libreoffice", "libreoffice-impress")] * count
+        and infos[-1].name == f"slides{count - 1}.odp - Impress",
+    )
+    check("client_list", backend.client_list() == wids)
+
+    # Como em start_window_tracker: conexão própria para a thread do
+    # tracker, a compartilhada fica para refresh/activate dos drivers
+    tracker = WindowTracker(XcbBackend(display), backend)
+    tracker.start()
+    check("tracker carrega a lista inicial", wait_for(lambda: len(tracker.windows()) == count))
+    extra = wm.create(("okular", "okular"), "deck.pdf - Okular")
+    wm.publish(wids + [extra])
+    check(
+        "tracker recebe janela nova",
+        wait_for(lambda: bool(tracker.windows_for_class("okular"))),
+    )
+    wm.set_title(extra, "deck.pdf [Apresentação] - Okular")
+    check(
+        "tracker recebe mudança de título",
+        wait_for(
+            lambda: "Apresentação" in tracker.windows_for_class("okular")[0].name
+        ),
+    )
+
+    # refresh/activate das threads de entrada enquanto o tracker espera
+    # eventos na conexão dele
+    errors = []
+
+    def driver_thread():
+        try:
+            for i in range(50):
+                info = tracker.refresh(wids[i % count])
+                if info is None or info.wid != wids[i % count]:
+                    errors.append(i)
+            tracker.activate(extra)
+        except OSError as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=driver_thread)
+    worker.start()
+    for i in range(20):
+        wm.set_title(wids[0], f"slides0.odp - Impress ({i})")
+    worker.join()
+    check("refresh de outra thread durante o tracker", not errors)
+    check("tracker recebe a janela ativada", wait_for(lambda: tracker.active_window == extra))
+    check(
+        "tracker acompanha títulos durante as consultas",
+        wait_for(
+            lambda: any(i.name.endswith("(19)") for i in tracker.windows_for_class("impress"))
+        ),
+    )
+    tracker_conn = tracker._backend._conn
+    tracker.stop()
+    tracker._backend.close()
+    check("tracker usa conexão própria", tracker_conn != backend._conn)
+
+    start = time.perf_counter()
+    backend.query_windows(wids)
+    native = time.perf_counter() - start
+    print(f"\nxcb: {count} janelas em {native * 1000:.2f} ms")
+    if shutil.which("xprop"):
+        env_display = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = display
+        start = time.perf_counter()
+        SubprocessBackend().query_windows(wids)
+        fallback = time.perf_counter() - start
+        if env_display is None:
+            del os.environ["DISPLAY"]
+        else:
+            os.environ["DISPLAY"] = env_display
+        print(f"xprop: {count} janelas em {fallback * 1000:.2f} ms")
+    backend.close()
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--windows", type=int, default=100)
+    parser.add_argument("--display", help="usa um servidor X existente")
+    args = parser.parse_args(argv)
+
+    proc = None
+    display = args.display
+    if display is None:
+        proc, display = start_xvfb()
+        if proc is None:
+            print(
+                "SKIP Xvfb não encontrado ou não subiu (pacote xvfb);"
+                " use --display para um X existente"
+            )
+            return 0
+        print(f"Xvfb em {display}\n")
+    try:
+        return run(display, args.windows)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,607 @@
+"""
+Backends de captura de tela.
+
+Cada backend implementa `grab(screen, rect=None) -> QImage`, com `rect`
+relativo ao monitor em pixels lógicos (None = monitor inteiro):
+
+- "xshm": extensão MIT-SHM via libX11/libXext (ctypes). O segmento de
+  memória compartilhada é criado uma vez e reaproveitado entre capturas,
+  então cada captura é uma única cópia feita pelo servidor X direto na
+  memória que já temos, sem o grabWindow(0) + toImage() do Qt.
+- "qt": QScreen.grabWindow, funciona em qualquer plataforma do Qt.
+- "synthetic" e "file:CAMINHO": imagens geradas ou lidas de arquivo, para
+  testes e benchmarks sem servidor X.
+
+"auto" (padrão de `general_capture_backend`) tenta xshm e cai para qt;
+"qt" força o QScreen.grabWindow.
+
+Com `exclude=<id da janela do overlay>` a captura ignora o próprio overlay
+(usado pela lupa ao vivo): o xshm lê direto da janela logo abaixo, que com
+um compositor ativo tem o conteúdo completo mesmo coberta; synthetic e
+file nunca contêm o overlay; qt não suporta e devolve uma imagem nula.
+`can_exclude()` diz se a exclusão funciona agora (no xshm, só com
+compositor).
+"""
+
+import ctypes
+import ctypes.util
+import os
+import threading
+import time
+
+from spotpress.logger import get_logger
+from spotpress.qtcompat import (
+    QColor,
+    QImage,
+    QImage_Format_RGB32,
+    QPainter,
+    QRect,
+)
+
+AUTO = "auto"
+BACKEND_NAMES = ("auto", "xshm", "qt", "synthetic", "file:")
+
+# Constantes do Xlib / SysV IPC
+Z_PIXMAP = 2
+ALL_PLANES = ctypes.c_ulong(-1).value
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+IS_VIEWABLE = 2
+INPUT_OUTPUT = 1
+
+# Intervalo entre consultas ao dono de _NET_WM_CM_Sn (compositor ativo)
+COMPOSITOR_CHECK_S = 1.0
+
+# Lado das células do padrão sintético, em pixels
+SYNTHETIC_CELL = 64
+
+_logger = get_logger("capture")
+
+
+def native_rect(screen, rect=None):
+    """Retângulo em coordenadas da janela raiz (pixels físicos)."""
+    geometry = screen.geometry()
+    if rect is None:
+        rect = QRect(0, 0, geometry.width(), geometry.height())
+    dpr = screen.devicePixelRatio()
+    return QRect(
+        round((geometry.x() + rect.x()) * dpr),
+        round((geometry.y() + rect.y()) * dpr),
+        round(rect.width() * dpr),
+        round(rect.height() * dpr),
+    )
+
+
+class ScreenGeometry:
+    """Geometria e escala de um QScreen, para capturar fora da thread da GUI."""
+
+    def __init__(self, geometry, dpr=1.0):
+        self._geometry = QRect(geometry)
+        self._dpr = dpr
+
+    @classmethod
+    def from_screen(cls, screen):
+        return cls(screen.geometry(), screen.devicePixelRatio())
+
+    def geometry(self):
+        return QRect(self._geometry)
+
+    def devicePixelRatio(self):
+        return self._dpr
+
+
+class CaptureBackend:
+    name = ""
+    # Pode capturar excluindo o overlay e fora da thread da GUI
+    supports_exclude = True
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def can_exclude(self):
+        return self.supports_exclude
+
+    def grab(self, screen, rect=None, exclude=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class QtCaptureBackend(CaptureBackend):
+    """QScreen.grabWindow(0): QPixmap do servidor, depois cópia para QImage."""
+
+    name = "qt"
+    supports_exclude = False
+
+    def grab(self, screen, rect=None, exclude=None):
+        if exclude is not None:
+            return QImage()
+        if rect is None:
+            pixmap = screen.grabWindow(0)  # pyright: ignore
+        else:
+            pixmap = screen.grabWindow(  # pyright: ignore
+                0, rect.x(), rect.y(), rect.width(), rect.height()
+            )
+        return pixmap.toImage()
+
+
+class _XImage(ctypes.Structure):
+    # Só os campos usados; o restante da struct não é acessado
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+    ]
+
+
+class _XWindowAttributes(ctypes.Structure):
+    _fields_ = [
+        ("x", ctypes.c_int),
+        ("y", ctypes.c_int),
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("border_width", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("visual", ctypes.c_void_p),
+        ("root", ctypes.c_ulong),
+        ("class_", ctypes.c_int),
+        ("bit_gravity", ctypes.c_int),
+        ("win_gravity", ctypes.c_int),
+        ("backing_store", ctypes.c_int),
+        ("backing_planes", ctypes.c_ulong),
+        ("backing_pixel", ctypes.c_ulong),
+        ("save_under", ctypes.c_int),
+        ("colormap", ctypes.c_ulong),
+        ("map_installed", ctypes.c_int),
+        ("map_state", ctypes.c_int),
+        ("all_event_masks", ctypes.c_long),
+        ("your_event_mask", ctypes.c_long),
+        ("do_not_propagate_mask", ctypes.c_long),
+        ("override_redirect", ctypes.c_int),
+        ("screen", ctypes.c_void_p),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+def _load_xlib():
+    x11 = ctypes.CDLL(ctypes.util.find_library("X11") or "libX11.so.6")
+    xext = ctypes.CDLL(ctypes.util.find_library("Xext") or "libXext.so.6")
+    c_p, c_int, c_uint, c_ulong = (
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_uint,
+        ctypes.c_ulong,
+    )
+    image_p = ctypes.POINTER(_XImage)
+    info_p = ctypes.POINTER(_XShmSegmentInfo)
+
+    signatures = {
+        x11: {
+            "XOpenDisplay": (c_p, [ctypes.c_char_p]),
+            "XCloseDisplay": (c_int, [c_p]),
+            "XDefaultScreen": (c_int, [c_p]),
+            "XRootWindow": (c_ulong, [c_p, c_int]),
+            "XDefaultVisual": (c_p, [c_p, c_int]),
+            "XDefaultDepth": (c_int, [c_p, c_int]),
+            "XDisplayWidth": (c_int, [c_p, c_int]),
+            "XDisplayHeight": (c_int, [c_p, c_int]),
+            "XSync": (c_int, [c_p, c_int]),
+            "XFree": (c_int, [c_p]),
+            "XQueryTree": (
+                c_int,
+                [
+                    c_p,
+                    c_ulong,
+                    ctypes.POINTER(c_ulong),
+                    ctypes.POINTER(c_ulong),
+                    ctypes.POINTER(ctypes.POINTER(c_ulong)),
+                    ctypes.POINTER(c_uint),
+                ],
+            ),
+            "XGetWindowAttributes": (
+                c_int,
+                [c_p, c_ulong, ctypes.POINTER(_XWindowAttributes)],
+            ),
+            "XInternAtom": (c_ulong, [c_p, ctypes.c_char_p, c_int]),
+            "XGetSelectionOwner": (c_ulong, [c_p, c_ulong]),
+            "XSetErrorHandler": (c_p, [c_p]),
+        },
+        xext: {
+            "XShmQueryExtension": (c_int, [c_p]),
+            "XShmCreateImage": (
+                image_p,
+                [c_p, c_p, c_uint, c_int, c_p, info_p, c_uint, c_uint],
+            ),
+            "XShmAttach": (c_int, [c_p, info_p]),
+            "XShmDetach": (c_int, [c_p, info_p]),
+            "XShmGetImage": (c_int, [c_p, c_ulong, image_p, c_int, c_int, c_ulong]),
+        },
+    }
+    for lib, funcs in signatures.items():
+        for name, (restype, argtypes) in funcs.items():
+            func = getattr(lib, name)
+            func.restype = restype
+            func.argtypes = argtypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.shmget.argtypes = [c_int, ctypes.c_size_t, c_int]
+    libc.shmget.restype = c_int
+    libc.shmat.argtypes = [c_int, c_p, c_int]
+    libc.shmat.restype = c_p
+    libc.shmdt.argtypes = [c_p]
+    libc.shmdt.restype = c_int
+    libc.shmctl.argtypes = [c_int, c_int, c_p]
+    libc.shmctl.restype = c_int
+    return x11, xext, libc
+
+
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+_x_errors = 0
+
+
+@_XErrorHandler
+def _count_x_error(display, event):
+    # O handler padrão do Xlib encerra o processo em qualquer erro (janela
+    # destruída entre o XQueryTree e a captura, por exemplo); só conta
+    global _x_errors
+    _x_errors += 1
+    return 0
+
+
+def _local_display(display):
+    # Sobre ssh -X o servidor anuncia MIT-SHM mas o XShmAttach falha, e o
+    # handler de erro padrão do Xlib encerra o processo
+    host = display.split(":", 1)[0]
+    return display.startswith(":") or host in ("unix", "localhost")
+
+
+class XShmCaptureBackend(CaptureBackend):
+    """
+    Captura via MIT-SHM com um segmento reaproveitado.
+
+    A QImage devolvida por grab() aponta para o segmento compartilhado e
+    só vale até a próxima captura; quem guarda o quadro converte para
+    QPixmap (como o overlay faz) ou chama copy().
+    """
+
+    name = "xshm"
+
+    @classmethod
+    def available(cls):
+        display = os.environ.get("DISPLAY", "")
+        if not display or not _local_display(display):
+            return False
+        return bool(ctypes.util.find_library("Xext"))
+
+    def __init__(self, display=None):
+        self._x11, self._xext, self._libc = _load_xlib()
+        name = display.encode() if display else None
+        self._dpy = self._x11.XOpenDisplay(name)
+        if not self._dpy:
+            raise OSError("Não foi possível abrir o display X")
+        if not self._xext.XShmQueryExtension(self._dpy):
+            self._x11.XCloseDisplay(self._dpy)
+            self._dpy = None
+            raise OSError("Servidor X sem a extensão MIT-SHM")
+        self._x11.XSetErrorHandler(ctypes.cast(_count_x_error, ctypes.c_void_p))
+        screen = self._x11.XDefaultScreen(self._dpy)
+        self._root = self._x11.XRootWindow(self._dpy, screen)
+        self._cm_atom = self._x11.XInternAtom(
+            self._dpy, f"_NET_WM_CM_S{screen}".encode(), 0
+        )
+        self._compositor = False
+        self._compositor_checked = 0.0
+        self._visual = self._x11.XDefaultVisual(self._dpy, screen)
+        self._depth = self._x11.XDefaultDepth(self._dpy, screen)
+        self.root_size = (
+            self._x11.XDisplayWidth(self._dpy, screen),
+            self._x11.XDisplayHeight(self._dpy, screen),
+        )
+        self._lock = threading.Lock()
+        self._images = {}
+        self._info = _XShmSegmentInfo()
+        self._buffer = None
+        self.segments_created = 0
+
+    def _create_image(self, width, height, depth=None, visual=None):
+        image = self._xext.XShmCreateImage(
+            self._dpy,
+            visual or self._visual,
+            depth or self._depth,
+            Z_PIXMAP,
+            None,
+            ctypes.byref(self._info),
+            width,
+            height,
+        )
+        if not image:
+            raise OSError("XShmCreateImage falhou")
+        if image.contents.bits_per_pixel != 32:
+            bpp = image.contents.bits_per_pixel
+            self._x11.XFree(image)
+            raise OSError(f"Profundidade não suportada: {bpp} bpp")
+        return image
+
+    def _attach_segment(self):
+        # Um segmento do tamanho da janela raiz, criado uma vez: capturas de
+        # qualquer tamanho usam cabeçalhos XImage apontando para ele
+        width, height = self.root_size
+        image = self._create_image(width, height)
+        size = image.contents.bytes_per_line * height
+        shmid = self._libc.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if shmid < 0:
+            self._x11.XFree(image)
+            raise OSError(ctypes.get_errno(), "shmget falhou")
+        addr = self._libc.shmat(shmid, None, 0)
+        if addr is None or addr == ctypes.c_void_p(-1).value:
+            self._libc.shmctl(shmid, IPC_RMID, None)
+            self._x11.XFree(image)
+            raise OSError(ctypes.get_errno(), "shmat falhou")
+
+        self._info.shmid = shmid
+        self._info.shmaddr = addr
+        self._info.readOnly = 0
+        image.contents.data = addr
+        self._xext.XShmAttach(self._dpy, ctypes.byref(self._info))
+        self._x11.XSync(self._dpy, 0)
+        # Marca para remoção já anexado: o segmento some quando os dois
+        # lados desanexarem, mesmo se o processo morrer
+        self._libc.shmctl(shmid, IPC_RMID, None)
+
+        self._buffer = (ctypes.c_char * size).from_address(addr)
+        self._images[(width, height)] = image
+        self.segments_created += 1
+
+    def _image_for(self, width, height, depth=None, visual=None):
+        if self._buffer is None:
+            self._attach_segment()
+        key = (width, height) if depth is None else (width, height, depth, visual)
+        image = self._images.get(key)
+        if image is None:
+            image = self._create_image(width, height, depth, visual)
+            image.contents.data = self._info.shmaddr
+            self._images[key] = image
+        return image
+
+    def compositor_active(self):
+        now = time.monotonic()
+        if now - self._compositor_checked > COMPOSITOR_CHECK_S:
+            self._compositor = bool(
+                self._x11.XGetSelectionOwner(self._dpy, self._cm_atom)
+            )
+            self._compositor_checked = now
+        return self._compositor
+
+    def can_exclude(self):
+        return self.compositor_active()
+
+    def _window_below(self, native, exclude):
+        """
+        Janela de topo mais alta, fora `exclude`, que contém `native`:
+        (janela, x, y relativos a ela, atributos) ou None.
+        """
+        x11 = self._x11
+        root_ret, parent_ret = ctypes.c_ulong(), ctypes.c_ulong()
+        children = ctypes.POINTER(ctypes.c_ulong)()
+        count = ctypes.c_uint()
+        if not x11.XQueryTree(
+            self._dpy,
+            self._root,
+            ctypes.byref(root_ret),
+            ctypes.byref(parent_ret),
+            ctypes.byref(children),
+            ctypes.byref(count),
+        ):
+            return None
+        try:
+            attrs = _XWindowAttributes()
+            # XQueryTree lista de baixo para cima
+            for i in range(count.value - 1, -1, -1):
+                window = children[i]
+                if window == exclude:
+                    continue
+                if not x11.XGetWindowAttributes(self._dpy, window, ctypes.byref(attrs)):
+                    continue
+                if attrs.map_state != IS_VIEWABLE or attrs.class_ != INPUT_OUTPUT:
+                    continue
+                left = attrs.x + attrs.border_width
+                top = attrs.y + attrs.border_width
+                if not QRect(left, top, attrs.width, attrs.height).intersects(native):
+                    continue
+                if not QRect(left, top, attrs.width, attrs.height).contains(native):
+                    # Outra janela aparece no recorte: a janela sozinha não basta
+                    return None
+                return window, native.x() - left, native.y() - top, attrs
+        finally:
+            if children:
+                x11.XFree(children)
+        return None
+
+    def _release_segment(self):
+        if self._buffer is None:
+            return
+        self._xext.XShmDetach(self._dpy, ctypes.byref(self._info))
+        self._x11.XSync(self._dpy, 0)
+        # O destroy_image do XShm só libera a struct; a memória é do segmento
+        for image in self._images.values():
+            self._x11.XFree(image)
+        self._images.clear()
+        self._libc.shmdt(self._info.shmaddr)
+        self._buffer = None
+
+    def grab(self, screen, rect=None, exclude=None):
+        native = native_rect(screen, rect)
+        # Fora da janela raiz o XShmGetImage gera BadMatch; recorta antes
+        native = native.intersected(QRect(0, 0, *self.root_size))
+        if native.isEmpty():
+            return QImage()
+        with self._lock:
+            drawable, x, y = self._root, native.x(), native.y()
+            if exclude is None:
+                image = self._image_for(native.width(), native.height())
+            else:
+                # Sem compositor a janela coberta não guarda o conteúdo:
+                # a captura traria o próprio overlay
+                if not self.compositor_active():
+                    return QImage()
+                below = self._window_below(native, exclude)
+                if below is None:
+                    return QImage()
+                drawable, x, y, attrs = below
+                image = self._image_for(
+                    native.width(), native.height(), attrs.depth, attrs.visual
+                )
+            if not self._xext.XShmGetImage(
+                self._dpy, drawable, image, x, y, ALL_PLANES
+            ):
+                return QImage()
+            qimage = QImage(
+                self._buffer,
+                native.width(),
+                native.height(),
+                image.contents.bytes_per_line,
+                QImage_Format_RGB32,
+            )
+        qimage.setDevicePixelRatio(screen.devicePixelRatio())
+        return qimage
+
+    @property
+    def errors(self):
+        return _x_errors
+
+    @property
+    def segment_address(self):
+        return self._info.shmaddr if self._buffer is not None else None
+
+    def close(self):
+        with self._lock:
+            if self._dpy:
+                self._release_segment()
+                self._x11.XCloseDisplay(self._dpy)
+                self._dpy = None
+
+
+class SyntheticCaptureBackend(CaptureBackend):
+    """
+    Xadrez colorido em coordenadas absolutas: o mesmo ponto da tela tem a
+    mesma cor em qualquer recorte, então capturas parciais podem ser
+    comparadas com a captura do monitor inteiro.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, cell=SYNTHETIC_CELL):
+        self.cell = cell
+
+    def color_at(self, x, y):
+        cx, cy = x // self.cell, y // self.cell
+        return QColor((cx * 47) % 256, (cy * 89) % 256, ((cx + cy) * 23) % 256)
+
+    def grab(self, screen, rect=None, exclude=None):
+        native = native_rect(screen, rect)
+        image = QImage(native.width(), native.height(), QImage_Format_RGB32)
+        painter = QPainter(image)
+        cell = self.cell
+        x0 = native.x() - native.x() % cell
+        y0 = native.y() - native.y() % cell
+        for y in range(y0, native.bottom() + 1, cell):
+            for x in range(x0, native.right() + 1, cell):
+                painter.fillRect(
+                    x - native.x(), y - native.y(), cell, cell, self.color_at(x, y)
+                )
+        painter.end()
+        image.setDevicePixelRatio(screen.devicePixelRatio())
+        return image
+
+
+class FileCaptureBackend(CaptureBackend):
+    """Imagem de um arquivo, tratada como o conteúdo do monitor."""
+
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+        self._image = QImage(path)
+        if self._image.isNull():
+            raise OSError(f"Não foi possível ler a imagem {path}")
+
+    def grab(self, screen, rect=None, exclude=None):
+        full = native_rect(screen)
+        image = self._image
+        if image.size() != full.size():
+            image = self._image = image.scaled(full.width(), full.height())
+        if rect is not None:
+            native = native_rect(screen, rect).translated(-full.x(), -full.y())
+            image = image.copy(native)
+        else:
+            image = image.copy()
+        image.setDevicePixelRatio(screen.devicePixelRatio())
+        return image
+
+
+def open_backend(name=AUTO):
+    """Cria o backend pelo nome; xshm indisponível cai para qt."""
+    name = (name or AUTO).strip()
+    if name.startswith("file:"):
+        return FileCaptureBackend(os.path.expanduser(name[5:]))
+    if name == "synthetic":
+        return SyntheticCaptureBackend()
+    if name == "qt":
+        return QtCaptureBackend()
+    if name not in ("auto", "xshm"):
+        raise ValueError(f"Backend de captura desconhecido: {name}")
+    # Pedido pelo nome, a falta do xshm é aviso; no auto, só informação
+    level = _logger.warn if name == "xshm" else _logger.info
+    if XShmCaptureBackend.available():
+        try:
+            return XShmCaptureBackend()
+        except OSError as e:
+            level("MIT-SHM indisponível (%s), usando QScreen.grabWindow", e)
+    else:
+        level("MIT-SHM indisponível sem display X local, usando QScreen.grabWindow")
+    return QtCaptureBackend()
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name=AUTO):
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            try:
+                backend = open_backend(name)
+            except (OSError, ValueError) as e:
+                _logger.error("%s", e)
+                backend = QtCaptureBackend()
+            _backends[name] = backend
+        return backend
+
+
+def close_backends():
+    with _backends_lock:
+        for backend in _backends.values():
+            backend.close()
+        _backends.clear()
+
@@ -0,0 +1,250 @@
+"""
+Configuração tipada do Spotpress.
+
+Cada chave tem tipo, seção/opção no config.ini e valor padrão. Escritas
+feitas dentro de `batch()` viram um único conjunto de mudanças, emitido uma
+vez pelo sinal `changed` ({chave: valor}, só com o que de fato mudou). Com
+o autosave ligado, cada conjunto agenda uma gravação atômica (arquivo
+temporário + os.replace) depois de `save_delay_ms` sem novas mudanças.
+"""
+
+import configparser
+import os
+import tempfile
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+from spotpress.logger import get_logger
+from spotpress.qtcompat import QObject, QTimer, pyqtSignal
+
+_logger = get_logger("config")
+
+ConfigKey = namedtuple("ConfigKey", "section option type default")
+
+CONFIG_SCHEMA = {
+    "spotlight_shape": ConfigKey("Spotlight", "shape", str, "elipse"),
+    "spotlight_size": ConfigKey("Spotlight", "size", int, 35),
+    "spotlight_border": ConfigKey("Spotlight", "border", bool, True),
+    "spotlight_background_mode": ConfigKey("Spotlight", "background_mode", int, 1),
+    "spotlight_background_blur_level": ConfigKey(
+        "Spotlight", "background_blur", int, 5
+    ),
+    "magnify_shape": ConfigKey("Magnify", "shape", str, "rectangle"),
+    "magnify_size": ConfigKey("Magnify", "size", int, 35),
+    "magnify_border": ConfigKey("Magnify", "border", bool, True),
+    "magnify_background_mode": ConfigKey("Magnify", "background_mode", int, 2),
+    "magnify_zoom": ConfigKey("Magnify", "zoom", int, 2),
+    "magnify_background_blur_level": ConfigKey("Magnify", "background_blur", int, 5),
+    # Filtro da ampliação: nearest ou bilinear; o "smooth" de versões
+    # anteriores vale como bilinear
+    "magnify_filter": ConfigKey("Magnify", "filter", str, "bilinear"),
+    # Lupa ao vivo: recaptura a área sob a lente numa thread
+    "magnify_live": ConfigKey("Magnify", "live", bool, False),
+    "magnify_live_fps": ConfigKey("Magnify", "live_fps", int, 30),
+    "laser_dot_size": ConfigKey("Laser", "dot_size", int, 5),
+    "laser_color_index": ConfigKey("Laser", "color_index", int, 0),
+    "laser_opacity": ConfigKey("Laser", "opacity", int, 60),
+    "laser_reflection": ConfigKey("Laser", "reflection", bool, True),
+    "marker_width": ConfigKey("Marker", "width", int, 20),
+    "marker_color_index": ConfigKey("Marker", "color_index", int, 1),
+    "marker_opacity": ConfigKey("Marker", "opacity", int, 90),
+    "shade_color_index": ConfigKey("Shade", "color_index", int, 0),
+    "shade_opacity": ConfigKey("Shade", "opacity", int, 95),
+    "border_color_index": ConfigKey("Border", "color_index", int, 7),
+    "border_opacity": ConfigKey("Border", "opacity", int, 90),
+    "border_width": ConfigKey("Border", "width", int, 16),
+    "general_always_capture": ConfigKey("General", "always_capture", bool, True),
+    "general_auto_mode": ConfigKey("General", "auto_mode", bool, True),
+    "general_passthrough": ConfigKey("General", "passthrough", bool, False),
+    # No modo AUTO o overlay fica mapeado e só alterna entre ativo e inerte
+    "general_fast_toggle": ConfigKey("General", "fast_toggle", bool, True),
+    # Segundos com o overlay oculto até liberar os screenshots (0 = nunca)
+    "general_release_delay": ConfigKey("General", "release_delay", int, 30),
+    # Lupa e laser invertido capturam só tiles em volta do cursor (exige
+    # always_capture desligado: o overlay precisa ser transparente)
+    "general_capture_tiles": ConfigKey("General", "capture_tiles", bool, True),
+    # Backend de captura de tela: auto, xshm, qt, synthetic ou file:CAMINHO
+    "general_capture_backend": ConfigKey("General", "capture_backend", str, "auto"),
+    "modes_current_mode": ConfigKey("Modes", "current_mode", int, 0),
+    # Lista de (id do modo, habilitado); gravada como mode0, mode1, ...
+    "modes_list": ConfigKey("Modes", None, tuple, ()),
+}
+
+
+def _coerce(key, value):
+    spec = CONFIG_SCHEMA.get(key)
+    if spec is None:
+        raise KeyError(f"Chave de configuração desconhecida: {key}")
+    if spec.type is tuple:
+        return tuple((int(mode_id), bool(enabled)) for mode_id, enabled in value)
+    return spec.type(value)
+
+
+class ConfigStore(QObject):
+    changed = pyqtSignal(object)  # {chave: valor} de um conjunto de mudanças
+
+    def __init__(self, path=None, save_delay_ms=500, parent=None):
+        super().__init__(parent)
+        self._values = {key: spec.default for key, spec in CONFIG_SCHEMA.items()}
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._pending = {}
+        self.path = path
+        self.autosave = False
+        self.saves = 0
+        self.change_sets = 0
+
+        # O timer vive na thread da GUI; mudanças feitas em outras threads
+        # chegam aqui pela conexão enfileirada do sinal
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(save_delay_ms)
+        self._save_timer.timeout.connect(self.save)
+        self.changed.connect(self._schedule_save)
+
+    # Acesso no estilo dict
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def keys(self):
+        return self._values.keys()
+
+    def items(self):
+        return self._values.items()
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._values)
+
+    def __setitem__(self, key, value):
+        with self.batch():
+            value = _coerce(key, value)
+            if self._values.get(key) != value:
+                self._values[key] = value
+                self._pending[key] = value
+
+    def update(self, values=(), **kwargs):
+        with self.batch():
+            for key, value in dict(values, **kwargs).items():
+                self[key] = value
+
+    @contextmanager
+    def batch(self):
+        """Agrupa escritas; `changed` é emitido uma vez, ao sair do bloco externo."""
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self._pending:
+                    changes, self._pending = self._pending, {}
+                    self.change_sets += 1
+                else:
+                    changes = None
+        if changes:
+            self.changed.emit(changes)
+
+    # Persistência
+
+    def load(self, path=None):
+        """Lê o config.ini; chaves ausentes ou inválidas ficam com o padrão."""
+        path = path or self.path
+        config = configparser.ConfigParser()
+        config.read(path)
+        values = {}
+        for key, spec in CONFIG_SCHEMA.items():
+            if spec.option is None or not config.has_option(spec.section, spec.option):
+                continue
+            try:
+                if spec.type is bool:
+                    values[key] = config.getboolean(spec.section, spec.option)
+                else:
+                    values[key] = spec.type(config.get(spec.section, spec.option))
+            except ValueError:
+                pass
+        values["modes_list"] = self._read_modes(config)
+        self.update(values)
+        return config
+
+    @staticmethod
+    def _read_modes(config):
+        modes = []
+        i = 0
+        while config.has_option("Modes", f"mode{i}"):
+            try:
+                mode_id, enabled = config.get("Modes", f"mode{i}").split("|")
+                modes.append((int(mode_id), bool(int(enabled))))
+            except ValueError:
+                pass
+            i += 1
+        return tuple(modes)
+
+    def to_configparser(self):
+        config = configparser.ConfigParser()
+        values = self.as_dict()
+        for key, spec in CONFIG_SCHEMA.items():
+            if spec.option is None:
+                continue
+            if not config.has_section(spec.section):
+                config.add_section(spec.section)
+            config.set(spec.section, spec.option, str(values[key]))
+        for i, (mode_id, enabled) in enumerate(values["modes_list"]):
+            config.set("Modes", f"mode{i}", f"{mode_id}|{int(enabled)}")
+        return config
+
+    def save(self, path=None):
+        """Grava de forma atômica: arquivo temporário no mesmo diretório + rename."""
+        path = path or self.path
+        if not path:
+            return False
+        self._save_timer.stop()
+        config = self.to_configparser()
+        directory = os.path.dirname(path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=".config-", suffix=".tmp", dir=directory
+            )
+        except OSError as e:
+            _logger.error("Não foi possível salvar %s: %s", path, e)
+            return False
+        try:
+            with os.fdopen(fd, "w") as f:
+                config.write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            _logger.error("Não foi possível salvar %s: %s", path, e)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        self.saves += 1
+        return True
+
+    def flush(self):
+        """Grava agora se houver uma gravação agendada."""
+        if self._save_timer.isActive():
+            return self.save()
+        return False
+
+    def _schedule_save(self, _changes):
+        if self.autosave and self.path:
+            self._save_timer.start()
@@ -0,0 +1,86 @@
+"""
+Estatísticas de quadros do overlay: duração do paintEvent e intervalo entre
+quadros, guardados num buffer circular com os últimos N valores, e contagem
+de acordadas do timer de atualização.
+"""
+
+import time
+from array import array
+from collections import deque
+
+
+class FrameStats:
+    def __init__(self, size=240):
+        self._size = size
+        self._paint = array("d", bytes(8 * size))
+        self._interval = array("d", bytes(8 * size))
+        self._index = 0
+        self._count = 0
+        self._last_frame = None
+        self.frames = 0
+
+    def record(self, start, end):
+        """Registra um quadro pintado entre `start` e `end` (perf_counter)."""
+        i = self._index
+        self._paint[i] = end - start
+        self._interval[i] = 0.0 if self._last_frame is None else start - self._last_frame
+        self._last_frame = start
+        self._index = (i + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+        self.frames += 1
+
+    def reset(self):
+        self._index = 0
+        self._count = 0
+        self._last_frame = None
+
+    @staticmethod
+    def _percentile(values, pct):
+        if not values:
+            return 0.0
+        k = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+        return values[k]
+
+    def snapshot(self):
+        """Resumo em milissegundos dos últimos quadros."""
+        n = self._count
+        paint = sorted(self._paint[:n])
+        # O primeiro quadro após reset não tem intervalo
+        interval = [v for v in self._interval[:n] if v > 0]
+        avg_interval = sum(interval) / len(interval) if interval else 0.0
+        return {
+            "frames": self.frames,
+            "window": n,
+            "paint_avg_ms": round(sum(paint) / n * 1e3, 3) if n else 0.0,
+            "paint_p50_ms": round(self._percentile(paint, 50) * 1e3, 3),
+            "paint_p95_ms": round(self._percentile(paint, 95) * 1e3, 3),
+            "paint_max_ms": round(paint[-1] * 1e3, 3) if n else 0.0,
+            "interval_avg_ms": round(avg_interval * 1e3, 3),
+            "fps": round(1 / avg_interval, 1) if avg_interval else 0.0,
+        }
+
+
+class WakeupCounter:
+    """Conta acordadas (ticks de timer) e a taxa nos últimos `window` segundos."""
+
+    def __init__(self, window=5.0):
+        self._window = window
+        self._times = deque()
+        self.total = 0
+
+    def _prune(self, now):
+        limit = now - self._window
+        times = self._times
+        while times and times[0] < limit:
+            times.popleft()
+
+    def tick(self, now=None):
+        now = time.monotonic() if now is None else now
+        self._times.append(now)
+        self.total += 1
+        self._prune(now)
+
+    def rate(self, now=None):
+        self._prune(time.monotonic() if now is None else now)
+        return len(self._times) / self._window
@@ -1,8 +1,7 @@
+import sys
 import time
 import uinput
 import threading
-import select
-import os
 import evdev.ecodes as ec
 
 from spotpress.utils import (
@@ -17,6 +16,16 @@ from spotpress.utils import (
 from spotpress.hw.lnx.pointerdevice import PointerDevice
 
 
+def _build_status_table(single, multiple, aliases):
+    table = [None] * 256
+    for buttons, is_single in ((single, True), (multiple, False)):
+        for status, button in buttons.items():
+            table[status] = (sys.intern(button), is_single)
+    for status, target in aliases.items():
+        table[status] = table[target]
+    return tuple(table)
+
+
 class BaseusOrangeDotAI(PointerDevice):
     VENDOR_ID = 0xABC8
     PRODUCT_ID = 0xCA08
@@ -24,6 +33,44 @@ class BaseusOrangeDotAI(PointerDevice):
     DOUBLE_CLICK_INTERVAL = 0.4
     LONG_PRESS_INTERVAL = 0.6
     REPEAT_INTERVAL = 0.10
+    HID_REPORT_SIZE = 16
+    # Teclas do evdev duplicam os botões lidos via hidraw; só o movimento e
+    # eventos desconhecidos seguem crus no passthrough
+    HANDLED_EVENT_TYPES = frozenset({ec.EV_KEY})
+
+    SINGLE_ACTION_BUTTONS = {
+        97: "OK",
+        98: "OK++",
+        99: "OK+long",
+        100: "LASER",
+        104: "HGL+hold",
+        105: "HGL+release",
+        107: "PREV+long",
+        109: "NEXT+long",
+        114: "MOUSE+hold",
+        115: "MOUSE+release",
+        118: "MIC+hold",
+        119: "MIC+release",
+        124: "LNG+hold",
+        125: "LNG+release",
+    }
+    MULTIPLE_ACTION_BUTTONS = {
+        106: "PREV",
+        108: "NEXT",
+        113: "MOUSE",
+        116: "MIC",
+        122: "LNG",
+        # botoes tratados em input events pois se comportam de forma estranha em hidraw quanto ao press/release
+        # 103: "HGL", # MONITORADO EM INPUT EVENTS
+        120: "VOL_UP",  # MONITORADO TAMBÉM EM INPUT EVENTS, LA RETORNA VOL_UP
+        121: "VOL_DOWN",  # MONITORADO TAMBÉM EM INPUT EVENTS, LA RETORNA VOL_DOWN
+    }
+    # Status alternativos enviados pelo mesmo botão
+    STATUS_ALIASES = {117: 116, 123: 122}
+    # status byte -> (token, ação única) ou None, montada uma vez por classe
+    STATUS_TABLE = _build_status_table(
+        SINGLE_ACTION_BUTTONS, MULTIPLE_ACTION_BUTTONS, STATUS_ALIASES
+    )
 
     def __init__(self, app_ctx, hidraw_path):
         super().__init__(app_ctx=app_ctx, hidraw_path=hidraw_path)
@@ -44,33 +91,6 @@ class BaseusOrangeDotAI(PointerDevice):
         self._hold_states = {}
         self._was_last_esc = True
 
-        self._single_action_buttons = {
-            97: "OK",
-            98: "OK++",
-            99: "OK+long",
-            100: "LASER",
-            104: "HGL+hold",
-            105: "HGL+release",
-            107: "PREV+long",
-            109: "NEXT+long",
-            114: "MOUSE+hold",
-            115: "MOUSE+release",
-            118: "MIC+hold",
-            119: "MIC+release",
-            124: "LNG+hold",
-            125: "LNG+release",
-        }
-        self._multiple_action_buttons = {
-            106: "PREV",
-            108: "NEXT",
-            113: "MOUSE",
-            116: "MIC",
-            122: "LNG",
-            # botoes tratados em input events pois se comportam de forma estranha em hidraw quanto ao press/release
-            # 103: "HGL", # MONITORADO EM INPUT EVENTS
-            120: "VOL_UP",  # MONITORADO TAMBÉM EM INPUT EVENTS, LA RETORNA VOL_UP
-            121: "VOL_DOWN",  # MONITORADO TAMBÉM EM INPUT EVENTS, LA RETORNA VOL_DOWN
-        }
         self._virtual_repeat_buttons = {"MIC", "LNG", "MOUSE", "VOL_UP", "VOL_DOWN"}
 
     def _build_button_name(self, button, long_press=False, repeat=False):
@@ -256,15 +276,8 @@ class BaseusOrangeDotAI(PointerDevice):
         return self._hold_states.get(button, {}).get("hold_time", 0)
 
     def get_button(self, status_byte):
-        all_buttons = self._single_action_buttons | self._multiple_action_buttons
-        _byte = status_byte
-        if status_byte in [116, 117]:
-            _byte = 116
-        elif status_byte in [122, 123]:
-            _byte = 122
-        if _byte in all_buttons:
-            return all_buttons[_byte]
-        return False
+        entry = self.STATUS_TABLE[status_byte]
+        return entry[0] if entry else False
 
     def stop(self):
         super().stop()
@@ -280,35 +293,9 @@ class BaseusOrangeDotAI(PointerDevice):
                 timeout=1
             )  # espera a thread encerrar (timeout opcional)
 
-    def read_pacotes_completos(self, f):
-        fd = f.fileno()
-        os.set_blocking(fd, False)
-        try:
-            while not self._stop_hidraw_thread.is_set():
-                rlist, _, _ = select.select([fd], [], [], 0.1)
-                if fd in rlist:
-                    b = f.read(16)
-                    if not b:
-                        # EOF ou dispositivo desconectado
-                        break
-                    if len(b) == 16:
-                        yield bytes(b)
-                else:
-                    # Timeout, permite checar stop event
-                    continue
-        except OSError as e:
-            self.log(f"[ERRO] Falha ao ler do device: {e}")
-        except Exception as e:
-            self.log(f"[ERRO] Exceção inesperada: {e}")
-
     def processa_pacote_hid(self, data):
 
-        if not (
-            isinstance(data, bytes)
-            and len(data) == 16
-            and data[0] == 10
-            and data[-1] == 182
-        ):
+        if not (len(data) == 16 and data[0] == 10 and data[-1] == 182):
             return
 
         status_byte = data[5]
@@ -320,13 +307,15 @@ class BaseusOrangeDotAI(PointerDevice):
                 self._ultimo_botao_ativo = None
             return
 
-        button = self.get_button(status_byte)
+        entry = self.STATUS_TABLE[status_byte]
 
-        if not button:
+        if entry is None:
             return
 
+        button, single_action = entry
+
         # Estes botoes executam diretamente, sem tratamento
-        if button in self._single_action_buttons.values():
+        if single_action:
             self.do_action(button)
         else:
             # Se for um novo botão e havia outro ativo, libera o anterior
@@ -344,7 +333,7 @@ class BaseusOrangeDotAI(PointerDevice):
         current_mode = self._ctx.current_mode
         normal_mode = current_mode == MODE_MOUSE or ow.is_overlay_actually_visible()
 
-        self.log(f"DO ACTION -> {button}")
+        self.log_action(button)
         match button:
             case "OK":
                 if ow.is_overlay_actually_visible():
@@ -370,7 +359,7 @@ class BaseusOrangeDotAI(PointerDevice):
                 if normal_mode:
                     if self._was_last_esc:
                         keys = get_keychord_for_presentation_program()
-                        if self._ctx.debug_mode:
+                        if self.log_enabled():
                             self.log_key(keys)
                         self.emit_key_chord(keys)
                         self._was_last_esc = False
@@ -501,7 +490,7 @@ class BaseusOrangeDotAI(PointerDevice):
     def handle_event(self, event):
         if event.type == ec.EV_REL:  # Movimento de Mouse
             # Repassa evento virtual
-            self._ctx.ui.emit((event.type, event.code), event.value)
+            self.forward_event(event)
 
         elif event.type == ec.EV_KEY:
             ow = self._ctx.overlay_window
@@ -527,10 +516,10 @@ class BaseusOrangeDotAI(PointerDevice):
                             event.code == ec.BTN_LEFT
                             and self._ctx.current_mode == MODE_PEN
                         ):
-                            self._ctx.ui.emit((event.type, event.code), event.value)
+                            self.forward_event(event)
                     else:
                         # Emit if overlay is not visible
-                        self._ctx.ui.emit((event.type, event.code), event.value)
+                        self.forward_event(event)
                 case ec.KEY_E:
                     button = "HGL"
 
@@ -11,6 +11,8 @@ from spotpress.hw.lnx.baseusorangedotai import BaseusOrangeDotAI
 from spotpress.hw.lnx.nordicasasmartcontrol import ASASmartControlPointer
 from spotpress.hw.lnx.nordicasacompositedevice import ASACompositeDevicePointer
 from spotpress.hw.lnx.virtualdevice import VirtualPointer
+from spotpress.hw.lnx.eventbatch import EventBatcher
+from spotpress.logger import get_logger
 
 
 DEVICE_CLASSES = {
@@ -25,12 +27,15 @@ class DeviceMonitor(BaseDeviceMonitor):
     def __init__(self, context):
         self._ctx = context
         self._ctx.device_monitor = self
+        self._logger = get_logger("devices")
         self._stop_event = threading.Event()
         self._hotplug_thread = None
         self._switch_lock = threading.Lock()
         self._switch_thread = None
         self._monitored_devices = {}
         self._hotplug_callbacks = []
+        # Mantém o fd do uinput para gravar reports inteiros de uma só vez
+        ui_fd = uinput.fdopen()
         self._ctx.ui = uinput.Device(
             [
                 uinput.REL_X,
@@ -51,7 +56,9 @@ class DeviceMonitor(BaseDeviceMonitor):
                 uinput.KEY_MUTE,
             ],
             name="SpotPress Virtual Mouse and Keyboard",
+            fd=ui_fd,
         )
+        self._ctx.event_writer = EventBatcher(self._ctx.ui, fd=ui_fd)
 
     def start_monitoring(self):
         self.monitor_usb_hotplug()
@@ -61,7 +68,7 @@ class DeviceMonitor(BaseDeviceMonitor):
             for path, cls in hidraws:
                 self.add_monitored_device(cls, path)
         else:
-            self._ctx.log("* Nenhum dispositivo compatível encontrado.")
+            self._logger.info("* Nenhum dispositivo compatível encontrado.")
         # if len(self._monitored_devices) == 1:
         if self._ctx.active_device is None and self._monitored_devices:
             dev = next(iter(self._monitored_devices.values()))
@@ -73,7 +80,7 @@ class DeviceMonitor(BaseDeviceMonitor):
 
         # Se já tem troca em andamento, ignora nova troca
         if self._switch_thread and self._switch_thread.is_alive():
-            self._ctx.log("Troca de dispositivo já em andamento, ignorando")
+            self._logger.info("Troca de dispositivo já em andamento, ignorando")
             return
 
         old_device = self._ctx.active_device
@@ -81,12 +88,14 @@ class DeviceMonitor(BaseDeviceMonitor):
         def switch_device():
             with self._switch_lock:
                 if old_device:
-                    self._ctx.log(
-                        f"* Desativando: {old_device.__class__.__name__} ({old_device._known_paths})"
+                    self._logger.info(
+                        "* Desativando: %s (%s)",
+                        old_device.__class__.__name__,
+                        old_device._known_paths,
                     )
                     old_device.stop()
                 if device:
-                    self._ctx.log(f"* Ativando: {device.display_name()}")
+                    self._logger.info("* Ativando: %s", device.display_name())
                     # device.ensure_monitoring()
                     self._ctx.set_active_device(device)
                     self._ctx.compatible_modes = sorted(
@@ -100,11 +109,13 @@ class DeviceMonitor(BaseDeviceMonitor):
         if cls not in self._monitored_devices:
             dev = cls(app_ctx=self._ctx, hidraw_path=path)
             self._monitored_devices[cls] = dev
-            self._ctx.log(f"* Dispositivo detectado: {cls.__name__} (path: {path})")
+            self._logger.info("* Dispositivo detectado: %s (path: %s)", cls.__name__, path)
         else:
             dev = self._monitored_devices[cls]
             dev.add_known_path(path)
-            self._ctx.log(f"{cls.__name__} já conhecido. Adicionando novo path: {path}")
+            self._logger.info(
+                "%s já conhecido. Adicionando novo path: %s", cls.__name__, path
+            )
 
         if len(self._monitored_devices) > 1:
             if VirtualPointer in self._monitored_devices:
@@ -133,12 +144,14 @@ class DeviceMonitor(BaseDeviceMonitor):
     def remove_monitored_device_path(self, path):
         for dev in self.get_monitored_devices():
             if path in dev._known_paths:
-                self._ctx.log(f"- Removendo path {path} do dispositivo {dev}")
+                self._logger.info("- Removendo path %s do dispositivo %s", path, dev)
                 dev._known_paths.discard(path)
-                self._ctx.log(f"- Path {path} removido de {dev.__class__.__name__}")
+                self._logger.info(
+                    "- Path %s removido de %s", path, dev.__class__.__name__
+                )
                 if not dev._known_paths:
-                    self._ctx.log(
-                        f"* Nenhum dispositivo restante para monitorar. Encerrando thread."
+                    self._logger.info(
+                        "* Nenhum dispositivo restante para monitorar. Encerrando thread."
                     )
                     self.remove_monitored_device(dev)
                 break
@@ -182,21 +195,23 @@ class DeviceMonitor(BaseDeviceMonitor):
                         break
                     time.sleep(0.1)
                 else:
-                    self._ctx.log(f"! Dispositivo {path} não apareceu após o plug.")
+                    self._logger.warn("Dispositivo %s não apareceu após o plug.", path)
                     return  # não apareceu
                 for dev in self.get_monitored_devices():
                     if dev.known_path(path):
                         return  # já monitorado
                 for cls in DEVICE_CLASSES:
                     if cls.is_known_device(path):
-                        self._ctx.log(
-                            f"+ Novo dispositivo compatível conectado: {path}"
+                        self._logger.info(
+                            "+ Novo dispositivo compatível conectado: %s", path
                         )
                         self.add_monitored_device(cls, path)
         elif action == "remove":
             for dev in self.get_monitored_devices():
-                self._ctx.log(
-                    f"Verificando dispositivo {dev.__class__.__name__} com paths {dev._known_paths}"
+                self._logger.info(
+                    "Verificando dispositivo %s com paths %s",
+                    dev.__class__.__name__,
+                    dev._known_paths,
                 )
                 if dev.known_path(path):
                     self.remove_monitored_device_path(path)
@@ -220,14 +235,14 @@ class DeviceMonitor(BaseDeviceMonitor):
         self._hotplug_thread.start()
 
     def stop_monitoring(self):
-        self._ctx.log("* Encerrando monitoramento de dispositivos.")
+        self._logger.info("* Encerrando monitoramento de dispositivos.")
         self._stop_event.set()
 
         for dev in self.get_monitored_devices():
-            self._ctx.log(f"- Finalizando {dev.__class__.__name__}")
+            self._logger.info("- Finalizando %s", dev.__class__.__name__)
             dev.stop()
         self._monitored_devices.clear()
 
         if self._hotplug_thread and self._hotplug_thread.is_alive():
             self._hotplug_thread.join(timeout=2.0)
-            self._ctx.log("* Thread de hotplug finalizada.")
+            self._logger.info("* Thread de hotplug finalizada.")
@@ -0,0 +1,136 @@
+import os
+import struct
+import threading
+
+from evdev import ecodes as ec
+
+# struct input_event { struct timeval time; __u16 type; __u16 code; __s32 value; }
+# O kernel ignora o timestamp em escritas no uinput e preenche o seu próprio.
+INPUT_EVENT = struct.Struct("llHHi")
+
+_SYN_REPORT = INPUT_EVENT.pack(0, 0, ec.EV_SYN, ec.SYN_REPORT, 0)
+
+
+class EventBatcher:
+    """
+    Acumula os eventos de um report evdev até o SYN_REPORT e grava tudo
+    com um único write() de structs input_event no fd do uinput.
+
+    Reports que contêm apenas movimento relativo e ainda não foram gravados
+    são fundidos (somando REL_X/REL_Y), reduzindo a quantidade de reports
+    entregues ao sistema em presenters de alta taxa.
+
+    Se `fd` for None, usa o `emit`/`syn` do python-uinput como fallback.
+    """
+
+    def __init__(self, ui=None, fd=None, merge_motion=True):
+        self._ui = ui
+        self._fd = fd
+        self._merge_motion = merge_motion
+        self._lock = threading.Lock()
+        self._frame = []  # eventos do report atual
+        self._frame_rel_only = True
+        self._reports = []  # reports fechados aguardando flush
+        self._last_rel_only = False
+        self.events_in = 0
+        self.events_out = 0
+        self.reports_out = 0
+        self.writes = 0
+
+    @property
+    def fd(self):
+        return self._fd
+
+    def emit(self, etype, code, value):
+        with self._lock:
+            self.events_in += 1
+            if etype == ec.EV_REL:
+                # Dentro do mesmo report, soma deslocamentos do mesmo eixo
+                for i, (t, c, v) in enumerate(self._frame):
+                    if t == etype and c == code:
+                        self._frame[i] = (t, c, v + value)
+                        return
+            else:
+                self._frame_rel_only = False
+            self._frame.append((etype, code, value))
+
+    def emit_event(self, event):
+        self.emit(event.type, event.code, event.value)
+
+    def syn(self):
+        with self._lock:
+            self._close_frame()
+
+    def _close_frame(self):
+        if not self._frame:
+            self._frame_rel_only = True
+            return
+        if (
+            self._merge_motion
+            and self._frame_rel_only
+            and self._last_rel_only
+            and self._reports
+        ):
+            merged = dict(((t, c), v) for t, c, v in self._reports[-1])
+            for t, c, v in self._frame:
+                merged[(t, c)] = merged.get((t, c), 0) + v
+            self._reports[-1] = [(t, c, v) for (t, c), v in merged.items()]
+        else:
+            self._reports.append(self._frame)
+        self._last_rel_only = self._frame_rel_only
+        self._frame = []
+        self._frame_rel_only = True
+
+    def flush(self):
+        with self._lock:
+            # Eventos sem SYN_REPORT explícito formam um report próprio
+            self._close_frame()
+            reports = self._reports
+            if not reports:
+                return
+            self._reports = []
+            self._last_rel_only = False
+            self._write(reports)
+
+    def write_reports(self, reports):
+        # Grava reports completos imediatamente; o que já foi encaminhado
+        # do mesmo bloco de leitura sai antes, para manter a ordem
+        with self._lock:
+            self._close_frame()
+            pending = self._reports
+            self._reports = []
+            self._last_rel_only = False
+            self._write(pending + list(reports))
+
+    def _write(self, reports):
+        if self._fd is None:
+            ui = self._ui
+            for report in reports:
+                for etype, code, value in report:
+                    ui.emit((etype, code), value, syn=False)
+                ui.syn()
+                self.events_out += len(report)
+                self.reports_out += 1
+                self.writes += len(report) + 1
+            return
+
+        pack = INPUT_EVENT.pack
+        chunks = []
+        for report in reports:
+            for etype, code, value in report:
+                if etype == ec.EV_REL and value == 0:
+                    continue
+                chunks.append(pack(0, 0, etype, code, value))
+                self.events_out += 1
+            chunks.append(_SYN_REPORT)
+            self.reports_out += 1
+        os.write(self._fd, b"".join(chunks))
+        self.writes += 1
+
+    def stats(self):
+        return {
+            "events_in": self.events_in,
+            "events_out": self.events_out,
+            "reports_out": self.reports_out,
+            "writes": self.writes,
+        }
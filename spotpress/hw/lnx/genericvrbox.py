@@ -27,6 +27,26 @@ class GenericVRBoxPointer(PointerDevice):
     LONG_PRESS_INTERVAL = 0.6  # tempo mínimo para considerar pressionamento longo
     DOUBLE_CLICK_INTERVAL = 0.4  # segundos
     REPEAT_INTERVAL = 0.05
+    HANDLED_EVENTS = frozenset(
+        (ec.EV_KEY, code)
+        for code in (
+            ec.BTN_LEFT,
+            ec.BTN_TL,
+            ec.BTN_RIGHT,
+            ec.BTN_TR,
+            ec.BTN_A,
+            ec.KEY_PLAYPAUSE,
+            ec.BTN_TR2,
+            ec.BTN_B,
+            ec.BTN_X,
+            ec.KEY_VOLUMEUP,
+            ec.BTN_TL2,
+            ec.KEY_VOLUMEDOWN,
+            ec.BTN_Y,
+            ec.KEY_NEXTSONG,
+            ec.KEY_PREVIOUSSONG,
+        )
+    )
 
     def __init__(self, app_ctx, hidraw_path):
         super().__init__(app_ctx=app_ctx, hidraw_path=hidraw_path)
@@ -237,7 +257,7 @@ class GenericVRBoxPointer(PointerDevice):
     def handle_event(self, event):
         if event.type == ec.EV_REL:  # Movimento de Mouse
             # Repassa evento virtual
-            self._ctx.ui.emit((event.type, event.code), event.value)
+            self.forward_event(event)
 
         elif event.type == ec.EV_KEY:
             botao = None
@@ -0,0 +1,136 @@
+from array import array
+
+from evdev import ecodes as ec
+
+
+class AxisWindow:
+    """
+    Janela circular com as últimas `size` amostras de um eixo relativo.
+    Mantém contadores de amostras positivas/negativas e o deslocamento
+    total atualizados a cada amostra, em O(1).
+    """
+
+    __slots__ = (
+        "size",
+        "_values",
+        "_times",
+        "_pos",
+        "count",
+        "positives",
+        "negatives",
+        "total",
+    )
+
+    def __init__(self, size):
+        self.size = size
+        self._values = array("l", [0]) * size
+        self._times = array("d", [0.0]) * size
+        self.clear()
+
+    def clear(self):
+        self._pos = 0
+        self.count = 0
+        self.positives = 0
+        self.negatives = 0
+        self.total = 0
+
+    @property
+    def full(self):
+        return self.count == self.size
+
+    def push(self, value, timestamp=0.0):
+        pos = self._pos
+        if self.count == self.size:
+            old = self._values[pos]
+            if old > 0:
+                self.positives -= 1
+            elif old < 0:
+                self.negatives -= 1
+            self.total -= old
+        else:
+            self.count += 1
+        self._values[pos] = value
+        self._times[pos] = timestamp
+        if value > 0:
+            self.positives += 1
+        elif value < 0:
+            self.negatives += 1
+        self.total += value
+        pos += 1
+        self._pos = 0 if pos == self.size else pos
+
+    def duration(self):
+        """Tempo entre a amostra mais antiga e a mais recente da janela."""
+        if self.count < 2:
+            return 0.0
+        newest = self._times[self._pos - 1]
+        oldest = self._times[self._pos if self.count == self.size else 0]
+        return newest - oldest
+
+
+class SwipeRecognizer:
+    """
+    Reconhece swipes do air-mouse a partir de REL_X/REL_Y.
+
+    Com a janela cheia, um eixo gera gesto quando ao menos `min_samples`
+    amostras apontam para o mesmo lado. Se `counts_per_mm` for informado,
+    o gesto também precisa percorrer `min_distance_mm` e ter velocidade
+    média de pelo menos `min_speed_mm_s`; com os valores padrão apenas a
+    contagem de amostras é usada.
+    """
+
+    def __init__(
+        self,
+        window=15,
+        min_samples=8,
+        counts_per_mm=None,
+        min_distance_mm=0.0,
+        min_speed_mm_s=0.0,
+    ):
+        self.window = window
+        self.min_samples = min_samples
+        self.counts_per_mm = counts_per_mm
+        self.min_distance_mm = min_distance_mm
+        self.min_speed_mm_s = min_speed_mm_s
+        self.x = AxisWindow(window)
+        self.y = AxisWindow(window)
+
+    def clear(self):
+        self.x.clear()
+        self.y.clear()
+
+    def push(self, code, value, timestamp=0.0):
+        if code == ec.REL_X:
+            self.x.push(value, timestamp)
+        elif code == ec.REL_Y:
+            self.y.push(value, timestamp)
+
+    def _physical_ok(self, axis):
+        if not self.counts_per_mm:
+            return True
+        distance = abs(axis.total) / self.counts_per_mm
+        if distance < self.min_distance_mm:
+            return False
+        if self.min_speed_mm_s:
+            duration = axis.duration()
+            if duration > 0 and distance / duration < self.min_speed_mm_s:
+                return False
+        return True
+
+    def _axis_direction(self, axis, negative, positive):
+        if not axis.full:
+            return None
+        if axis.negatives >= self.min_samples and self._physical_ok(axis):
+            return negative
+        if axis.positives >= self.min_samples and self._physical_ok(axis):
+            return positive
+        return None
+
+    def detect(self):
+        """Retorna G_LEFT/G_RIGHT/G_UP/G_DOWN ou None, limpando as janelas."""
+        gesture = self._axis_direction(self.x, "G_LEFT", "G_RIGHT")
+        if gesture is None:
+            gesture = self._axis_direction(self.y, "G_UP", "G_DOWN")
+        if gesture is not None:
+            self.clear()
+        return gesture
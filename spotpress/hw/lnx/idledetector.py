@@ -0,0 +1,76 @@
+import threading
+import time
+
+
+class IdleDetector:
+    """
+    Chama `callback` uma vez quando passam `timeout` segundos sem atividade.
+
+    touch() apenas grava o horário da última atividade; uma única thread de
+    vida longa dorme até o prazo e só o reprograma se houve atividade nesse
+    meio tempo. Durante movimento contínuo não há criação de threads nem
+    timers.
+    """
+
+    def __init__(self, timeout, callback, name="idle_detector"):
+        self.timeout = timeout
+        self._callback = callback
+        self._name = name
+        self._last = 0.0
+        self._armed = False
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self.fired = 0
+
+    def touch(self):
+        self._last = time.monotonic()
+        if not self._armed:
+            self._arm()
+
+    def _arm(self):
+        with self._cond:
+            self._armed = True
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name=self._name
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._armed and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                last = self._last
+                remaining = last + self.timeout - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._armed = False
+                # touch() grava o horário antes de olhar _armed: se houve
+                # atividade enquanto o prazo vencia, continua armado
+                if self._last != last:
+                    self._armed = True
+                    continue
+            self.fired += 1
+            self._callback()
+
+    def cancel(self):
+        """Desarma sem disparar o callback."""
+        with self._cond:
+            self._armed = False
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._armed = False
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
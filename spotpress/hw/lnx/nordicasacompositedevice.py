@@ -12,6 +12,7 @@ from spotpress.utils import (
     get_keychord_for_presentation_program,
     refocus_presentation_window,
 )
+from spotpress.hw.lnx.idledetector import IdleDetector
 from spotpress.hw.lnx.pointerdevice import PointerDevice
 
 
@@ -20,6 +21,23 @@ class ASACompositeDevicePointer(PointerDevice):
     PRODUCT_ID = 0x1025
     # PRODUCT_DESCRIPTION = "123 COM Smart Control"
     DOUBLE_CLICK_INTERVAL = 0.3
+    HANDLED_EVENTS = frozenset(
+        {
+            (ec.EV_REL, ec.REL_X),
+            (ec.EV_REL, ec.REL_Y),
+            (ec.EV_KEY, ec.BTN_LEFT),
+            (ec.EV_KEY, ec.KEY_COMPOSE),
+            (ec.EV_KEY, ec.KEY_HOMEPAGE),
+            (ec.EV_KEY, ec.KEY_PAGEUP),
+            (ec.EV_KEY, ec.KEY_PAGEDOWN),
+            (ec.EV_KEY, ec.KEY_UP),
+            (ec.EV_KEY, ec.KEY_DOWN),
+            (ec.EV_KEY, ec.KEY_LEFT),
+            (ec.EV_KEY, ec.KEY_RIGHT),
+            (ec.EV_KEY, ec.KEY_PLAYPAUSE),
+            (ec.EV_KEY, ec.KEY_BACKSPACE),
+        }
+    )
 
     def __init__(self, app_ctx, hidraw_path):
         super().__init__(app_ctx=app_ctx, hidraw_path=hidraw_path)
@@ -34,8 +52,10 @@ class ASACompositeDevicePointer(PointerDevice):
         self._ctx.support_auto_mode = True
         self._lock = threading.Lock()
         self._is_mouse_down = False
-        self._auto_mode_timer = None
         self._auto_mode_timeout = 1.0
+        self._idle_detector = IdleDetector(
+            self._auto_mode_timeout, self._on_idle, name="auto_mode_idle"
+        )
         self._last_mouse_movement = 0
         self._last_mouse_move_action = 0
         self._mouse_down_time = 0
@@ -45,24 +65,13 @@ class ASACompositeDevicePointer(PointerDevice):
         # No Hidraw monitoring needed in this device
         pass
 
-    def _reset_auto_mode_timer(self):
-        if self._auto_mode_timer is not None:
-            self._auto_mode_timer.cancel()
-
-        def timeout_callback():
-            self.log("[AUTO] Timer expirou, executando MOUSE_STOP")
-            self.do_action("MOUSE_STOP")
-
-        self._auto_mode_timer = threading.Timer(
-            self._auto_mode_timeout, timeout_callback
-        )
-        self._auto_mode_timer.start()
+    def _on_idle(self):
+        self.log("[AUTO] Timer expirou, executando MOUSE_STOP")
+        self.do_action("MOUSE_STOP")
 
     def stop(self):
         super().stop()
-        if self._auto_mode_timer:
-            self._auto_mode_timer.cancel()
-            self._auto_mode_timer = None
+        self._idle_detector.stop()
 
     def do_action(self, button):
         if self._ctx.active_device != self:
@@ -73,7 +82,7 @@ class ASACompositeDevicePointer(PointerDevice):
         normal_mode = current_mode == MODE_MOUSE or not ow.is_overlay_actually_visible()
 
         if button != "MOUSE_MOVE":
-            self.log(f"DO_ACTION -> {button}")
+            self.log_action(button)
 
         match button:
             case "KEY_COMPOSE+RELEASE":
@@ -85,7 +94,7 @@ class ASACompositeDevicePointer(PointerDevice):
                     now = time.time()
                     if now - self._last_mouse_move_action > 1.2:
                         self._last_mouse_move_action = now
-                        self.log(f"DO ACTION -> {button}")
+                        self.log_action(button)
                         self._ctx.show_overlay()
             case "MOUSE_STOP":
                 if ow.auto_mode_enabled() and ow.is_overlay_actually_visible():
@@ -141,7 +150,7 @@ class ASACompositeDevicePointer(PointerDevice):
                 if normal_mode:
                     if self._was_last_esc:
                         keys = get_keychord_for_presentation_program()
-                        if self._ctx.debug_mode:
+                        if self.log_enabled():
                             self.log_key(keys)
                         self.emit_key_chord(keys)
                         self._was_last_esc = False
@@ -167,9 +176,9 @@ class ASACompositeDevicePointer(PointerDevice):
         ow = self._ctx.overlay_window
         if event.type == ec.EV_REL:  # Movimento de Mouse
             self._last_mouse_movement = time.time()
-            self._reset_auto_mode_timer()
+            self._idle_detector.touch()
             if self._last_mouse_movement - self._mouse_down_time > 1.5:
-                self._ctx.ui.emit((event.type, event.code), event.value)
+                self.forward_event(event)
                 self.do_action("MOUSE_MOVE")
 
         elif event.type == ec.EV_KEY:
@@ -177,7 +186,7 @@ class ASACompositeDevicePointer(PointerDevice):
             match event.code:
                 case ec.BTN_LEFT:
                     if self._ctx.current_mode in [MODE_MOUSE, MODE_PEN]:
-                        self._ctx.ui.emit((event.type, event.code), event.value)
+                        self.forward_event(event)
                     else:
                         if event.value == 1:
                             self._is_mouse_down = True
@@ -189,7 +198,7 @@ class ASACompositeDevicePointer(PointerDevice):
 
                 case ec.KEY_VOLUMEUP | ec.KEY_VOLUMEDOWN | ec.KEY_MUTE:
 
-                    self._ctx.ui.emit((event.type, event.code), event.value)
+                    self.forward_event(event)
 
                 case _:
                     button = ec.bytype[event.type][event.code]
@@ -1,8 +1,8 @@
+import struct
+import sys
 import time
 import uinput
 import threading
-import os
-import select
 import evdev.ecodes as ec
 
 from spotpress.utils import (
@@ -14,14 +14,49 @@ from spotpress.utils import (
     get_keychord_for_presentation_program,
     refocus_presentation_window,
 )
+from spotpress.hw.lnx.gestures import SwipeRecognizer
+from spotpress.hw.lnx.idledetector import IdleDetector
 from spotpress.hw.lnx.pointerdevice import PointerDevice
 
+# Os 4 primeiros bytes do report, lidos como um inteiro, identificam o botão
+_REPORT_KEY = struct.Struct(">I")
+
 
 class ASASmartControlPointer(PointerDevice):
     VENDOR_ID = 0x1915
     PRODUCT_ID = 0x1001
     # PRODUCT_DESCRIPTION = "123 COM Smart Control"
     DOUBLE_CLICK_INTERVAL = 0.3
+    HID_REPORT_SIZE = 8
+    # Teclas chegam também pelo hidraw; REL_X/REL_Y alimentam gestos e auto mode
+    HANDLED_EVENT_TYPES = frozenset({ec.EV_KEY})
+    HANDLED_EVENTS = frozenset({(ec.EV_REL, ec.REL_X), (ec.EV_REL, ec.REL_Y)})
+    # Swipes com o botão pressionado: janela de amostras e quantas devem
+    # apontar na mesma direção. Os limites físicos só valem se a resolução
+    # do sensor (contagens por mm) for informada.
+    GESTURE_WINDOW = 15
+    GESTURE_MIN_SAMPLES = 8
+    GESTURE_COUNTS_PER_MM = None
+    GESTURE_MIN_DISTANCE_MM = 0.0
+    GESTURE_MIN_SPEED_MM_S = 0.0
+
+    # Chave do report (4 primeiros bytes como inteiro) -> botão
+    BUTTON_MAP = {
+        _REPORT_KEY.unpack(bytes(prefix))[0]: sys.intern(button)
+        for prefix, button in (
+            ((0, 0, 75, 0), "PREV"),
+            ((0, 0, 78, 0), "NEXT"),
+            ((0, 0, 8, 0), "HGL"),
+            ((0, 0, 5, 0), "BLACK"),
+            ((0, 0, 0, 40), "TAB++"),
+            ((0, 0, 0, 41), "ESC"),
+            ((0, 0, 0, 43), "TAB"),
+            ((4, 0, 0, 43), "TAB+repeat"),
+            ((1, 0, 0, 19), "HGL+hold"),
+            ((1, 0, 0, 4), "HGL+release"),
+            ((2, 0, 0, 62), "START"),
+        )
+    }
 
     def __init__(self, app_ctx, hidraw_path):
         super().__init__(app_ctx=app_ctx, hidraw_path=hidraw_path)
@@ -44,29 +79,21 @@ class ASASmartControlPointer(PointerDevice):
         self._mouse_down_time = 0
         self._hold_states = {}
         self._was_last_esc = False
-        self._rel_x_buffer = []
-        self._rel_y_buffer = []
-        self._rel_buffer_size = 15
-        self._rel_trigger_count = 8
+        self._swipe = SwipeRecognizer(
+            window=self.GESTURE_WINDOW,
+            min_samples=self.GESTURE_MIN_SAMPLES,
+            counts_per_mm=self.GESTURE_COUNTS_PER_MM,
+            min_distance_mm=self.GESTURE_MIN_DISTANCE_MM,
+            min_speed_mm_s=self.GESTURE_MIN_SPEED_MM_S,
+        )
         self._last_movement_time = 0
         self._last_mouse_move_action = 0
         self._auto_mode_active = False
         self._auto_mode_timeout = 1.0
-        self._auto_mode_timer = None
+        self._idle_detector = IdleDetector(
+            self._auto_mode_timeout, self._on_idle, name="auto_mode_idle"
+        )
         self._last_overlay_color_change = 0
-        self._button_map = {
-            bytes([0, 0, 75, 0]): "PREV",
-            bytes([0, 0, 78, 0]): "NEXT",
-            bytes([0, 0, 8, 0]): "HGL",
-            bytes([0, 0, 5, 0]): "BLACK",
-            bytes([0, 0, 0, 40]): "TAB++",
-            bytes([0, 0, 0, 41]): "ESC",
-            bytes([0, 0, 0, 43]): "TAB",
-            bytes([4, 0, 0, 43]): "TAB+repeat",
-            bytes([1, 0, 0, 19]): "HGL+hold",
-            bytes([1, 0, 0, 4]): "HGL+release",
-            bytes([2, 0, 0, 62]): "START",
-        }
 
     def _on_button_press(self, botao):
         now = time.time()
@@ -121,27 +148,16 @@ class ASASmartControlPointer(PointerDevice):
         self._pending_click_timers[botao] = t
         t.start()
 
-    def _reset_auto_mode_timer(self):
-        if self._auto_mode_timer is not None:
-            self._auto_mode_timer.cancel()
-
-        def timeout_callback():
-            self.log("[AUTO] Timer expirou, executando MOUSE_STOP")
-            self.do_action("MOUSE_STOP")
-
-        self._auto_mode_timer = threading.Timer(
-            self._auto_mode_timeout, timeout_callback
-        )
-        self._auto_mode_timer.start()
+    def _on_idle(self):
+        self.log("[AUTO] Timer expirou, executando MOUSE_STOP")
+        self.do_action("MOUSE_STOP")
 
     def stop(self):
         super().stop()
         for t in self._pending_click_timers.values():
             t.cancel()
         self._pending_click_timers.clear()
-        if self._auto_mode_timer:
-            self._auto_mode_timer.cancel()
-            self._auto_mode_timer = None
+        self._idle_detector.stop()
 
     def stop_hidraw_monitoring(self):
         self._stop_hidraw_thread.set()
@@ -151,40 +167,14 @@ class ASASmartControlPointer(PointerDevice):
                 timeout=1
             )  # espera a thread encerrar (timeout opcional)
 
-    def read_pacotes_completos(self, f):
-        fd = f.fileno()
-        # Coloca o fd em não bloqueante
-        os.set_blocking(fd, False)
-
-        try:
-            while not self._stop_hidraw_thread.is_set():
-                rlist, _, _ = select.select([fd], [], [], 0.1)
-                if fd in rlist:
-                    b = f.read(8)
-                    if not b:
-                        # EOF ou dispositivo desconectado
-                        break
-                    if len(b) == 8:
-                        yield bytes(b)
-                else:
-                    # Timeout, permite checar stop event
-                    continue
-
-        except OSError as e:
-            self.log(f"[ERRO] Falha ao ler do device: {e}")
-        except Exception as e:
-            self.log(f"[ERRO] Exceção inesperada: {e}")
-
     def processa_pacote_hid(self, data):
 
-        if not (isinstance(data, bytes) and len(data) == 8):
+        if len(data) != 8:
             return
 
-        button = self._button_map.get(data[:4])
-
-        status_byte = sum(data[:4])
+        (key,) = _REPORT_KEY.unpack_from(data)
 
-        if status_byte == 0:
+        if key == 0:
             # Somente libera o botão que estava ativo
             if self._ultimo_botao_ativo:
                 self._on_button_release(self._ultimo_botao_ativo)
@@ -192,7 +182,8 @@ class ASASmartControlPointer(PointerDevice):
 
             return
 
-        if not button:
+        button = self.BUTTON_MAP.get(key)
+        if button is None:
             return
 
         # Se for um novo botão e havia outro ativo, libera o anterior
@@ -213,7 +204,7 @@ class ASASmartControlPointer(PointerDevice):
         normal_mode = current_mode == MODE_MOUSE or ow.is_overlay_actually_visible()
 
         if button != "MOUSE_MOVE":
-            self.log(f"DO ACTION -> {button}")
+            self.log_action(button)
         match button:
             case "TAB":
                 ow.switch_mode()
@@ -226,7 +217,7 @@ class ASASmartControlPointer(PointerDevice):
                     now = time.time()
                     if now - self._last_mouse_move_action > 1.2:
                         self._last_mouse_move_action = now
-                        self.log(f"DO ACTION -> {button}")
+                        self.log_action(button)
                         self._ctx.show_overlay()
             case "MOUSE_STOP":
                 if ow.auto_mode_enabled() and ow.is_overlay_actually_visible():
@@ -301,7 +292,7 @@ class ASASmartControlPointer(PointerDevice):
             case "START":
                 if normal_mode:
                     keys = get_keychord_for_presentation_program()
-                    if self._ctx.debug_mode:
+                    if self.log_enabled():
                         self.log_key(keys)
                     self.emit_key_chord(keys)
             case "NEXT++":
@@ -318,37 +309,9 @@ class ASASmartControlPointer(PointerDevice):
 
 
     def _verifica_direcao_gestos(self):
-        if len(self._rel_x_buffer) == self._rel_buffer_size:
-            esquerda = sum(1 for v in self._rel_x_buffer if v < 0)
-            direita = sum(1 for v in self._rel_x_buffer if v > 0)
-
-            if esquerda >= self._rel_trigger_count:
-                self.do_action("G_LEFT")
-                self._rel_x_buffer.clear()
-                self._rel_y_buffer.clear()
-                return
-
-            if direita >= self._rel_trigger_count:
-                self.do_action("G_RIGHT")
-                self._rel_x_buffer.clear()
-                self._rel_y_buffer.clear()
-                return
-
-        if len(self._rel_y_buffer) == self._rel_buffer_size:
-            cima = sum(1 for v in self._rel_y_buffer if v < 0)
-            baixo = sum(1 for v in self._rel_y_buffer if v > 0)
-
-            if cima >= self._rel_trigger_count:
-                self.do_action("G_UP")
-                self._rel_x_buffer.clear()
-                self._rel_y_buffer.clear()
-                return
-
-            if baixo >= self._rel_trigger_count:
-                self.do_action("G_DOWN")
-                self._rel_x_buffer.clear()
-                self._rel_y_buffer.clear()
-                return
+        gesture = self._swipe.detect()
+        if gesture:
+            self.do_action(gesture)
 
     def handle_event(self, event):
         if self._ctx.active_device != self:
@@ -356,35 +319,27 @@ class ASASmartControlPointer(PointerDevice):
         ow = self._ctx.overlay_window
         if event.type == ec.EV_REL:  # Movimento de Mouse
             self._last_movement_time = time.time()
-            self._reset_auto_mode_timer()
+            self._idle_detector.touch()
             if self._is_mouse_down:
-                if event.code == ec.REL_X:
-                    self._rel_x_buffer.append(event.value)
-                    if len(self._rel_x_buffer) > self._rel_buffer_size:
-                        self._rel_x_buffer.pop(0)
-
-                elif event.code == ec.REL_Y:
-                    self._rel_y_buffer.append(event.value)
-                    if len(self._rel_y_buffer) > self._rel_buffer_size:
-                        self._rel_y_buffer.pop(0)
+                self._swipe.push(event.code, event.value, event.timestamp())
                 # Repassa evento virtual
                 if not ow.drawing:
                     self._verifica_direcao_gestos()
                 else:
-                    self._ctx.ui.emit((event.type, event.code), event.value)
+                    self.forward_event(event)
             else:
                 self._last_mouse_movement = time.time()
                 if self._last_mouse_movement - self._mouse_down_time > 1.5:
-                    self._ctx.ui.emit((event.type, event.code), event.value)
+                    self.forward_event(event)
                     self.do_action("MOUSE_MOVE")
 
         elif event.type == ec.EV_KEY:
             self._last_movement_time = time.time()
-            self._reset_auto_mode_timer()
+            self._idle_detector.touch()
             match event.code:
                 case ec.BTN_LEFT:
                     if self._ctx.current_mode in [MODE_MOUSE, MODE_PEN]:
-                        self._ctx.ui.emit((event.type, event.code), event.value)
+                        self.forward_event(event)
                     else:
                         if event.value == 1:
                             self._is_mouse_down = True
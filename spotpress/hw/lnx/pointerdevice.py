@@ -3,18 +3,37 @@ import threading
 import subprocess
 import select
 import glob
+import time
 import evdev
 from evdev import ecodes as ec
 
 from spotpress.hw.base_pointer_device import BasePointerDevice
+from spotpress.hw.lnx.eventbatch import EventBatcher
+from spotpress.logger import DEBUG, ERROR, INFO, WARN, get_logger
+
+
+# Teclas que trocam de slide no programa de apresentação
+SLIDE_KEYS = {(ec.EV_KEY, ec.KEY_PAGEDOWN): 1, (ec.EV_KEY, ec.KEY_PAGEUP): -1}
 
 
 class PointerDevice(BasePointerDevice):
     VENDOR_ID = None
     PRODUCT_ID = None
     IS_VIRTUAL = False
+    # Eventos decodificados pelo driver em handle_event. Com o modo passthrough
+    # ativo, todo o resto é repassado cru para um clone uinput do dispositivo.
+    # None nos dois indica que o driver não suporta passthrough.
+    HANDLED_EVENT_TYPES = None
+    HANDLED_EVENTS = None
+
+    # Tamanho fixo dos reports hidraw lidos por read_pacotes_completos e
+    # quantos reports cabem no buffer de cada leitura.
+    HID_REPORT_SIZE = None
+    HID_READ_BATCH = 32
 
     def __init__(self, app_ctx, hidraw_path):
+        name = type(self).__name__
+        self._logger = get_logger(f"hw.{name}", prefix=f"[{name}] - ")
         self._is_virtual = False
         self._thread_set = set()
         self.path = hidraw_path
@@ -26,6 +45,8 @@ class PointerDevice(BasePointerDevice):
         self._ctx = app_ctx
         self._device_name = None
         self._known_paths = set()
+        # Momento da última leitura, para a latência nos traces
+        self._input_time = 0.0
 
         self.add_known_path(hidraw_path)
         for device in self.find_all_event_devices_for_known():
@@ -40,7 +61,7 @@ class PointerDevice(BasePointerDevice):
 
     def _start_thread(self, name, target):
         if name in self._thread_set:
-            self.log(f"* Tentativa de Criar Thread já existente com mesmo nome: {name}")
+            self.log("* Tentativa de Criar Thread já existente com mesmo nome: %s", name)
             return
         t = threading.Thread(target=target, daemon=True, name=name)
         t.start()
@@ -68,7 +89,7 @@ class PointerDevice(BasePointerDevice):
                     devices.append(evdev.InputDevice(path))
                     # self._ctx.log(f"* Encontrado device de entrada: {path}")
                 except Exception as e:
-                    self.log(f"* Erro ao acessar {path}: {e}")
+                    self.log("* Erro ao acessar %s: %s", path, e, level=ERROR)
         return devices
 
     def monitor(self):
@@ -82,27 +103,33 @@ class PointerDevice(BasePointerDevice):
         self._stop_hidraw_thread.clear()
 
         def run():
-            self.log(f"* Device monitorado: {self.path}")
+            self.log("* Device monitorado: %s", self.path)
             try:
                 if os.path.exists(self.path):
-                    with open(self.path, "rb") as f:
+                    with open(self.path, "rb", buffering=0) as f:
                         for pacote in self.read_pacotes_completos(f):
+                            self._input_time = time.perf_counter()
+                            recorder = getattr(self._ctx, "recorder", None)
+                            if recorder is not None:
+                                recorder.record_packet(pacote)
                             self.processa_pacote_hid(pacote)
             except PermissionError:
                 self.log(
-                    f"* Sem permissão para acessar {self.path} (tente ajustar udev ou rodar com sudo)"
+                    "* Sem permissão para acessar %s (tente ajustar udev ou rodar com sudo)",
+                    self.path,
+                    level=ERROR,
                 )
             except KeyboardInterrupt:
-                self.log(f"\nFinalizando monitoramento de {self.path}")
+                self.log("\nFinalizando monitoramento de %s", self.path)
             except OSError as e:
                 if e.errno == 5:  # Input/output error
-                    self.log("- Dispositivo desconectado ou erro de I/O")
+                    self.log("- Dispositivo desconectado ou erro de I/O", level=WARN)
                 else:
-                    self.log(f"* Erro em {self.path}: {e}")
+                    self.log("* Erro em %s: %s", self.path, e, level=ERROR)
 
             except Exception as e:
-                self.log(f"*  Erro em {self.path}: {e}")
-            self.log(f"Finalizou thread hidraw ({self.path})")
+                self.log("*  Erro em %s: %s", self.path, e, level=ERROR)
+            self.log("Finalizou thread hidraw (%s)", self.path)
 
         self._hidraw_thread = self._start_thread("hidraw_thread", run)
 
@@ -141,7 +168,7 @@ class PointerDevice(BasePointerDevice):
                 need_start = True
 
             if need_start:
-                self.log(f"* Monitorando {self.display_name()}")
+                self.log("* Monitorando %s", self.display_name())
                 self.monitor()
 
     def known_path(self, path):
@@ -159,7 +186,7 @@ class PointerDevice(BasePointerDevice):
 
     def remove_known_path(self, path):
         if path in self._known_paths:
-            self.log(f"- Removendo path {path} de {self.__class__.__name__}")
+            self.log("- Removendo path %s de %s", path, self.__class__.__name__)
             self._known_paths.remove(path)
         return len(self._known_paths) == 0  # retorna True se ficou vazio
 
@@ -186,7 +213,7 @@ class PointerDevice(BasePointerDevice):
                             if line.startswith("HID_NAME="):
                                 return line.strip().split("=", 1)[1]
         except Exception as e:
-            self.log(f"Erro ao obter nome: {e}")
+            self.log("Erro ao obter nome: %s", e, level=WARN)
 
         return self.__class__.__name__  # Fallback genérico
 
@@ -211,12 +238,25 @@ class PointerDevice(BasePointerDevice):
         if isinstance(key, list):
             self.emit_key_chord(key)
             return
-        ui = self._ctx.ui
-        ui.emit(key, 1)  # Pressiona
-        ui.emit(key, 0)  # Solta
+        writer = getattr(self._ctx, "event_writer", None)
+        if writer is not None:
+            # Pressiona e solta em um único write
+            writer.write_reports([[(*key, 1)], [(*key, 0)]])
+        else:
+            ui = self._ctx.ui
+            ui.emit(key, 1)  # Pressiona
+            ui.emit(key, 0)  # Solta
+        step = SLIDE_KEYS.get(tuple(key))
+        if step is not None:
+            self._ctx.notify_slide_change(step)
 
     def emit_key_chord(self, keys):
-        ui = self._ctx.ui
+        writer = getattr(self._ctx, "event_writer", None)
+        if writer is not None:
+            reports = [[(*key, 1)] for key in keys]
+            reports += [[(*key, 0)] for key in reversed(keys)]
+            writer.write_reports(reports)
+            return
         ui = self._ctx.ui
         # Pressiona todas
         for key in keys:
@@ -225,35 +265,135 @@ class PointerDevice(BasePointerDevice):
         for key in reversed(keys):
             ui.emit(key, 0)
 
+    def forward_event(self, event):
+        # Repassa o evento ao dispositivo virtual; só é gravado no SYN_REPORT
+        writer = getattr(self._ctx, "event_writer", None)
+        if writer is not None:
+            writer.emit_event(event)
+        else:
+            self._ctx.ui.emit((event.type, event.code), event.value)
+
+    @classmethod
+    def supports_passthrough(cls):
+        return cls.HANDLED_EVENT_TYPES is not None or cls.HANDLED_EVENTS is not None
+
+    @classmethod
+    def handles_event(cls, etype, code):
+        if cls.HANDLED_EVENT_TYPES and etype in cls.HANDLED_EVENT_TYPES:
+            return True
+        return bool(cls.HANDLED_EVENTS) and (etype, code) in cls.HANDLED_EVENTS
+
+    def passthrough_enabled(self):
+        return self.supports_passthrough() and self._ctx.config.get(
+            "general_passthrough", False
+        )
+
+    def create_passthrough_device(self, dev):
+        try:
+            clone = evdev.UInput.from_device(
+                dev, name=f"SpotPress Passthrough ({dev.name})"
+            )
+        except Exception as e:
+            self.log(
+                "* Erro ao criar dispositivo passthrough para %s: %s",
+                dev.path,
+                e,
+                level=ERROR,
+            )
+            return None
+        self.log("* Passthrough ativo para %s", dev.path)
+        return clone
+
+    def _sync_passthrough(self, fd_para_dev, passthrough, enabled):
+        """Cria ou fecha os clones uinput dos devices monitorados."""
+        if enabled:
+            for fd, dev in fd_para_dev.items():
+                if fd not in passthrough:
+                    clone = self.create_passthrough_device(dev)
+                    if clone is not None:
+                        passthrough[fd] = (clone, EventBatcher(clone, fd=clone.fd))
+            return
+        for clone, batcher in passthrough.values():
+            try:
+                batcher.flush()
+                clone.close()
+            except Exception:
+                pass
+        if passthrough:
+            self.log("* Passthrough desativado")
+        passthrough.clear()
+
+    def dispatch_input_events(self, events, passthrough=None):
+        writer = getattr(self._ctx, "event_writer", None)
+        handles_event = self.handles_event
+        for event in events:
+            etype = event.type
+            if etype == ec.EV_SYN:
+                if event.code == ec.SYN_REPORT:
+                    if writer is not None:
+                        writer.syn()
+                    if passthrough is not None:
+                        passthrough.syn()
+                continue
+            if passthrough is not None and not handles_event(etype, event.code):
+                passthrough.emit(etype, event.code, event.value)
+                continue
+            self.handle_event(event)
+        if writer is not None:
+            writer.flush()
+        if passthrough is not None:
+            passthrough.flush()
+
     def handle_event(self, event):
         pass
 
     def read_input_events(self, devices):
         while not self._stop_event_thread.is_set():
             fd_para_dev = {}
+            passthrough = {}
+            use_passthrough = self.passthrough_enabled()
             for dev in devices:
                 try:
                     dev.grab()
                     fd_para_dev[dev.fd] = dev
-                    self.log(f"* Device monitorado: {dev.path}")
+                    self.log("* Device monitorado: %s", dev.path)
                 except Exception as e:
                     self.log(
-                        f"* Erro ao monitorar dispositivo {dev.path}: {e}. Tente executar como root ou ajuste as regras udev."
+                        "* Erro ao monitorar dispositivo %s: %s. Tente executar como root"
+                        " ou ajuste as regras udev.",
+                        dev.path,
+                        e,
+                        level=ERROR,
                     )
+                    continue
+            if use_passthrough:
+                self._sync_passthrough(fd_para_dev, passthrough, True)
             try:
                 while not self._stop_event_thread.is_set():
+                    # A opção pode mudar com o device conectado
+                    enabled = self.passthrough_enabled()
+                    if enabled != use_passthrough:
+                        use_passthrough = enabled
+                        self._sync_passthrough(fd_para_dev, passthrough, enabled)
                     r, _, _ = select.select(fd_para_dev, [], [], 0.1)
                     for fd in r:
                         dev = fd_para_dev.get(fd)
                         if dev is None:
                             continue
                         try:
-                            for event in dev.read():
-                                self.handle_event(event)
+                            events = dev.read()
+                            self._input_time = time.perf_counter()
+                            recorder = getattr(self._ctx, "recorder", None)
+                            if recorder is not None:
+                                events = recorder.tap_events(events)
+                            clone = passthrough.get(fd)
+                            self.dispatch_input_events(
+                                events, clone[1] if clone else None
+                            )
 
                         except OSError as e:
                             if e.errno == 19:  # No such device
-                                self.log(f"- Dispositivo desconectado: {dev.path}")
+                                self.log("- Dispositivo desconectado: %s", dev.path)
                                 # Remove dispositivo da lista para não monitorar mais
                                 fd_para_dev.pop(fd, None)
                                 try:
@@ -278,17 +418,84 @@ class PointerDevice(BasePointerDevice):
                         dev.close()
                     except Exception:
                         pass
+                for clone, _ in passthrough.values():
+                    try:
+                        clone.close()
+                    except Exception:
+                        pass
 
     def read_pacotes_completos(self, f):
-        # raise NotImplementedError()
-        yield []
+        if not self.HID_REPORT_SIZE:
+            return
+        yield from self.read_hid_reports(f, self.HID_REPORT_SIZE)
+
+    def read_hid_reports(self, f, report_size, max_reports=None):
+        """
+        Lê reports de tamanho fixo do hidraw sem alocar por pacote.
+
+        Um único readv() preenche quantos slots de um bytearray reutilizável
+        houver reports disponíveis (o hidraw entrega um report por iovec).
+        Os reports são entregues como memoryview do buffer, válidas apenas
+        até a próxima iteração: quem precisar guardar deve copiar.
+        """
+        if max_reports is None:
+            max_reports = self.HID_READ_BATCH
+        fd = f.fileno()
+        os.set_blocking(fd, False)
+        buf = bytearray(report_size * max_reports)
+        view = memoryview(buf)
+        slots = [
+            view[i * report_size : (i + 1) * report_size] for i in range(max_reports)
+        ]
+        readv = os.readv
+        stop = self._stop_hidraw_thread
+        try:
+            while not stop.is_set():
+                rlist, _, _ = select.select([fd], [], [], 0.1)
+                if not rlist:
+                    # Timeout, permite checar stop event
+                    continue
+                try:
+                    n = readv(fd, slots)
+                except BlockingIOError:
+                    continue
+                if n == 0:
+                    # EOF ou dispositivo desconectado
+                    break
+                # Report incompleto no final é descartado
+                for i in range(n // report_size):
+                    yield slots[i]
+        except OSError as e:
+            self.log("Falha ao ler do device: %s", e, level=ERROR)
+        except Exception as e:
+            self.log("Exceção inesperada: %s", e, level=ERROR)
 
     def processa_pacote_hid(self, data):
         # raise NotImplementedError()
         pass
 
-    def log(self, message):
-        self._ctx.log(f"[{self.__class__.__name__}] - {message}")
+    def log(self, message, *args, level=INFO):
+        # Formata só se o nível estiver habilitado para este driver
+        if level >= self._logger.threshold:
+            self._logger.log(level, message, *args)
+
+    def log_enabled(self, level=DEBUG):
+        return level >= self._logger.threshold
+
+    def log_action(self, button):
+        logger = self._logger
+        if logger.threshold <= DEBUG:
+            logger.debug("DO ACTION -> %s", button)
+        writer = getattr(self._ctx, "log_writer", None)
+        if writer is not None:
+            writer.trace(
+                type(self).__name__,
+                button,
+                self._ctx.current_mode,
+                (time.perf_counter() - self._input_time) * 1e6
+                if self._input_time
+                else None,
+            )
 
     def log_key(self, key, prefix=""):
         all_keys = ec.KEY | ec.BTN
@@ -302,4 +509,4 @@ class PointerDevice(BasePointerDevice):
                 if isinstance(k, tuple):
                     chord.append(all_keys.get(k[1]))
         s_chord = " + ".join(chord)
-        self.log(f"{prefix}[{s_chord}]")
+        self.log("%s[%s]", prefix, s_chord, level=DEBUG)
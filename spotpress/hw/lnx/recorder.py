@@ -0,0 +1,171 @@
+import mmap
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import evdev
+from evdev import ecodes as ec
+
+# Arquivo: um cabeçalho seguido de registros de tamanho fixo, alinhados em
+# 8 bytes, para que possa ser lido direto via mmap sem parsing sequencial.
+MAGIC = b"SPRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHd24x")
+RECORD = struct.Struct("<dBBHHi16s6x")
+
+KIND_HID = 1
+KIND_EVENT = 2
+
+MAX_PAYLOAD = 16
+
+Record = namedtuple("Record", "timestamp kind type code value payload")
+
+
+class InputRecorder:
+    """
+    Grava pacotes hidraw e eventos evdev com timestamp em um log binário.
+    Pode ser usado por várias threads (hidraw e evdev) ao mesmo tempo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, time.time()))
+        self.count = 0
+
+    def record_packet(self, data, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        size = min(len(data), MAX_PAYLOAD)
+        rec = RECORD.pack(timestamp, KIND_HID, size, 0, 0, 0, bytes(data[:size]))
+        self._write(rec)
+
+    def record_event(self, event):
+        rec = RECORD.pack(
+            event.timestamp(),
+            KIND_EVENT,
+            0,
+            event.type,
+            event.code,
+            event.value,
+            b"",
+        )
+        self._write(rec)
+
+    def _write(self, rec):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(rec)
+            self.count += 1
+
+    def tap_events(self, events):
+        for event in events:
+            self.record_event(event)
+            yield event
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class InputReplayer:
+    """
+    Lê um log gravado pelo InputRecorder e o injeta em um PointerDevice,
+    na velocidade original ou o mais rápido possível.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.start_time = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._mm.close()
+            raise ValueError(f"Arquivo de gravação inválido: {path}")
+
+    def __len__(self):
+        return (len(self._mm) - HEADER.size) // RECORD.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        ts, kind, size, etype, code, value, payload = RECORD.unpack_from(
+            self._mm, HEADER.size + index * RECORD.size
+        )
+        return Record(ts, kind, etype, code, value, payload[:size])
+
+    def records(self):
+        offset = HEADER.size
+        end = HEADER.size + len(self) * RECORD.size
+        unpack_from = RECORD.unpack_from
+        while offset < end:
+            ts, kind, size, etype, code, value, payload = unpack_from(self._mm, offset)
+            yield Record(ts, kind, etype, code, value, payload[:size])
+            offset += RECORD.size
+
+    def replay(self, device, realtime=True, speed=1.0):
+        """
+        Alimenta `device` com os registros gravados. Pacotes hidraw vão para
+        processa_pacote_hid e eventos evdev são agrupados por report até o
+        SYN_REPORT antes de irem para dispatch_input_events.
+        Retorna a quantidade de registros injetados.
+        """
+        first_ts = None
+        started = time.monotonic()
+        pending = []
+        count = 0
+        for rec in self.records():
+            if realtime:
+                if first_ts is None:
+                    first_ts = rec.timestamp
+                delay = (rec.timestamp - first_ts) / speed - (
+                    time.monotonic() - started
+                )
+                if delay > 0:
+                    time.sleep(delay)
+
+            if rec.kind == KIND_HID:
+                device.processa_pacote_hid(rec.payload)
+            elif rec.kind == KIND_EVENT:
+                sec = int(rec.timestamp)
+                usec = int((rec.timestamp - sec) * 1_000_000)
+                pending.append(
+                    evdev.InputEvent(sec, usec, rec.type, rec.code, rec.value)
+                )
+                if rec.type == ec.EV_SYN and rec.code == ec.SYN_REPORT:
+                    device.dispatch_input_events(pending)
+                    pending = []
+            count += 1
+
+        if pending:
+            device.dispatch_input_events(pending)
+        return count
+
+    def close(self):
+        self._mm.close()
+
+
+def main(argv):
+    if len(argv) != 2:
+        print("Usage: python -m spotpress.hw.lnx.recorder FILE")
+        return 1
+    replayer = InputReplayer(argv[1])
+    for rec in replayer.records():
+        offset = rec.timestamp - replayer.start_time
+        if rec.kind == KIND_HID:
+            print(f"{offset:10.6f} HID   {rec.payload.hex(' ')}")
+        else:
+            name = ec.bytype.get(rec.type, {}).get(rec.code, rec.code)
+            print(f"{offset:10.6f} EVENT {ec.EV.get(rec.type)} {name} {rec.value}")
+    replayer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -1,58 +1,200 @@
 from spotpress.qtcompat import QLocalSocket, QLocalServer
-from spotpress.utils import SOCKET_NAME
+from spotpress.modes import SOCKET_NAME
+from spotpress import ipcprotocol
 import atexit
+import json
+from collections import deque
 
 # # Garante que o socket seja removido em encerramento normal
 # atexit.register(lambda: QLocalServer.removeServer(SOCKET_NAME))
 
 
+class IpcConnection:
+    """
+    Conexão persistente com a instância em execução. Várias requisições
+    podem ser enviadas em sequência (pipeline) antes de ler as respostas.
+    """
+
+    def __init__(self, name=SOCKET_NAME, timeout_ms=500):
+        self._timeout = timeout_ms
+        self._socket = QLocalSocket()
+        self._socket.connectToServer(name)
+        self._decoder = ipcprotocol.LineDecoder()
+        self._replies = {}
+        self._events = deque()
+        self._next_id = 1
+        self.connected = self._socket.waitForConnected(timeout_ms)
+
+    def send(self, command):
+        """Envia sem esperar a resposta; retorna o id da requisição."""
+        req_id = self._next_id
+        self._next_id += 1
+        self._socket.write(ipcprotocol.encode(ipcprotocol.request(req_id, command)))
+        self._socket.flush()
+        return req_id
+
+    def _read(self, timeout_ms):
+        if not self._socket.bytesAvailable() and not self._socket.waitForReadyRead(
+            timeout_ms
+        ):
+            return False
+        for line in self._decoder.feed(self._socket.readAll().data()):
+            reply = json.loads(line)
+            for item in reply if isinstance(reply, list) else [reply]:
+                if "event" in item:
+                    self._events.append(item)
+                else:
+                    self._replies[item.get("id")] = item
+        return True
+
+    def wait(self, req_id):
+        while req_id not in self._replies:
+            if not self._read(self._timeout):
+                raise TimeoutError(f"Sem resposta para a requisição {req_id}")
+        reply = self._replies.pop(req_id)
+        if not reply.get("ok"):
+            raise ipcprotocol.CommandError(reply.get("error"))
+        return reply.get("result")
+
+    def request(self, command):
+        return self.wait(self.send(command))
+
+    def next_event(self, timeout_ms=None):
+        """Próximo evento recebido após --subscribe, ou None no timeout."""
+        if not self._events:
+            self._read(self._timeout if timeout_ms is None else timeout_ms)
+        return self._events.popleft() if self._events else None
+
+    def close(self):
+        if self._socket.isValid():
+            self._socket.waitForBytesWritten(self._timeout)
+        self._socket.disconnectFromServer()
+
+
 def send_command_to_existing_instance(command, name=SOCKET_NAME):
     """
     Tenta se conectar a uma instância existente e envia um comando via QLocalSocket.
     Retorna True se o comando foi enviado, False se não há instância ativa.
     """
-    socket = QLocalSocket()
-    socket.connectToServer(name)
-    if not socket.waitForConnected(500):
+    return send_commands_to_existing_instance([command], name)
+
+
+def send_commands_to_existing_instance(commands, name=SOCKET_NAME):
+    """Como send_command_to_existing_instance, um comando de cada vez."""
+    conn = IpcConnection(name)
+    if not conn.connected:
         return False
-    socket.write(command.encode())
-    socket.flush()
-    socket.waitForBytesWritten(500)
-    socket.disconnectFromServer()
+    try:
+        for command in commands:
+            try:
+                conn.request(command)
+            except ipcprotocol.CommandError as e:
+                print(f"[IPC] {e}")
+    except TimeoutError:
+        pass
+    finally:
+        conn.close()
     return True
 
 
-def setup_ipc_server(callback, name=SOCKET_NAME, parent=None):
+class IpcServer(QLocalServer):
     """
-    Cria um QLocalServer que escuta comandos externos.
-    `callback` será chamado com a string recebida.
-
-    Retorna o QLocalServer criado ou None se o socket já estiver em uso.
+    QLocalServer com o protocolo de ipcprotocol e as assinaturas de eventos
+    de cada conexão.
     """
-    try:
-        QLocalServer.removeServer(name)
-    except Exception:
-        pass
 
-    server = QLocalServer(parent)
-    if not server.listen(name):
-        return None  # Já está rodando
+    # Assinante que não consome os eventos é desconectado ao acumular isto
+    MAX_PENDING_BYTES = 1024 * 1024
+
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self._callback = callback
+        self._subscribers = {}  # socket -> conjunto de eventos
+        # Referências fortes aos slots de cada conexão: o ciclo socket <->
+        # closures não é visível ao coletor do Python, que o liberaria com o
+        # socket ainda conectado
+        self._connections = {}
+        self.newConnection.connect(self._handle_new_connection)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def broadcast(self, name, data=None):
+        """Envia o evento a todas as conexões assinantes; retorna quantas."""
+        if not self._subscribers:
+            return 0
+        payload = ipcprotocol.encode(ipcprotocol.event(name, data))
+        sent = 0
+        for socket, events in list(self._subscribers.items()):
+            if name not in events:
+                continue
+            if socket.bytesToWrite() > self.MAX_PENDING_BYTES:
+                self._subscribers.pop(socket, None)
+                socket.abort()
+                continue
+            socket.write(payload)
+            sent += 1
+        return sent
+
+    def _handle_command(self, socket, command):
+        if command.startswith("--subscribe"):
+            events = ipcprotocol.parse_subscription(command)
+            self._subscribers.setdefault(socket, set()).update(events)
+            return sorted(self._subscribers[socket])
+        if command == "--unsubscribe":
+            self._subscribers.pop(socket, None)
+            return None
+        return self._callback(command)
 
-    def handle_new_connection():
-        socket = server.nextPendingConnection()
+    def _handle_new_connection(self):
+        socket = self.nextPendingConnection()
         if not socket:
             return
+        decoder = ipcprotocol.LineDecoder()
+
+        def handler(command):
+            return self._handle_command(socket, command)
+
+        def dispatch(lines):
+            for line in lines:
+                reply = ipcprotocol.dispatch_line(line, handler)
+                if reply and socket.isValid():
+                    socket.write(reply)
 
         def read_and_dispatch():
             try:
-                data = socket.readAll().data().decode(errors="ignore").strip()
-                if data:
-                    callback(data)
-            except Exception:
-                pass
+                dispatch(decoder.feed(socket.readAll().data()))
+            except ipcprotocol.ProtocolError as e:
+                socket.write(ipcprotocol.encode(ipcprotocol.error(None, e)))
+            socket.flush()
+
+        def on_disconnected():
+            self._subscribers.pop(socket, None)
+            # Clientes antigos mandam um único comando sem quebra de linha
+            dispatch(decoder.flush())
+            self._connections.pop(socket, None)
+            socket.deleteLater()
 
+        self._connections[socket] = (read_and_dispatch, on_disconnected)
         socket.readyRead.connect(read_and_dispatch)
-        socket.disconnected.connect(socket.deleteLater)
+        socket.disconnected.connect(on_disconnected)
 
-    server.newConnection.connect(handle_new_connection)
+
+def setup_ipc_server(callback, name=SOCKET_NAME, parent=None):
+    """
+    Cria um IpcServer que escuta comandos externos.
+    `callback` será chamado com cada comando recebido; o retorno vai na
+    resposta e ipcprotocol.CommandError vira uma resposta de erro.
+
+    Retorna o servidor criado ou None se o socket já estiver em uso.
+    """
+    try:
+        QLocalServer.removeServer(name)
+    except Exception:
+        pass
+
+    server = IpcServer(callback, parent)
+    if not server.listen(name):
+        return None  # Já está rodando
     return server
@@ -0,0 +1,133 @@
+"""
+Cliente do socket de controle usando apenas a stdlib (AF_UNIX).
+
+O QLocalServer escuta em QDir::tempPath()/<nome>, isto é, $TMPDIR ou /tmp.
+Mesmo protocolo de spotpress.ipc.IpcConnection, sem importar Qt.
+"""
+
+import json
+import os
+import socket
+import time
+from collections import deque
+
+from spotpress import ipcprotocol
+from spotpress.modes import SOCKET_NAME
+
+
+def socket_path(name=SOCKET_NAME):
+    if os.path.isabs(name):
+        return name
+    tmp = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(os.path.normpath(tmp), name)
+
+
+class IpcClient:
+    def __init__(self, name=SOCKET_NAME, timeout=0.5):
+        self._decoder = ipcprotocol.LineDecoder()
+        self._replies = {}
+        self._events = deque()
+        self._next_id = 1
+        self._timeout = timeout
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self.connected = self._connect(socket_path(name), timeout)
+
+    def _connect(self, path, timeout):
+        # Com o backlog do servidor cheio o connect falha com EAGAIN em vez
+        # de bloquear; tenta de novo até o timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self._sock.connect(path)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.002)
+            except OSError:
+                break
+        self._sock.close()
+        return False
+
+    def send(self, command):
+        """Envia sem esperar a resposta; retorna o id da requisição."""
+        if not self.connected:
+            raise ConnectionError("Sem conexão com a instância")
+        req_id = self._next_id
+        self._next_id += 1
+        self._sock.sendall(ipcprotocol.encode(ipcprotocol.request(req_id, command)))
+        return req_id
+
+    def _read(self, timeout):
+        self._sock.settimeout(timeout)
+        try:
+            data = self._sock.recv(65536)
+        except socket.timeout:
+            return False
+        if not data:
+            raise ConnectionError("Conexão encerrada pela instância")
+        for line in self._decoder.feed(data):
+            reply = json.loads(line)
+            for item in reply if isinstance(reply, list) else [reply]:
+                if "event" in item:
+                    self._events.append(item)
+                else:
+                    self._replies[item.get("id")] = item
+        return True
+
+    def wait(self, req_id):
+        while req_id not in self._replies:
+            if not self._read(self._timeout):
+                raise TimeoutError(f"Sem resposta para a requisição {req_id}")
+        reply = self._replies.pop(req_id)
+        if not reply.get("ok"):
+            raise ipcprotocol.CommandError(reply.get("error"))
+        return reply.get("result")
+
+    def request(self, command):
+        return self.wait(self.send(command))
+
+    def next_event(self, timeout=None):
+        """
+        Próximo evento recebido após --subscribe, ou None no timeout
+        (timeout=None usa o timeout da conexão).
+        """
+        if not self._events:
+            self._read(self._timeout if timeout is None else timeout)
+        return self._events.popleft() if self._events else None
+
+    def events(self):
+        """Itera indefinidamente sobre os eventos recebidos."""
+        while self.connected:
+            while self._events:
+                yield self._events.popleft()
+            self._read(None)
+
+    def close(self):
+        if self.connected:
+            self._sock.close()
+            self.connected = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def send_command(command, name=SOCKET_NAME):
+    """
+    Envia um comando à instância em execução.
+    Retorna True se o comando foi enviado, False se não há instância ativa.
+    """
+    with IpcClient(name) as client:
+        if not client.connected:
+            return False
+        try:
+            client.request(command)
+        except ipcprotocol.CommandError as e:
+            print(f"[IPC] {e}")
+        except (TimeoutError, ConnectionError):
+            pass
+    return True
@@ -0,0 +1,145 @@
+"""
+Protocolo do socket de controle: JSON delimitado por quebra de linha.
+
+Requisição:  {"id": 1, "command": "--set-mode=laser"}
+Resposta:    {"id": 1, "ok": true, "result": null}
+Erro:        {"id": 1, "ok": false, "error": "Comando desconhecido: ..."}
+
+Uma linha pode conter uma lista de requisições (lote); a resposta é a lista
+das respostas na mesma ordem. Requisições sem "id" não recebem resposta,
+assim como linhas que não começam com '{' ou '[' (comandos no formato
+antigo, em texto puro).
+
+Eventos: após "--subscribe" (ou "--subscribe=evento1,evento2") a conexão
+passa a receber linhas sem "id", enviadas assim que o estado muda:
+
+Evento:      {"event": "currentModeChanged", "data": {"mode": 2, "name": "laser"}}
+
+Este módulo usa apenas a stdlib para poder ser importado pelo spotpressctl.
+"""
+
+import json
+
+MAX_LINE = 64 * 1024
+
+EVENTS = ("currentModeChanged", "configChanged", "devicesChanged")
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+class CommandError(Exception):
+    """Erro de execução de um comando, devolvido ao cliente na resposta."""
+
+
+def encode(message):
+    return (
+        json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+        + b"\n"
+    )
+
+
+def request(req_id, command):
+    return {"id": req_id, "command": command}
+
+
+def response(req_id, result=None):
+    return {"id": req_id, "ok": True, "result": result}
+
+
+def error(req_id, message):
+    return {"id": req_id, "ok": False, "error": str(message)}
+
+
+def event(name, data=None):
+    return {"event": name, "data": data}
+
+
+def parse_subscription(command):
+    """'--subscribe=a,b' -> {'a', 'b'}; '--subscribe' -> todos os eventos."""
+    _, _, names = command.partition("=")
+    events = {n.strip() for n in names.split(",") if n.strip()} or set(EVENTS)
+    unknown = events.difference(EVENTS)
+    if unknown:
+        raise CommandError(f"Evento desconhecido: {', '.join(sorted(unknown))}")
+    return events
+
+
+class LineDecoder:
+    """Acumula bytes recebidos e devolve as linhas completas."""
+
+    def __init__(self, max_line=MAX_LINE):
+        self._buffer = bytearray()
+        self._max_line = max_line
+
+    def feed(self, data):
+        self._buffer += data
+        if b"\n" not in data:
+            lines, rest = [], self._buffer
+        else:
+            *lines, rest = self._buffer.split(b"\n")
+            self._buffer = bytearray(rest)
+        # O limite vale também para o resto depois da última quebra e para
+        # linhas completas que chegaram num único bloco
+        if len(rest) > self._max_line or any(
+            len(line) > self._max_line for line in lines
+        ):
+            self._buffer.clear()
+            raise ProtocolError("Linha maior que o limite do protocolo")
+        return [line for line in lines if line.strip()]
+
+    def flush(self):
+        """Devolve o que sobrou sem quebra de linha (clientes antigos)."""
+        rest = bytes(self._buffer)
+        self._buffer.clear()
+        return [rest] if rest.strip() else []
+
+
+def parse_line(line):
+    """
+    Retorna (lote, requisições). Cada requisição é (id, comando); id None
+    indica um comando no formato antigo, que não recebe resposta.
+    """
+    text = line.decode(errors="ignore").strip()
+    if not text or text[0] not in "{[":
+        return False, [(None, text)]
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ProtocolError(f"JSON inválido: {e}") from None
+    batch = isinstance(data, list)
+    items = data if batch else [data]
+    requests = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("command"), str):
+            raise ProtocolError("Requisição sem 'command'")
+        requests.append((item.get("id"), item["command"]))
+    return batch, requests
+
+
+def dispatch_line(line, handler):
+    """
+    Executa as requisições de uma linha com `handler(comando)` e devolve os
+    bytes da resposta (ou b"" para comandos no formato antigo).
+    """
+    try:
+        batch, requests = parse_line(line)
+    except ProtocolError as e:
+        return encode(error(None, e))
+
+    replies = []
+    for req_id, command in requests:
+        try:
+            result = handler(command)
+            reply = response(req_id, result)
+        except CommandError as e:
+            reply = error(req_id, e)
+        except Exception as e:
+            reply = error(req_id, f"{type(e).__name__}: {e}")
+        if req_id is not None or batch:
+            replies.append(reply)
+
+    if not replies:
+        return b""
+    return encode(replies if batch else replies[0])
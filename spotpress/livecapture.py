@@ -0,0 +1,136 @@
+"""
+Captura contínua da área sob a lupa ("lupa ao vivo").
+
+Uma thread recaptura o retângulo pedido pelo overlay a `fps` quadros por
+segundo, com um backend próprio (no xshm: conexão e segmento de memória
+compartilhada próprios, reaproveitados a cada captura) e excluindo a
+janela do overlay. A thread da GUI só pega o quadro mais recente em
+`latest()`, sem esperar pela captura.
+
+Capturas nulas seguidas (sem compositor, lente sobre duas janelas) dobram
+o intervalo até BACKOFF_MAX_S; depois de `max_failures` seguidas a thread
+para e o overlay só recomeça no próximo show ou troca de modo.
+"""
+
+import threading
+import time
+from collections import deque
+
+from spotpress.logger import get_logger
+from spotpress.qtcompat import QRect
+
+_logger = get_logger("capture.live")
+
+BACKOFF_MAX_S = 1.0
+MAX_FAILURES = 20
+
+
+class LiveCapture:
+    def __init__(
+        self, open_backend, screen, exclude, fps=30, max_failures=MAX_FAILURES
+    ):
+        # open_backend() é chamado dentro da thread; screen é um
+        # ScreenGeometry (QScreen não é usado fora da thread da GUI)
+        self._open_backend = open_backend
+        self._screen = screen
+        self._exclude = exclude
+        self.fps = fps
+        self.interval = 1.0 / max(1, fps)
+        self.max_failures = max_failures
+        self._rect = None
+        self._latest = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.frames = 0
+        self.failures = 0
+        self.gave_up = False
+        self.costs = deque(maxlen=120)
+        self._times = deque(maxlen=120)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="spotpress-live-capture", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def request(self, rect):
+        """Área a capturar, em coordenadas do monitor (pixels lógicos)."""
+        self._rect = (rect.x(), rect.y(), rect.width(), rect.height())
+
+    def latest(self):
+        """(QImage, QRect capturado) mais recente, ou None."""
+        return self._latest
+
+    def _run(self):
+        try:
+            backend = self._open_backend()
+        except (OSError, ValueError) as e:
+            _logger.error("Lupa ao vivo: %s", e)
+            return
+        try:
+            perf = time.perf_counter
+            streak = 0
+            while not self._stop.is_set():
+                start = perf()
+                rect = self._rect
+                if rect is not None:
+                    image = backend.grab(
+                        self._screen, QRect(*rect), exclude=self._exclude
+                    )
+                    if image.isNull():
+                        self.failures += 1
+                        streak += 1
+                        if self.failures == 1:
+                            _logger.warn(
+                                "Lupa ao vivo sem captura (sem compositor"
+                                " ou a lente cobre outra janela); usando a imagem estática"
+                            )
+                        if streak >= self.max_failures:
+                            self.gave_up = True
+                            _logger.warn(
+                                "Lupa ao vivo parada após %d capturas nulas seguidas",
+                                streak,
+                            )
+                            break
+                    else:
+                        streak = 0
+                        # A imagem do xshm é reescrita na próxima captura
+                        self._latest = (image.copy(), QRect(*rect))
+                        self.frames += 1
+                        end = perf()
+                        self.costs.append(end - start)
+                        self._times.append(end)
+                interval = self.interval
+                if streak:
+                    interval = min(BACKOFF_MAX_S, interval * 2**streak)
+                self._stop.wait(max(0.0, interval - (perf() - start)))
+        finally:
+            backend.close()
+
+    def stats(self):
+        costs = sorted(self.costs)
+        times = self._times
+        rate = 0.0
+        if len(times) > 1 and times[-1] > times[0]:
+            rate = (len(times) - 1) / (times[-1] - times[0])
+        return {
+            "live_active": self.running,
+            "live_frames": self.frames,
+            "live_failures": self.failures,
+            "live_gave_up": self.gave_up,
+            "live_fps": round(rate, 1),
+            "live_capture_p50_ms": (
+                round(costs[len(costs) // 2] * 1e3, 3) if costs else 0.0
+            ),
+            "live_capture_max_ms": round(costs[-1] * 1e3, 3) if costs else 0.0,
+        }
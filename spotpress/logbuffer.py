@@ -0,0 +1,114 @@
+"""
+Buffer circular das mensagens de log.
+
+As mensagens entram por `append()` a partir de qualquer thread e ficam num
+deque de capacidade fixa; as mais antigas são descartadas. Quem exibe o log
+consome as novas em lote com `drain()`, em vez de receber uma chamada por
+mensagem. Nível e dispositivo são extraídos do texto na entrada:
+
+    "[ERRO] ..."                        -> nível ERRO
+    "[WARN] ..." / "! ..."              -> nível WARN
+    "[SpotlightDevice] - DO ACTION..."  -> dispositivo SpotlightDevice
+"""
+
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+LEVELS = ("DEBUG", "INFO", "WARN", "ERRO")
+
+LogRecord = namedtuple("LogRecord", "time level device text")
+
+
+def parse_level(message):
+    if message.startswith(("[ERRO]", "[ERROR]", "Erro")):
+        return "ERRO"
+    if message.startswith(("[WARN]", "! ")):
+        return "WARN"
+    if message.startswith("[DEBUG]"):
+        return "DEBUG"
+    return "INFO"
+
+
+def parse_device(message):
+    """'[Classe] - mensagem' -> 'Classe'; etiquetas como '[IPC]' não contam."""
+    if message.startswith("["):
+        end = message.find("] - ")
+        if end > 1:
+            return message[1:end]
+    return ""
+
+
+def format_record(record):
+    timestamp = datetime.fromtimestamp(record.time).strftime("%H:%M:%S.%f")[:-3]
+    return f"{timestamp} - {record.text}"
+
+
+class LogBuffer:
+    def __init__(self, capacity=5000):
+        self._records = deque(maxlen=capacity)
+        self._pending = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._devices = set()
+        self.capacity = capacity
+        self.received = 0
+        self.dropped = 0
+
+    def append(self, message, level=None, device=None):
+        record = LogRecord(
+            time.time(),
+            level or parse_level(message),
+            parse_device(message) if device is None else device,
+            message,
+        )
+        with self._lock:
+            if len(self._records) == self.capacity:
+                self.dropped += 1
+            self._records.append(record)
+            self._pending.append(record)
+            if record.device:
+                self._devices.add(record.device)
+            self.received += 1
+        return record
+
+    def drain(self):
+        """Devolve (e esquece) as mensagens ainda não consumidas."""
+        with self._lock:
+            records = list(self._pending)
+            self._pending.clear()
+        return records
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._pending.clear()
+            self._devices.clear()
+
+    def devices(self):
+        with self._lock:
+            return sorted(self._devices)
+
+    def __len__(self):
+        return len(self._records)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._records)
+
+    def records(self, level=None, device=None):
+        """Mensagens guardadas com nível >= `level` e do `device` (se dados)."""
+        min_level = LEVELS.index(level) if level else 0
+        for record in self.snapshot():
+            if LEVELS.index(record.level) < min_level:
+                continue
+            if device and record.device != device:
+                continue
+            yield record
+
+    def lines(self, level=None, device=None):
+        for record in self.records(level, device):
+            yield format_record(record) + "\n"
+
+    def write_to(self, file, level=None, device=None):
+        file.writelines(self.lines(level, device))
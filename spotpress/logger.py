@@ -0,0 +1,145 @@
+"""
+Log com níveis e habilitação por subsistema.
+
+Cada subsistema pega um Logger com `get_logger("hw.BaseusOrangeDotAI")`. O
+nível mínimo de cada logger é calculado quando a configuração muda, então
+uma mensagem abaixo do nível custa só uma comparação de inteiros: a
+formatação ("DO ACTION -> %s" % botão) e o envio ao sink só acontecem para
+mensagens aceitas. Avisos e erros ganham a etiqueta do nível ("[WARN] ",
+"[ERRO] ") depois do prefixo do logger; as mensagens não a repetem.
+
+O nível de um subsistema vem do prefixo mais longo configurado:
+
+    configure(level=WARN, subsystems={"hw": DEBUG, "ipc": INFO})
+
+ou, na linha de comando, `--log=hw=DEBUG,ipc=INFO`. Este módulo usa apenas
+a stdlib.
+"""
+
+import threading
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARN: "WARN", ERROR: "ERRO"}
+NAME_LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+NAME_LEVELS["ERROR"] = ERROR
+NAME_LEVELS["WARNING"] = WARN
+# Etiqueta posta pelo _emit no texto dos avisos e erros: "[WARN] ...", "[ERRO] ..."
+LEVEL_TAGS = {level: f"[{LEVEL_NAMES[level]}] " for level in (WARN, ERROR)}
+
+_lock = threading.Lock()
+_loggers = {}
+_subsystems = {}
+_default_level = WARN
+_sink = None
+_extra_sinks = ()
+
+
+class Logger:
+    __slots__ = ("name", "prefix", "threshold")
+
+    def __init__(self, name, prefix=""):
+        self.name = name
+        self.prefix = prefix
+        self.threshold = _level_for(name)
+
+    def enabled(self, level):
+        return level >= self.threshold
+
+    def log(self, level, message, *args):
+        if level >= self.threshold:
+            _emit(self, level, message, args)
+
+    def debug(self, message, *args):
+        if self.threshold <= DEBUG:
+            _emit(self, DEBUG, message, args)
+
+    def info(self, message, *args):
+        if self.threshold <= INFO:
+            _emit(self, INFO, message, args)
+
+    def warn(self, message, *args):
+        if self.threshold <= WARN:
+            _emit(self, WARN, message, args)
+
+    def error(self, message, *args):
+        if self.threshold <= ERROR:
+            _emit(self, ERROR, message, args)
+
+
+def _level_for(name):
+    best = None
+    for prefix, level in _subsystems.items():
+        if name == prefix or name.startswith(prefix + "."):
+            if best is None or len(prefix) > len(best):
+                best = prefix
+    return _default_level if best is None else _subsystems[best]
+
+
+def _emit(logger, level, message, args):
+    if args:
+        message = message % args
+    text = logger.prefix + LEVEL_TAGS.get(level, "") + message
+    sink = _sink
+    if sink is None:
+        print(text)
+    else:
+        sink(text, LEVEL_NAMES[level], logger.name)
+    for extra in _extra_sinks:
+        extra(text, LEVEL_NAMES[level], logger.name)
+
+
+def get_logger(name, prefix=""):
+    with _lock:
+        logger = _loggers.get((name, prefix))
+        if logger is None:
+            logger = _loggers[(name, prefix)] = Logger(name, prefix)
+        return logger
+
+
+def set_sink(sink):
+    """`sink(texto, nível, subsistema)`; None imprime no stdout."""
+    global _sink
+    _sink = sink
+
+
+def add_sink(sink):
+    """Sink adicional (arquivo, por exemplo), chamado além do principal."""
+    global _extra_sinks
+    with _lock:
+        _extra_sinks = _extra_sinks + (sink,)
+
+
+def remove_sink(sink):
+    global _extra_sinks
+    with _lock:
+        _extra_sinks = tuple(s for s in _extra_sinks if s != sink)
+
+
+def configure(level=None, subsystems=None):
+    """Muda o nível padrão e/ou os níveis por subsistema e recalcula os loggers."""
+    global _default_level
+    with _lock:
+        if level is not None:
+            _default_level = level
+        if subsystems is not None:
+            _subsystems.update(subsystems)
+        for logger in _loggers.values():
+            logger.threshold = _level_for(logger.name)
+
+
+def parse_spec(spec):
+    """'hw=DEBUG,ipc=info' -> {'hw': DEBUG, 'ipc': INFO}."""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.strip().partition("=")
+        if not name:
+            continue
+        level = level.strip().upper() or "DEBUG"
+        if level not in NAME_LEVELS:
+            raise ValueError(f"Nível de log desconhecido: {level}")
+        levels[name.strip()] = NAME_LEVELS[level]
+    return levels
@@ -0,0 +1,258 @@
+"""
+Gravação assíncrona de log e traces de entrada em arquivos rotacionados.
+
+As threads de entrada só fazem `deque.append` (atômico no CPython, sem
+lock); uma thread própria acorda a cada `interval` segundos, esvazia a
+fila, formata os registros e grava cada lote com um único `os.writev`. Os
+arquivos ficam em ~/.cache/spotpress/:
+
+    spotpress.log   2026-10-19 14:03:11.204 DEBUG hw.BaseusOrangeDotAI [...] - DO ACTION -> OK
+    trace.jsonl     {"t": 1760893391.204, "device": "BaseusOrangeDotAI",
+                     "token": "OK", "mode": 2, "latency_us": 41.7}
+
+Quando um arquivo passa de `max_bytes` ele vira .1 (o .1 vira .2, ...) e
+um novo é aberto. Se a fila passar de `max_pending` registros (disco
+travado, por exemplo) os novos são descartados e contados em `dropped`.
+
+Falhas de gravação vão para o logger "logwriter" (no máximo uma a cada
+`ERROR_INTERVAL` segundos); o próprio gravador ignora essas mensagens, para
+não enfileirar de novo o erro que não consegue gravar.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from spotpress.logger import get_logger
+
+_logger = get_logger("logwriter")
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "spotpress")
+LOG_FILE = "spotpress.log"
+TRACE_FILE = "trace.jsonl"
+
+KIND_LOG = 0
+KIND_TRACE = 1
+
+try:
+    IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+
+class RotatingFile:
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backups=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.rotations = 0
+        self._open()
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self.size = os.fstat(self._fd).st_size
+
+    def write_batch(self, chunks):
+        """Grava `chunks` (bytes) com writev, rotacionando ao passar do limite."""
+        start = 0
+        while start < len(chunks):
+            end = start
+            size = 0
+            # Cada writev vai até IOV_MAX pedaços ou até encher o arquivo atual
+            while end < len(chunks) and end - start < IOV_MAX:
+                size += len(chunks[end])
+                end += 1
+                if self.size + size >= self.max_bytes:
+                    break
+            self._writev(chunks[start:end])
+            self.size += size
+            start = end
+            if self.size >= self.max_bytes:
+                self.rotate()
+
+    def _writev(self, chunks):
+        while chunks:
+            written = os.writev(self._fd, chunks)
+            # Escrita parcial: descarta o que já foi e continua do meio
+            while chunks and written >= len(chunks[0]):
+                written -= len(chunks[0])
+                chunks = chunks[1:]
+            if chunks and written:
+                chunks = [chunks[0][written:]] + chunks[1:]
+
+    def rotate(self):
+        os.close(self._fd)
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.unlink(self.path)
+        self.rotations += 1
+        self._open()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class LogWriter:
+    BATCH_SIZE = 4096
+    ERROR_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        directory=DEFAULT_DIR,
+        max_bytes=5 * 1024 * 1024,
+        backups=3,
+        interval=0.25,
+        max_pending=200_000,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._log_file = RotatingFile(
+            os.path.join(directory, LOG_FILE), max_bytes, backups
+        )
+        self._trace_file = RotatingFile(
+            os.path.join(directory, TRACE_FILE), max_bytes, backups
+        )
+        self._queue = deque()
+        self._interval = interval
+        self._max_pending = max_pending
+        self._stop = threading.Event()
+        self._drained = threading.Event()
+        self.records = 0
+        self.batches = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self._error_reported = None
+        self._errors_suppressed = 0
+        self._thread = threading.Thread(target=self._run, daemon=True, name="log_writer")
+        self._thread.start()
+
+    # Chamados de qualquer thread; nunca bloqueiam
+
+    def log(self, text, level="INFO", subsystem=""):
+        """Mesma assinatura de um sink do spotpress.logger."""
+        if subsystem == "logwriter":
+            return
+        if len(self._queue) >= self._max_pending:
+            self.dropped += 1
+            return
+        self._queue.append((KIND_LOG, time.time(), level, subsystem, text))
+
+    def trace(self, device, token, mode, latency_us=None):
+        if len(self._queue) >= self._max_pending:
+            self.dropped += 1
+            return
+        self._queue.append((KIND_TRACE, time.time(), device, token, mode, latency_us))
+
+    # Thread de gravação
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self._drain()
+            self._drained.set()
+        self._drain()
+        self._drained.set()
+
+    def _drain(self):
+        while self._drain_batch():
+            pass
+
+    def _drain_batch(self):
+        queue = self._queue
+        logs = []
+        traces = []
+        popleft = queue.popleft
+        try:
+            # Lotes limitados, para que uma rajada não vire uma única
+            # escrita gigante (e para a memória dos lotes ficar limitada)
+            for _ in range(self.BATCH_SIZE):
+                record = popleft()
+                if record[0] == KIND_LOG:
+                    logs.append(self._format_log(record))
+                else:
+                    traces.append(self._format_trace(record))
+        except IndexError:
+            pass
+        try:
+            if logs:
+                self._log_file.write_batch(logs)
+                self.batches += 1
+            if traces:
+                self._trace_file.write_batch(traces)
+                self.batches += 1
+        except OSError as e:
+            self.write_errors += 1
+            self._report_error(e)
+        self.records += len(logs) + len(traces)
+        return len(logs) + len(traces) == self.BATCH_SIZE
+
+    def _report_error(self, error):
+        # Disco cheio ou sem permissão falha em todo lote: avisa uma vez por
+        # intervalo, com a contagem das falhas omitidas
+        now = time.monotonic()
+        if (
+            self._error_reported is not None
+            and now - self._error_reported < self.ERROR_INTERVAL
+        ):
+            self._errors_suppressed += 1
+            return
+        suppressed = self._errors_suppressed
+        self._error_reported = now
+        self._errors_suppressed = 0
+        if suppressed:
+            _logger.error(
+                "Falha ao gravar log em %s: %s (mais %d falhas omitidas)",
+                self.directory,
+                error,
+                suppressed,
+            )
+        else:
+            _logger.error("Falha ao gravar log em %s: %s", self.directory, error)
+
+    @staticmethod
+    def _format_log(record):
+        _, t, level, subsystem, text = record
+        timestamp = datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        return f"{timestamp} {level:5} {subsystem} {text}\n".encode(errors="replace")
+
+    @staticmethod
+    def _format_trace(record):
+        _, t, device, token, mode, latency_us = record
+        data = {"t": round(t, 6), "device": device, "token": token, "mode": mode}
+        if latency_us is not None:
+            data["latency_us"] = round(latency_us, 1)
+        return (json.dumps(data, default=str) + "\n").encode()
+
+    @property
+    def rotations(self):
+        return self._log_file.rotations + self._trace_file.rotations
+
+    @property
+    def pending(self):
+        return len(self._queue)
+
+    def flush(self, timeout=5.0):
+        """Espera a fila esvaziar e o último lote ser gravado."""
+        deadline = time.monotonic() + timeout
+        while True:
+            self._drained.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._drained.wait(remaining):
+                return False
+            if not self._queue:
+                return True
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(5)
+        self._log_file.close()
+        self._trace_file.close()
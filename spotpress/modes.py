@@ -0,0 +1,58 @@
+"""
+Tabelas de modos e nome do socket de controle.
+
+Sem dependências além da stdlib: é importado pelo spotpressctl, que não
+deve carregar Qt nem uinput.
+"""
+
+import enum
+import getpass
+
+MODE_MOUSE = 0
+MODE_SPOTLIGHT = 1
+MODE_LASER = 2
+MODE_PEN = 3
+MODE_MAG_GLASS = 4
+
+
+MODE_MAP = {
+    MODE_MOUSE: "Mouse",
+    MODE_SPOTLIGHT: "Spotlight",
+    MODE_LASER: "Laser",
+    MODE_PEN: "Marcador",
+    MODE_MAG_GLASS: "Lente",
+}
+
+
+class Mode(enum.Enum):
+    MOUSE = MODE_MOUSE
+    SPOTLIGHT = MODE_SPOTLIGHT
+    LASER = MODE_LASER
+    PEN = MODE_PEN
+    MAG_GLASS = MODE_MAG_GLASS
+
+
+MODES_CMD_LINE_MAP = {
+    "mouse": 0,
+    "0": 0,
+    "spotlight": 1,
+    "1": 1,
+    "laser": 2,
+    "2": 2,
+    "pen": 3,
+    "3": 3,
+    "mag_glass": 4,
+    "4": 4,
+}
+
+# Nome usado na linha de comando para cada modo
+MODE_CMD_NAMES = {v: k for k, v in MODES_CMD_LINE_MAP.items() if not k.isdigit()}
+
+# Reverter MODE_MAP para obter nome -> valor
+MODE_NAME_TO_ID = {v: k for k, v in MODE_MAP.items()}
+
+# Lista default com todos habilitados
+DEFAULT_MODES = [(name, True) for name in MODE_NAME_TO_ID.keys()]
+
+
+SOCKET_NAME = f"spotpress_socket_{getpass.getuser()}"
@@ -12,6 +12,7 @@ try:
         QObject,
         QThread,
         QMetaObject,
+        QModelIndex,
         Q_ARG,
     )
     from PyQt6.QtNetwork import QLocalServer, QLocalSocket
@@ -25,6 +26,7 @@ try:
         QVBoxLayout,
         QHBoxLayout,
         QTextEdit,
+        QPlainTextEdit,
         QFileDialog,
         QMessageBox,
         QSystemTrayIcon,
@@ -62,6 +64,7 @@ try:
         QImage,
         QGuiApplication,
         QFontMetrics,
+        QRegion,
     )
 
     Qt_ConnectionType_QueuedConnection = Qt.ConnectionType.QueuedConnection
@@ -130,6 +133,7 @@ try:
     Qt_WindowType_X11BypassWindowManagerHint = Qt.WindowType.X11BypassWindowManagerHint
     Qt_WindowType_FramelessWindowHint = Qt.WindowType.FramelessWindowHint
     Qt_WindowType_WindowMinimizeButtonHint = Qt.WindowType.WindowMinimizeButtonHint
+    Qt_WindowType_WindowTransparentForInput = Qt.WindowType.WindowTransparentForInput
 
     Qt_WidgetAttribute_WA_TranslucentBackground = (
         Qt.WidgetAttribute.WA_TranslucentBackground
@@ -144,6 +148,10 @@ try:
     Qt_BrushStyle_NoBrush = Qt.BrushStyle.NoBrush
     Qt_PenJoinStyle_RoundJoin = Qt.PenJoinStyle.RoundJoin
     QPainter_Antialiasing = QPainter.RenderHint.Antialiasing
+    QPainter_SmoothPixmapTransform = QPainter.RenderHint.SmoothPixmapTransform
+    Qt_IgnoreAspectRatio = Qt.AspectRatioMode.IgnoreAspectRatio
+    Qt_SmoothTransformation = Qt.TransformationMode.SmoothTransformation
+    QImage_Format_RGB32 = QImage.Format.Format_RGB32
 
     QSystemTrayIcon_Trigger = QSystemTrayIcon.ActivationReason.Trigger
     QSystemTrayIcon_DoubleClick = QSystemTrayIcon.ActivationReason.DoubleClick
@@ -173,6 +181,7 @@ except ImportError:
         QTimer,
         QRect,
         QRectF,
+        QModelIndex,
         Q_ARG,
     )
     from PyQt5.QtNetwork import QLocalServer, QLocalSocket  # pyright: ignore
@@ -191,6 +200,7 @@ except ImportError:
         QVBoxLayout,
         QHBoxLayout,
         QTextEdit,
+        QPlainTextEdit,
         QFileDialog,
         QMessageBox,
         QSystemTrayIcon,
@@ -223,6 +233,7 @@ except ImportError:
         QClipboard,
         QImage,
         QFontMetrics,
+        QRegion,
     )
 
     Qt_ConnectionType_QueuedConnection = Qt.QueuedConnection
@@ -248,6 +259,7 @@ except ImportError:
     Qt_WindowType_X11BypassWindowManagerHint = Qt.X11BypassWindowManagerHint
     Qt_WindowType_FramelessWindowHint = Qt.FramelessWindowHint
     Qt_WindowType_WindowMinimizeButtonHint = Qt.WindowMinimizeButtonHint
+    Qt_WindowType_WindowTransparentForInput = Qt.WindowTransparentForInput
 
     Qt_WidgetAttribute_WA_TranslucentBackground = Qt.WA_TranslucentBackground
     Qt_WidgetAttribute_WA_ShowWithoutActivating = Qt.WA_ShowWithoutActivating
@@ -297,6 +309,10 @@ except ImportError:
     Qt_BrushStyle_NoBrush = Qt.NoBrush
     Qt_PenJoinStyle_RoundJoin = Qt.RoundJoin
     QPainter_Antialiasing = QPainter.Antialiasing
+    QPainter_SmoothPixmapTransform = QPainter.SmoothPixmapTransform
+    Qt_IgnoreAspectRatio = Qt.IgnoreAspectRatio
+    Qt_SmoothTransformation = Qt.SmoothTransformation
+    QImage_Format_RGB32 = QImage.Format_RGB32
 
     Qt_WindowMinimizeButtonHint = Qt.WindowMinimizeButtonHint
 
@@ -334,6 +350,7 @@ __all__ = [
     "QVBoxLayout",
     "QHBoxLayout",
     "QTextEdit",
+    "QPlainTextEdit",
     "QFileDialog",
     "QMessageBox",
     "QListWidget",
@@ -344,6 +361,7 @@ __all__ = [
     "QComboBox",
     "QListWidgetItem",
     "QFontMetrics",
+    "QRegion",
     "QSizePolicy_Fixed",
     "QSizePolicy_Preferred",
     "QPainter_CompositionMode_Clear",
@@ -360,6 +378,10 @@ __all__ = [
     "QIcon",
     "QPixmap",
     "QImage",
+    "QImage_Format_RGB32",
+    "QPainter_SmoothPixmapTransform",
+    "Qt_IgnoreAspectRatio",
+    "Qt_SmoothTransformation",
     "QColor",
     "QFont",
     "QPainter",
@@ -2,6 +2,7 @@ import time
 from spotpress.qtcompat import (
     QApplication,
     QPainter_Antialiasing,
+    QPainter_SmoothPixmapTransform,
     QPainter_CompositionMode_Clear,
     QPainter_CompositionMode_Source,
     QWidget,
@@ -19,6 +20,7 @@ from spotpress.qtcompat import (
     QRectF,
     QPoint,
     QPixmap,
+    QRegion,
     Qt_BlankCursor,
     Qt_BrushStyle_NoBrush,
     Qt_Color_Transparent,
@@ -38,6 +40,7 @@ from spotpress.qtcompat import (
     Qt_WindowType_FramelessWindowHint,
     Qt_WindowType_Tool,
     Qt_WindowType_WindowStaysOnTopHint,
+    Qt_WindowType_WindowTransparentForInput,
     Qt_WindowType_X11BypassWindowManagerHint,
 )
 
@@ -48,16 +51,40 @@ from .utils import (
     SHADE_COLORS,
     apply_blur,
     capture_monitor_screenshot,
+    get_screen_and_geometry,
     MODE_SPOTLIGHT,
     MODE_PEN,
     MODE_LASER,
     MODE_MAG_GLASS,
     MODE_MOUSE,
 )
+from collections import deque
+
+from .capture import ScreenGeometry, get_backend, open_backend
+from .framestats import FrameStats, WakeupCounter
+from .livecapture import LiveCapture
+from .logger import get_logger
+from .tilecache import TileCache
 
 
 DEBUG = True
 
+# Depois da troca de slide, espera o programa redesenhar antes de
+# recapturar os tiles (os antigos continuam na lente até lá)
+SLIDE_SETTLE_MS = 150
+# Quadros em que a lente já pintada pode continuar na tela (atraso do
+# compositor): os tiles do anel não são capturados debaixo dela
+PAINTED_HISTORY = 4
+# Folga da captura ao vivo em volta da origem da lente, para o cursor
+# andar um pouco entre duas capturas
+LIVE_MARGIN = 16
+# Filtros da ampliação da lupa; o Qt só tem esses dois para ampliar (o
+# "smooth" de versões anteriores era bilinear e vale como tal)
+FILTER_NEAREST = "nearest"
+FILTER_BILINEAR = "bilinear"
+
+_logger = get_logger("overlay")
+
 
 class SpotlightOverlayWindow(QWidget):
 
@@ -98,8 +125,33 @@ class SpotlightOverlayWindow(QWidget):
         self.drawing = False  # Se está atualmente desenhando
         self.current_line_width = 3
 
+        # Tiles em volta do cursor para a lupa e o laser invertido; os que o
+        # overlay cobre são capturados com ele excluído, sem deixar de desenhar
+        self.tiles = TileCache(
+            self._grab_tile,
+            QRect(0, 0, screen_geometry.width(), screen_geometry.height()),
+        )
+        self._tiles_geometry = QRect(screen_geometry)
+        self._painted_rects = deque(maxlen=PAINTED_HISTORY)
+        # A exclusão falhou com o overlay visível: até o próximo show fica
+        # no screenshot do monitor inteiro
+        self._tiles_failed = False
+        self._slide_settle_timer = QTimer(self)
+        self._slide_settle_timer.setSingleShot(True)
+        self._slide_settle_timer.timeout.connect(self._refresh_tiles)
+        context.slideChanged.connect(self.invalidate_tiles)
+
+        # Lupa ao vivo: thread que recaptura a origem da lente por baixo
+        # do overlay; os tiles continuam como fundo enquanto não há quadro
+        self.live = None
+        self._live_stats = {}
+
         self.setGeometry(screen_geometry)
 
+        # Com always_capture o clear_pixmap() não faz nada: os screenshots
+        # existem desde o início, nulos até a primeira captura
+        self.pixmap = QPixmap()
+        self.blurred_pixmap = QPixmap()
         self._pixmap_cleared = False
         self.clear_pixmap()
 
@@ -107,10 +159,27 @@ class SpotlightOverlayWindow(QWidget):
 
         # self.cursor_pos = None  # Usado para exibir a caneta
 
-        # Timer de Atualização da Tela
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update)
-        self.timer.start(16)
+        # Duração e intervalo dos últimos quadros (consultado via IPC)
+        self.frame_stats = FrameStats()
+        self.wakeups = WakeupCounter()
+
+        # Timer de Atualização da Tela; só roda com a janela visível
+        # (showEvent/hideEvent)
+        self.timer = QTimer(self)
+        self.timer.setInterval(16)
+        self.timer.timeout.connect(self._on_frame_timer)
+
+        # Modo de alternância rápida: a janela fica mapeada e, "inerte", é
+        # reduzida a 1 pixel transparente em vez de ser escondida
+        self._dormant = False
+        # Momento do último pedido de exibição, até o primeiro quadro
+        self._show_requested = None
+        self.show_latency = deque(maxlen=32)
+
+        # Libera os screenshots depois de um tempo com o overlay oculto
+        self._release_timer = QTimer(self)
+        self._release_timer.setSingleShot(True)
+        self._release_timer.timeout.connect(self.release_buffers)
 
         self.center_screen = self.geometry().center()
 
@@ -157,11 +226,266 @@ class SpotlightOverlayWindow(QWidget):
             "general_always_capture", False
         ):
             return
-        self.pixmap = QPixmap(self.size())
-        self.pixmap.fill(Qt_Color_Transparent)
-        self.blurred_pixmap = QPixmap(self.size())
-        self.blurred_pixmap.fill(Qt_Color_Transparent)
+        # Pixmap nulo não desenha nada, como um transparente, sem alocar a tela
+        self.pixmap = QPixmap()
+        self.blurred_pixmap = QPixmap()
+        self._pixmap_cleared = True
+
+    def release_buffers(self):
+        """Descarta os screenshots; quem mostra o overlay captura de novo."""
+        # Inerte a janela continua mapeada, mas não mostra nada
+        if (self.isVisible() and not self._dormant) or self._capturing_screenshot:
+            return
+        self.pixmap = QPixmap()
+        self.blurred_pixmap = QPixmap()
         self._pixmap_cleared = True
+        self.tiles.invalidate()
+
+    def buffers_bytes(self):
+        return self.tiles.bytes() + sum(
+            p.width() * p.height() * p.depth() // 8
+            for p in (self.pixmap, self.blurred_pixmap)
+        )
+
+    def tile_capture_enabled(self, mode=None):
+        config = self._ctx.config
+        if not config.get("general_capture_tiles", True) or config.get(
+            "general_always_capture", False
+        ):
+            return False
+        if self._tiles_failed or not get_backend(
+            config["general_capture_backend"]
+        ).can_exclude():
+            # Sem excluir o overlay não dá para capturar o que ele cobre:
+            # screenshot inteiro, capturado antes de mostrar
+            return False
+        mode = self._ctx.current_mode if mode is None else mode
+        if mode == MODE_MAG_GLASS:
+            # Blur e sombra cobrem a tela toda: precisam do screenshot inteiro
+            return int(config.get("magnify_background_mode", 2)) == 2
+        return mode == MODE_LASER and self.laser_inverted()
+
+    def _grab_tile(self, rect, exclude):
+        return capture_monitor_screenshot(
+            self._ctx.screen_index,
+            rect,
+            backend=self._ctx.config["general_capture_backend"],
+            exclude=int(self.winId()) if exclude else None,
+        )
+
+    def _tile_rects(self, cursor_pos):
+        """(área lida, área pintada) pelo modo atual."""
+        if self._ctx.current_mode == MODE_MAG_GLASS:
+            src_rect, dest_rect, _ = self._magnifier_rects(cursor_pos)
+            return src_rect, dest_rect
+        size = int(self._ctx.current_screen_height) * (
+            self._ctx.config["laser_dot_size"] / 100.0
+        )
+        reach = size // 2 + (12 if self._ctx.config["laser_reflection"] else 0) + 1
+        rect = QRect(
+            int(cursor_pos.x() - reach),
+            int(cursor_pos.y() - reach),
+            int(reach * 2) + 1,
+            int(reach * 2) + 1,
+        )
+        return rect, rect
+
+    def _prefetch_tiles(self):
+        needed, painted = self._tile_rects(self.mapFromGlobal(QCursor.pos()))
+        missing = self.tiles.prefetch(needed, painted, self._painted_rects)
+        if missing and not self._live_frame():
+            # Faltam tiles debaixo do que o overlay pinta: captura sem ele
+            self.tiles.fetch(missing, exclude=True)
+            if self.tiles.missing(needed):
+                self._fall_back_to_screenshot()
+
+    def _fall_back_to_screenshot(self):
+        # Exclusão falhou (lente sobre duas janelas, compositor encerrado):
+        # captura o monitor inteiro com o overlay oculto, uma vez até o
+        # próximo show
+        _logger.info("Captura sem o overlay falhou; usando o screenshot do monitor")
+        self._tiles_failed = True
+        self.tiles.invalidate()
+        self.capture_screenshot(show_after=True)
+        self.overlay_hidden = False
+
+    def _fetch_tiles_around_cursor(self):
+        _, painted = self._tile_rects(self.mapFromGlobal(QCursor.pos()))
+        margin = self.tiles.tile_size
+        # Mapeada (visível ou inerte), a janela fica de fora da captura
+        self.tiles.fetch(
+            self.tiles.missing(painted.adjusted(-margin, -margin, margin, margin)),
+            exclude=self.isVisible(),
+        )
+        self.update()
+
+    def invalidate_tiles(self, step=0):
+        if self.is_overlay_actually_visible() and self.tile_capture_enabled():
+            self._slide_settle_timer.start(SLIDE_SETTLE_MS)
+        else:
+            self.tiles.invalidate()
+
+    def _refresh_tiles(self):
+        self.tiles.invalidate()
+        if not self.tile_capture_enabled():
+            return
+        self._fetch_tiles_around_cursor()
+        needed, _ = self._tile_rects(self.mapFromGlobal(QCursor.pos()))
+        if self.tiles.missing(needed):
+            self._fall_back_to_screenshot()
+
+    def _sync_tile_bounds(self):
+        # Mudou de monitor ou de resolução: os tiles não valem mais
+        if self.geometry() != self._tiles_geometry:
+            self._tiles_geometry = QRect(self.geometry())
+            self.tiles.bounds = QRect(QPoint(0, 0), self.size())
+            self.tiles.invalidate()
+
+    def moveEvent(self, event):
+        self._sync_tile_bounds()
+        super().moveEvent(event)
+
+    def resizeEvent(self, event):
+        self._sync_tile_bounds()
+        super().resizeEvent(event)
+
+    def live_capture_enabled(self):
+        return (
+            self._ctx.current_mode == MODE_MAG_GLASS
+            and self._ctx.config.get("magnify_live", False)
+            and self.tile_capture_enabled()
+        )
+
+    def _sync_live_capture(self):
+        fps = int(self._ctx.config.get("magnify_live_fps", 30))
+        if self.live is not None and (
+            not self.live_capture_enabled() or self.live.fps != fps
+        ):
+            self._stop_live_capture()
+        if self.live is None and self.live_capture_enabled():
+            self._start_live_capture(fps)
+        # Uma thread que desistiu (capturas nulas seguidas) fica parada até
+        # o próximo show ou troca de modo, que descartam self.live
+        if self.live is not None and self.live.running:
+            src_rect, _, _ = self._magnifier_rects(self.mapFromGlobal(QCursor.pos()))
+            self.live.request(
+                src_rect.adjusted(-LIVE_MARGIN, -LIVE_MARGIN, LIVE_MARGIN, LIVE_MARGIN)
+            )
+
+    def _start_live_capture(self, fps):
+        # live_capture_enabled já exige um backend que exclua o overlay
+        name = self._ctx.config["general_capture_backend"]
+        screen, _ = get_screen_and_geometry(self._ctx.screen_index)
+        self.live = LiveCapture(
+            lambda: open_backend(name),
+            ScreenGeometry.from_screen(screen),
+            int(self.winId()),
+            fps,
+        )
+        self.live.start()
+
+    def _stop_live_capture(self):
+        if self.live is not None:
+            self.live.stop()
+            self._live_stats = self.live.stats()
+            self.live = None
+
+    def _live_frame(self):
+        # Parada, o último quadro já não acompanha a tela: fica nos tiles
+        if self.live is None or not self.live.running:
+            return None
+        return self.live.latest()
+
+    def _source_region(self, rect):
+        if self.tile_capture_enabled():
+            return self.tiles.region(rect)
+        return self.pixmap.copy(rect)
+
+    def _on_frame_timer(self):
+        self.wakeups.tick()
+        if self.tile_capture_enabled() and not self._slide_settle_timer.isActive():
+            self._prefetch_tiles()
+        self._sync_live_capture()
+        self.update()
+
+    def _resume(self):
+        self._release_timer.stop()
+        self.timer.start()
+
+    def _suspend(self):
+        self.timer.stop()
+        self._stop_live_capture()
+        self._painted_rects.clear()
+        if self._slide_settle_timer.isActive():
+            # Oculto antes de recapturar: os tiles do slide anterior não valem
+            self._slide_settle_timer.stop()
+            self.tiles.invalidate()
+        delay = self._ctx.config.get("general_release_delay", 30)
+        if delay > 0:
+            self._release_timer.start(delay * 1000)
+
+    def showEvent(self, event):
+        if not self._dormant:
+            self._resume()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._suspend()
+        super().hideEvent(event)
+
+    def fast_toggle_enabled(self):
+        return self.auto_mode_enabled() and self._ctx.config.get(
+            "general_fast_toggle", True
+        )
+
+    def set_dormant(self, dormant):
+        """Inerte: mapeada, transparente, sem entrada e sem timer."""
+        if dormant == self._dormant:
+            return
+        self._dormant = dormant
+        if dormant:
+            self.setMask(QRegion(0, 0, 1, 1))
+            self._suspend()
+        else:
+            self.clearMask()
+            if self.isVisible():
+                self._resume()
+        self._set_input_transparent(dormant)
+        self.update()
+
+    def _set_input_transparent(self, transparent):
+        # Sem isso o pixel da máscara ainda recebe cliques. Na QWindow e não
+        # com QWidget.setWindowFlag, que pode recriar (desmapear) a janela
+        handle = self.windowHandle()
+        if handle is not None:
+            handle.setFlag(Qt_WindowType_WindowTransparentForInput, transparent)
+
+    def _show_full_screen(self):
+        self._show_requested = time.perf_counter()
+        self.set_dormant(False)
+        if not self.isVisible():
+            self.showFullScreen()
+
+    def stats(self):
+        """Estatísticas de quadros + estado do timer (consultado via IPC)."""
+        stats = self.frame_stats.snapshot()
+        stats["timer_active"] = self.timer.isActive()
+        stats["wakeups"] = self.wakeups.total
+        stats["wakeups_per_s"] = round(self.wakeups.rate(), 1)
+        stats["buffers_bytes"] = self.buffers_bytes()
+        stats["dormant"] = self._dormant
+        stats["tiles"] = len(self.tiles)
+        stats["tiles_bytes"] = self.tiles.bytes()
+        stats["tile_grabs"] = self.tiles.grabs
+        stats["tile_misses"] = self.tiles.misses
+        stats.update(self.live.stats() if self.live is not None else self._live_stats)
+        stats["live_active"] = self.live is not None and self.live.running
+        latency = sorted(self.show_latency)
+        stats["show_latency_p50_ms"] = (
+            round(latency[len(latency) // 2] * 1e3, 3) if latency else 0.0
+        )
+        stats["show_latency_max_ms"] = round(latency[-1] * 1e3, 3) if latency else 0.0
+        return stats
 
     def next_overlay_color(self, dir=1):
         new_index = self._ctx.config["shade_color_index"] + dir
@@ -198,7 +522,13 @@ class SpotlightOverlayWindow(QWidget):
     def hide_overlay(self):
         self.overlay_hidden = True
         self.clear_pixmap()
-        self.hide()
+        if self.fast_toggle_enabled() and self.isVisible() and (
+            not self._capturing_screenshot
+        ):
+            self.set_dormant(True)
+        else:
+            self.hide()
+            self.set_dormant(False)
 
     def is_overlay_actually_visible(self):
         return not self.overlay_hidden and self.isVisible()
@@ -215,17 +545,26 @@ class SpotlightOverlayWindow(QWidget):
         self._showing_overlay = True
         try:
             if not self.is_overlay_actually_visible():
+                self._tiles_failed = False
 
                 if self._ctx.current_mode == MODE_MAG_GLASS:
                     if self._ctx.config["magnify_zoom"] <= self.zoom_min:
                         self._ctx.config["magnify_zoom"] = self.zoom_min
 
-                    self.capture_screenshot(
-                        show_after=True,
-                        blur_level=self._ctx.config["magnify_background_blur_level"],
-                    )
+                    if self.tile_capture_enabled():
+                        self._show_with_tiles()
+                    else:
+                        self.capture_screenshot(
+                            show_after=True,
+                            blur_level=self._ctx.config[
+                                "magnify_background_blur_level"
+                            ],
+                        )
                 elif self._ctx.current_mode == MODE_LASER and self.laser_inverted():
-                    self.capture_screenshot(show_after=True)
+                    if self.tile_capture_enabled():
+                        self._show_with_tiles()
+                    else:
+                        self.capture_screenshot(show_after=True)
                 elif (
                     self._ctx.current_mode == MODE_SPOTLIGHT
                     and self._ctx.config["spotlight_background_mode"] == 0
@@ -240,12 +579,18 @@ class SpotlightOverlayWindow(QWidget):
                         self.capture_screenshot(show_after=True)
                     else:
                         self.clear_pixmap()
-                        self.showFullScreen()
+                        self._show_full_screen()
             self.update()
             self.overlay_hidden = False
         finally:
             self._showing_overlay = False
 
+    def _show_with_tiles(self):
+        # Com o overlay oculto nada cobre a tela: captura só em volta do cursor
+        self.clear_pixmap()
+        self._fetch_tiles_around_cursor()
+        self._show_full_screen()
+
     def set_auto_mode(self, enable=True):
         if not self._ctx.support_auto_mode:
             return
@@ -291,10 +636,12 @@ class SpotlightOverlayWindow(QWidget):
         if last_mode != new_mode and last_mode == MODE_MAG_GLASS:
             self.clear_pixmap()
         self._ctx.current_mode = new_mode
+        if not self.live_capture_enabled():
+            self._stop_live_capture()
         if new_mode == MODE_MOUSE:
             self.hide_overlay()
         else:
-            if new_mode == MODE_MAG_GLASS:
+            if new_mode == MODE_MAG_GLASS and not self.tile_capture_enabled():
                 self.capture_screenshot()
             if (
                 new_mode == MODE_SPOTLIGHT
@@ -355,7 +702,7 @@ class SpotlightOverlayWindow(QWidget):
         self._ctx.config["laser_color_index"] = (
             self._ctx.config["laser_color_index"] + step
         ) % len(LASER_COLORS)
-        if self.laser_inverted():
+        if self.laser_inverted() and not self.tile_capture_enabled(MODE_LASER):
             self.capture_screenshot(show_after=True)
         else:
             self.clear_pixmap()
@@ -399,7 +746,10 @@ class SpotlightOverlayWindow(QWidget):
             time.sleep(0.5)  # aguardar atualização da tela
 
             # Captura a tela limpa usando seu método externo
-            qimage = capture_monitor_screenshot(self._ctx.screen_index)
+            qimage = capture_monitor_screenshot(
+                self._ctx.screen_index,
+                backend=self._ctx.config["general_capture_backend"],
+            )
 
             pixmap = QPixmap.fromImage(qimage)
 
@@ -413,15 +763,15 @@ class SpotlightOverlayWindow(QWidget):
 
             # Mostra a janela overlay novamente se foi ocultada
             if show_after:
-                self.showFullScreen()
+                self._show_full_screen()
         finally:
             self._capturing_screenshot = False
 
-    def drawMagnifyingGlass(self, painter, cursor_pos):
+    def _magnifier_rects(self, cursor_pos):
+        """(origem ampliada, lente, elipse?) em coordenadas do overlay."""
         radius = int(self._ctx.current_screen_height) * (
             self._ctx.config["magnify_size"] / 100.0
         )
-        PADDING = 100
 
         shape = self._ctx.config["magnify_shape"].lower()
         if shape == "rectangle":
@@ -434,6 +784,26 @@ class SpotlightOverlayWindow(QWidget):
 
         zoom = self._ctx.config["magnify_zoom"]
 
+        src_width = int(width / zoom)
+        src_height = int(height / zoom)
+        src_rect = QRect(
+            cursor_pos.x() - src_width // 2,
+            cursor_pos.y() - src_height // 2,
+            src_width,
+            src_height,
+        )
+
+        dest_rect = QRect(
+            int(cursor_pos.x() - width // 2),
+            int(cursor_pos.y() - height // 2),
+            int(width),
+            int(height),
+        )
+        return src_rect, dest_rect, is_ellipse
+
+    def drawMagnifyingGlass(self, painter, cursor_pos):
+        src_rect, dest_rect, is_ellipse = self._magnifier_rects(cursor_pos)
+
         bg_mode = int(self._ctx.config.get("magnify_background_mode", 2))
 
         if bg_mode == 0:  # Blur
@@ -450,28 +820,39 @@ class SpotlightOverlayWindow(QWidget):
             painter.drawPixmap(0, 0, self.pixmap)
 
         # Área nítida (ampliada)
-        padded_pixmap = QPixmap(
-            self.pixmap.width() + PADDING * 2, self.pixmap.height() + PADDING * 2
-        )
-        padded_pixmap.fill(Qt_Color_Transparent)
-        painter_pad = QPainter(padded_pixmap)
-        painter_pad.drawPixmap(PADDING, PADDING, self.pixmap)
-        painter_pad.end()
-
-        cursor_pos_padded = QPoint(cursor_pos.x() + PADDING, cursor_pos.y() + PADDING)
-
-        src_width = int(width / zoom)
-        src_height = int(height / zoom)
-        x = cursor_pos_padded.x() - src_width // 2
-        y = cursor_pos_padded.y() - src_height // 2
-        src_rect = QRect(x, y, src_width, src_height)
-
-        dest_rect = QRect(
-            int(cursor_pos.x() - width // 2),
-            int(cursor_pos.y() - height // 2),
-            int(width),
-            int(height),
-        )
+        mag_filter = self._ctx.config.get("magnify_filter", FILTER_BILINEAR).lower()
+        if self.tile_capture_enabled():
+            source = self.tiles.region(src_rect)
+            live = self._live_frame()
+            if live is not None:
+                # Quadro ao vivo por cima dos tiles (que cobrem a folga
+                # quando o cursor anda mais rápido que a captura)
+                image, rect = live
+                painter_live = QPainter(source)
+                painter_live.drawImage(rect.topLeft() - src_rect.topLeft(), image)
+                painter_live.end()
+            source_rect = QRectF(source.rect())
+            target = QRectF(dest_rect)
+        else:
+            # Direto do screenshot; a parte da origem fora do monitor fica
+            # transparente, como antes
+            source = self.pixmap
+            dpr = source.devicePixelRatio()
+            clipped = src_rect.intersected(QRect(QPoint(0, 0), self.size()))
+            scale_x = dest_rect.width() / max(1, src_rect.width())
+            scale_y = dest_rect.height() / max(1, src_rect.height())
+            source_rect = QRectF(
+                clipped.x() * dpr,
+                clipped.y() * dpr,
+                clipped.width() * dpr,
+                clipped.height() * dpr,
+            )
+            target = QRectF(
+                dest_rect.x() + (clipped.x() - src_rect.x()) * scale_x,
+                dest_rect.y() + (clipped.y() - src_rect.y()) * scale_y,
+                clipped.width() * scale_x,
+                clipped.height() * scale_y,
+            )
 
         # Clip da lente
         if is_ellipse:
@@ -480,7 +861,10 @@ class SpotlightOverlayWindow(QWidget):
             painter.setClipPath(clip_path)
 
         # Desenha a lente ampliada (sem blur)
-        painter.drawPixmap(dest_rect, padded_pixmap, src_rect)
+        smooth = mag_filter != FILTER_NEAREST
+        painter.setRenderHint(QPainter_SmoothPixmapTransform, smooth)
+        painter.drawPixmap(target, source, source_rect)
+        painter.setRenderHint(QPainter_SmoothPixmapTransform, False)
 
         if is_ellipse:
             painter.setClipping(False)
@@ -590,7 +974,7 @@ class SpotlightOverlayWindow(QWidget):
                 int(size),
             )
 
-            region = self.pixmap.copy(laser_rect)
+            region = self._source_region(laser_rect)
             image = region.toImage()
             image.invertPixels()
             inverted_pixmap = QPixmap.fromImage(image)
@@ -614,7 +998,7 @@ class SpotlightOverlayWindow(QWidget):
                     )
 
                     # Recorta e inverte a imagem da região
-                    region = self.pixmap.copy(outer_rect)
+                    region = self._source_region(outer_rect)
                     image = region.toImage()
                     image.invertPixels()
                     inverted = QPixmap.fromImage(image)
@@ -709,6 +1093,12 @@ class SpotlightOverlayWindow(QWidget):
         self.draw_pen_tip(painter, cursor_pos, size=self.current_line_width * 4)
 
     def paintEvent(self, event):
+        if self._dormant:
+            return
+        start = time.perf_counter()
+        if self._show_requested is not None:
+            self.show_latency.append(start - self._show_requested)
+            self._show_requested = None
         painter = QPainter(self)
         cursor_pos = self.mapFromGlobal(QCursor.pos())
         # Fundo: sempre desenha o screenshot completo
@@ -721,6 +1111,10 @@ class SpotlightOverlayWindow(QWidget):
             self.drawLines(painter, cursor_pos)
         elif self._ctx.current_mode == MODE_MAG_GLASS:
             self.drawMagnifyingGlass(painter, cursor_pos)
+        painter.end()
+        if self.tile_capture_enabled():
+            self._painted_rects.append(self._tile_rects(cursor_pos)[1])
+        self.frame_stats.record(start, time.perf_counter())
 
     def draw_pen_tip(self, painter, pos, size=20):
         # Pontos do SVG com a ponta em (0, 0)
@@ -0,0 +1,115 @@
+"""
+Ligações declarativas entre chaves do ConfigStore e widgets.
+
+Cada ligação sabe ler e escrever o widget e converter o valor nos dois
+sentidos. Mudanças vindas da configuração são aplicadas com os sinais do
+widget bloqueados (sem eco de volta); mudanças feitas pelo usuário gravam
+só a chave do widget alterado.
+"""
+
+from collections import namedtuple
+
+
+def _identity(value):
+    return value
+
+
+Binding = namedtuple(
+    "Binding", "key widget getter setter signal to_widget from_widget"
+)
+
+
+class BindingRegistry:
+    def __init__(self, store, enabled=None):
+        self._store = store
+        self._bindings = {}
+        # Função que diz se a UI já pode gravar na configuração
+        self._enabled = enabled or (lambda: True)
+        self.applied = 0
+        self.written = 0
+
+    def bind(
+        self,
+        key,
+        widget,
+        getter,
+        setter,
+        signal,
+        to_widget=_identity,
+        from_widget=_identity,
+    ):
+        binding = Binding(key, widget, getter, setter, signal, to_widget, from_widget)
+        self._bindings[key] = binding
+        signal.connect(lambda *_: self._write_back(binding))
+        return binding
+
+    # Atalhos para os widgets usados nas preferências
+
+    def bind_spin(self, key, spin):
+        return self.bind(key, spin, spin.value, spin.setValue, spin.valueChanged, int)
+
+    def bind_check(self, key, check):
+        return self.bind(
+            key, check, check.isChecked, check.setChecked, check.toggled, bool
+        )
+
+    def bind_index(self, key, combo):
+        return self.bind(
+            key,
+            combo,
+            combo.currentIndex,
+            combo.setCurrentIndex,
+            combo.currentIndexChanged,
+            int,
+        )
+
+    def bind_text(self, key, combo):
+        return self.bind(
+            key,
+            combo,
+            combo.currentText,
+            combo.setCurrentText,
+            combo.currentIndexChanged,
+            str,
+        )
+
+    def __contains__(self, key):
+        return key in self._bindings
+
+    def keys(self):
+        return self._bindings.keys()
+
+    def get(self, key):
+        return self._bindings.get(key)
+
+    def write(self, key):
+        """Grava o valor atual do widget; para sinais além do da ligação."""
+        self._write_back(self._bindings[key])
+
+    def _write_back(self, binding):
+        if not self._enabled():
+            return
+        self._store[binding.key] = binding.from_widget(binding.getter())
+        self.written += 1
+
+    def apply(self, changes):
+        """Leva um conjunto de mudanças da configuração para os widgets."""
+        for key, value in changes.items():
+            binding = self._bindings.get(key)
+            if binding is None:
+                continue
+            value = binding.to_widget(value)
+            if binding.getter() == value:
+                continue
+            blocked = binding.widget.blockSignals(True)
+            try:
+                binding.setter(value)
+            finally:
+                binding.widget.blockSignals(blocked)
+            self.applied += 1
+
+    def write_all(self):
+        """Grava o estado atual de todos os widgets num único conjunto."""
+        with self._store.batch():
+            for binding in self._bindings.values():
+                self._store[binding.key] = binding.from_widget(binding.getter())
@@ -1,26 +1,68 @@
-from datetime import datetime
+from spotpress.logbuffer import LEVELS, LogBuffer, format_record
 from spotpress.qtcompat import (
     QApplication,
     QWidget,
     QPushButton,
     QVBoxLayout,
     QHBoxLayout,
-    QTextEdit,
+    QPlainTextEdit,
+    QComboBox,
+    QLabel,
     QFileDialog,
     QMessageBox,
+    QTimer,
 )
 
+LOG_CAPACITY = 5000
+LOG_FLUSH_MS = 100
+ALL_DEVICES = "Todos"
+
 
 class LogTab(QWidget):
-    def __init__(self, parent, ctx):
+    def __init__(self, parent, ctx, capacity=LOG_CAPACITY):
         super().__init__(parent)
         self._ctx = ctx
+        # Pode ser alimentado de qualquer thread; a aba só lê no timer
+        self.buffer = LogBuffer(capacity)
+        self._known_devices = set()
+        self.flushes = 0
         self.init_ui()
 
+        # Só roda com a aba visível; oculta, as mensagens esperam no buffer
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(LOG_FLUSH_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def showEvent(self, event):
+        self.flush()
+        self._flush_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._flush_timer.stop()
+        super().hideEvent(event)
+
     def init_ui(self):
         layout = QVBoxLayout()
-        self.log_text = QTextEdit()
+
+        filter_layout = QHBoxLayout()
+        self.level_combo = QComboBox()
+        self.level_combo.addItems(LEVELS)
+        self.level_combo.setCurrentText("DEBUG")
+        self.device_combo = QComboBox()
+        self.device_combo.addItem(ALL_DEVICES)
+        filter_layout.addWidget(QLabel("Nível:"))
+        filter_layout.addWidget(self.level_combo)
+        filter_layout.addWidget(QLabel("Dispositivo:"))
+        filter_layout.addWidget(self.device_combo)
+        filter_layout.addStretch()
+        self.level_combo.currentIndexChanged.connect(self.refilter)
+        self.device_combo.currentIndexChanged.connect(self.refilter)
+        layout.addLayout(filter_layout)
+
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(self.buffer.capacity)
         layout.addWidget(self.log_text)
         button_layout = QHBoxLayout()
         save_btn = QPushButton("Save Log...")
@@ -39,12 +81,62 @@ class LogTab(QWidget):
         layout.addLayout(button_layout)
         self.setLayout(layout)
 
-    def append_log_message(self, message: str):
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        # timestamp = f"{time.time():.3f}"
-        self.log_text.append(f"{timestamp} - {message}")
+    def append_log_message(self, message: str, level=None):
+        # Só guarda; o texto vai para o widget no próximo flush
+        self.buffer.append(message, level)
+
+    def current_filter(self):
+        device = self.device_combo.currentText()
+        return self.level_combo.currentText(), (
+            "" if device == ALL_DEVICES else device
+        )
+
+    def _accepts(self, record, min_level, device):
+        return LEVELS.index(record.level) >= min_level and (
+            not device or record.device == device
+        )
+
+    def flush(self):
+        records = self.buffer.drain()
+        if not records:
+            return
+        self._update_devices(records)
+        level, device = self.current_filter()
+        min_level = LEVELS.index(level)
+        lines = [
+            format_record(r) for r in records if self._accepts(r, min_level, device)
+        ]
+        if lines:
+            # Um único append por lote; o excedente seria descartado pelo
+            # limite de blocos de qualquer forma
+            self.log_text.appendPlainText("\n".join(lines[-self.buffer.capacity :]))
+            self.flushes += 1
+
+    def _update_devices(self, records):
+        new = {r.device for r in records if r.device} - self._known_devices
+        if not new:
+            return
+        self._known_devices |= new
+        blocked = self.device_combo.blockSignals(True)
+        try:
+            for name in sorted(new):
+                self.device_combo.addItem(name)
+        finally:
+            self.device_combo.blockSignals(blocked)
+
+    def refilter(self, *_):
+        """Redesenha o widget a partir do buffer com o filtro atual."""
+        # O que ainda não passou pelo flush pode trazer dispositivos novos
+        self._update_devices(self.buffer.drain())
+        level, device = self.current_filter()
+        self.log_text.setPlainText(
+            "\n".join(format_record(r) for r in self.buffer.records(level, device))
+        )
+        scrollbar = self.log_text.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
 
     def on_clear_log_clicked(self):
+        self.buffer.clear()
         self.log_text.clear()
 
     def on_save_log_clicked(self):
@@ -54,15 +146,16 @@ class LogTab(QWidget):
         if filename:
             try:
                 with open(filename, "w", encoding="utf-8") as file:
-                    file.write(self.log_text.toPlainText())
+                    self.buffer.write_to(file, *self.current_filter())
             except Exception as e:
                 QMessageBox.critical(
                     self, "Erro ao salvar", f"Não foi possível salvar o log:\n{e}"
                 )
 
     def on_copy_to_clipboard_clicked(self):
-        if not self.log_text.toPlainText().strip():
+        text = "".join(self.buffer.lines(*self.current_filter()))
+        if not text.strip():
             QMessageBox.information(self, "Sem conteúdo", "O log está vazio.")
             return
         clipboard = QApplication.clipboard()
-        clipboard.setText(self.log_text.toPlainText())  # pyright: ignore
+        clipboard.setText(text)  # pyright: ignore
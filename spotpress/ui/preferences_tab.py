@@ -30,6 +30,9 @@ from spotpress.qtcompat import (
     Qt_ItemFlag_ItemIsUserCheckable,
     Qt_ItemFlag_NoItemFlags,
 )
+from spotpress import logger
+from spotpress.capture import get_backend as get_capture_backend
+from spotpress.ui.bindings import BindingRegistry
 from spotpress.utils import (
     DEFAULT_MODES,
     LASER_COLORS,
@@ -80,24 +83,19 @@ class PreferencesTab(QWidget):
         self.spotlight_shape = QComboBox()
         self.spotlight_shape.addItem("Elipse")
         self.spotlight_shape.addItem("Rectangle")
-        self.spotlight_shape.currentIndexChanged.connect(self.update_context_config)
         self.spotlight_size = QSpinBox()
         self.spotlight_size.setMaximum(99)
         self.spotlight_size.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
-        self.spotlight_size.valueChanged.connect(self.update_context_config)
         self.spotlight_border = QCheckBox("Border")
-        self.spotlight_border.stateChanged.connect(self.update_context_config)
 
         self.spotlight_bg_mode = QComboBox()
         self.spotlight_bg_mode.addItem("Blur")
         self.spotlight_bg_mode.addItem("Shade")
 
-        self.spotlight_bg_mode.currentIndexChanged.connect(self.update_context_config)
 
         self.spotlight_bg_blur = QSpinBox()
         self.spotlight_bg_blur.setMaximum(20)
         self.spotlight_bg_blur.setMinimum(1)
-        self.spotlight_bg_blur.valueChanged.connect(self.update_context_config)
 
         spotlight_bg_mode = QHBoxLayout()
         spotlight_bg_mode.addWidget(QLabel("Background mode:"))
@@ -123,19 +121,15 @@ class PreferencesTab(QWidget):
 
         self.magnify_shape.addItem("Elipse")
         self.magnify_shape.addItem("Rectangle")
-        self.magnify_shape.currentIndexChanged.connect(self.update_context_config)
         self.magnify_size = QSpinBox()
         self.magnify_size.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
-        self.magnify_size.valueChanged.connect(self.update_context_config)
         self.magnify_border = QCheckBox("Border")
-        self.magnify_border.stateChanged.connect(self.update_context_config)
 
         self.magnify_bg_mode = QComboBox()
         self.magnify_bg_mode.addItem("Blur")
         self.magnify_bg_mode.addItem("Shade")
         self.magnify_bg_mode.addItem("None")
 
-        self.magnify_bg_mode.currentIndexChanged.connect(self.update_context_config)
 
         magnify_bg_mode = QHBoxLayout()
 
@@ -145,12 +139,23 @@ class PreferencesTab(QWidget):
         self.magnify_zoom = QSpinBox()
         self.magnify_zoom.setMaximum(5)
         self.magnify_zoom.setMinimum(2)
-        self.magnify_zoom.valueChanged.connect(self.update_context_config)
 
         self.magnify_bg_blur = QSpinBox()
         self.magnify_bg_blur.setMaximum(20)
         self.magnify_bg_blur.setMinimum(1)
-        self.magnify_bg_blur.valueChanged.connect(self.update_context_config)
+
+        self.magnify_filter = QComboBox()
+        self.magnify_filter.addItem("Nearest")
+        self.magnify_filter.addItem("Bilinear")
+        self.magnify_filter.setToolTip(
+            "Nearest: pixels ampliados sem filtro; Bilinear: interpolado (o Qt"
+            " não tem ampliação mais nítida)"
+        )
+
+        self.magnify_live = QCheckBox("Live")
+        self.magnify_live_fps = QSpinBox()
+        self.magnify_live_fps.setMinimum(1)
+        self.magnify_live_fps.setMaximum(60)
 
         magnify_group = make_group("Magnifier")
         magnify_layout = QGridLayout()
@@ -165,6 +170,11 @@ class PreferencesTab(QWidget):
         magnify_layout.addWidget(self.magnify_zoom, 3, 1)
         magnify_layout.addWidget(QLabel("Background blur Level:"), 4, 0, 1, 2)
         magnify_layout.addWidget(self.magnify_bg_blur, 4, 2)
+        magnify_layout.addWidget(QLabel("Filter:"), 5, 0)
+        magnify_layout.addWidget(self.magnify_filter, 5, 1)
+        magnify_layout.addWidget(self.magnify_live, 6, 0)
+        magnify_layout.addWidget(self.magnify_live_fps, 6, 1)
+        magnify_layout.addWidget(QLabel("fps"), 6, 2)
 
         magnify_group.setLayout(magnify_layout)
         left_layout.addWidget(magnify_group)
@@ -173,16 +183,12 @@ class PreferencesTab(QWidget):
         self.laser_dot_size = QSpinBox()
 
         self.laser_dot_size.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
-        self.laser_dot_size.valueChanged.connect(self.update_context_config)
         self.laser_color = create_color_combobox(LASER_COLORS)
-        self.laser_color.currentIndexChanged.connect(self.update_context_config)
         self.laser_opacity = QSpinBox()
 
         self.laser_opacity.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
 
-        self.laser_opacity.valueChanged.connect(self.update_context_config)
         self.laser_reflection = QCheckBox("Reflection")
-        self.laser_reflection.stateChanged.connect(self.update_context_config)
 
         laser_group = make_group("Laser")
         laser_layout = QGridLayout()
@@ -202,13 +208,10 @@ class PreferencesTab(QWidget):
         self.marker_width = QSpinBox()
 
         self.marker_width.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
-        self.marker_width.valueChanged.connect(self.update_context_config)
         self.marker_color = create_color_combobox(PEN_COLORS)
-        self.marker_color.currentIndexChanged.connect(self.update_context_config)
         self.marker_opacity = QSpinBox()
 
         self.marker_opacity.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
-        self.marker_opacity.valueChanged.connect(self.update_context_config)
 
         marker_group = make_group("Marker")
         marker_layout = QGridLayout()
@@ -225,11 +228,9 @@ class PreferencesTab(QWidget):
 
         # Shade
         self.shade_color = create_named_color_combobox(SHADE_COLORS)
-        self.shade_color.currentIndexChanged.connect(self.update_context_config)
         self.shade_opacity = QSpinBox()
 
         self.shade_opacity.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
-        self.shade_opacity.valueChanged.connect(self.update_context_config)
 
         shade_group = make_group("Shade")
         shade_layout = QGridLayout()
@@ -243,15 +244,12 @@ class PreferencesTab(QWidget):
 
         # Border
         self.border_color = create_color_combobox(PEN_COLORS)
-        self.border_color.currentIndexChanged.connect(self.update_context_config)
         self.border_opacity = QSpinBox()
 
         self.border_opacity.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
-        self.border_opacity.valueChanged.connect(self.update_context_config)
         self.border_width = QSpinBox()
 
         self.border_width.setSizePolicy(QSizePolicy_Expanding, QSizePolicy_Fixed)
-        self.border_width.valueChanged.connect(self.update_context_config)
 
         border_group = make_group("Border")
         border_layout = QGridLayout()
@@ -275,13 +273,19 @@ class PreferencesTab(QWidget):
 
         checkbox_layout = QVBoxLayout()
         self.general_always_capture_screenshot = QCheckBox("Always capture screenshot")
-        self.general_always_capture_screenshot.stateChanged.connect(
-            self.update_context_config
-        )
         self.general_enable_auto_mode = QCheckBox("Enable AUTO mode if supported")
-        self.general_enable_auto_mode.stateChanged.connect(self.update_context_config)
+        self.general_passthrough = QCheckBox("Pass through unhandled device input")
+        self.general_passthrough.setToolTip(
+            "Repassa teclas desconhecidas por um clone virtual do dispositivo"
+        )
+        self.general_fast_toggle = QCheckBox("Keep overlay mapped in AUTO mode")
+        self.general_fast_toggle.setToolTip(
+            "Alterna o overlay sem mapear/desmapear a janela (menor latência)"
+        )
         checkbox_layout.addWidget(self.general_always_capture_screenshot)
         checkbox_layout.addWidget(self.general_enable_auto_mode)
+        checkbox_layout.addWidget(self.general_passthrough)
+        checkbox_layout.addWidget(self.general_fast_toggle)
 
         button_layout = QVBoxLayout()
         self.reset_button = QPushButton("Reset Settings")
@@ -335,6 +339,81 @@ class PreferencesTab(QWidget):
         self.setLayout(main_layout)
 
         self._ctx.currentModeChanged.connect(self.on_context_mode_changed)
+        self._ctx.configChanged.connect(self.on_context_config_changed)
+        self.update_live_available()
+
+        self.bindings = BindingRegistry(
+            self._ctx.config, enabled=lambda: self._ctx.ui_ready
+        )
+        self._bind_config()
+
+    def _bind_config(self):
+        b = self.bindings
+        b.bind_text("spotlight_shape", self.spotlight_shape)
+        b.bind_spin("spotlight_size", self.spotlight_size)
+        b.bind_check("spotlight_border", self.spotlight_border)
+        b.bind_index("spotlight_background_mode", self.spotlight_bg_mode)
+        b.bind_spin("spotlight_background_blur_level", self.spotlight_bg_blur)
+        b.bind_text("magnify_shape", self.magnify_shape)
+        b.bind_spin("magnify_size", self.magnify_size)
+        b.bind_check("magnify_border", self.magnify_border)
+        b.bind_index("magnify_background_mode", self.magnify_bg_mode)
+        b.bind_spin("magnify_zoom", self.magnify_zoom)
+        b.bind_spin("magnify_background_blur_level", self.magnify_bg_blur)
+        b.bind_text("magnify_filter", self.magnify_filter)
+        b.bind_check("magnify_live", self.magnify_live)
+        b.bind_spin("magnify_live_fps", self.magnify_live_fps)
+        b.bind_spin("laser_dot_size", self.laser_dot_size)
+        b.bind_index("laser_color_index", self.laser_color)
+        b.bind_spin("laser_opacity", self.laser_opacity)
+        b.bind_check("laser_reflection", self.laser_reflection)
+        b.bind_spin("marker_width", self.marker_width)
+        b.bind_index("marker_color_index", self.marker_color)
+        b.bind_spin("marker_opacity", self.marker_opacity)
+        b.bind_index("shade_color_index", self.shade_color)
+        b.bind_spin("shade_opacity", self.shade_opacity)
+        b.bind_index("border_color_index", self.border_color)
+        b.bind_spin("border_opacity", self.border_opacity)
+        b.bind_spin("border_width", self.border_width)
+        b.bind_check("general_always_capture", self.general_always_capture_screenshot)
+        b.bind_check("general_auto_mode", self.general_enable_auto_mode)
+        b.bind_check("general_passthrough", self.general_passthrough)
+        b.bind_check("general_fast_toggle", self.general_fast_toggle)
+        b.bind(
+            "modes_list",
+            self.modes_list,
+            self.enabled_modes,
+            self.set_modes,
+            self.modes_list.itemChanged,
+            lambda modes: tuple((int(m), bool(e)) for m, e in modes),
+            tuple,
+        )
+        # Arrastar para reordenar não emite itemChanged
+        self.modes_list.model().rowsMoved.connect(
+            lambda *_: b.write("modes_list")
+        )
+
+    def update_live_available(self):
+        # Sem excluir o overlay a captura veria a própria lente e a lupa
+        # ficaria na imagem estática: a opção não é oferecida
+        backend = get_capture_backend(self._ctx.config["general_capture_backend"])
+        available = backend.supports_exclude
+        self.magnify_live.setEnabled(available)
+        self.magnify_live_fps.setEnabled(available)
+        if available:
+            self.magnify_live.setToolTip(
+                "Recaptura continuamente a área sob a lente (vídeos e animações)"
+            )
+        else:
+            self.magnify_live.setToolTip(
+                f"Indisponível com o backend de captura {backend.name}: ele não"
+                " consegue capturar a tela sem o próprio overlay"
+                " (capture_backend = auto ou xshm, num X com MIT-SHM)"
+            )
+
+    def on_context_config_changed(self, changes):
+        if "general_capture_backend" in changes:
+            self.update_live_available()
 
     def _side_by_side_layout(self, left, right):
         layout = QHBoxLayout()
@@ -343,37 +422,42 @@ class PreferencesTab(QWidget):
         return layout
 
     def update_context_config(self):
-        if self._ctx.ui_ready:
-            cfg = self._ctx.config
-            cfg["spotlight_shape"] = self.spotlight_shape.currentText()
-            cfg["spotlight_size"] = self.spotlight_size.value()
-            cfg["spotlight_border"] = self.spotlight_border.isChecked()
-            cfg["spotlight_background_mode"] = self.spotlight_bg_mode.currentIndex()
-            cfg["spotlight_background_blur_level"] = self.spotlight_bg_blur.value()
-            cfg["magnify_shape"] = self.magnify_shape.currentText()
-            cfg["magnify_size"] = self.magnify_size.value()
-            cfg["magnify_border"] = self.magnify_border.isChecked()
-            cfg["magnify_background_mode"] = self.magnify_bg_mode.currentIndex()
-            cfg["magnify_zoom"] = self.magnify_zoom.value()
-            cfg["magnify_background_blur_level"] = self.magnify_bg_blur.value()
-            cfg["laser_dot_size"] = self.laser_dot_size.value()
-            cfg["laser_color_index"] = self.laser_color.currentIndex()
-            cfg["laser_opacity"] = self.laser_opacity.value()
-            cfg["laser_reflection"] = self.laser_reflection.isChecked()
-            cfg["marker_width"] = self.marker_width.value()
-            cfg["marker_color_index"] = self.marker_color.currentIndex()
-            cfg["marker_opacity"] = self.marker_opacity.value()
-            cfg["shade_color_index"] = self.shade_color.currentIndex()
-            cfg["shade_opacity"] = self.shade_opacity.value()
-            cfg["border_color_index"] = self.border_color.currentIndex()
-            cfg["border_opacity"] = self.border_opacity.value()
-            cfg["border_width"] = self.border_width.value()
-            cfg["general_always_capture"] = (
-                self.general_always_capture_screenshot.isChecked()
-            )
-            cfg["general_auto_mode"] = self.general_enable_auto_mode.isChecked()
+        if not self._ctx.ui_ready:
+            return
+        # Um único conjunto de mudanças, só com as chaves que mudaram
+        with self._ctx.config.batch() as cfg:
+            self.bindings.write_all()
             cfg["modes_current_mode"] = self._ctx.current_mode
 
+    def enabled_modes(self):
+        modes = []
+        for i in range(self.modes_list.count()):
+            item = self.modes_list.item(i)
+            mode_id = MODE_NAME_TO_ID.get(item.text())  # pyright: ignore
+            if mode_id is not None:
+                enabled = item.checkState() == Qt_CheckState_Checked  # pyright: ignore
+                modes.append((mode_id, enabled))
+        return tuple(modes)
+
+    def set_modes(self, modes):
+        """Reordena e marca os itens existentes conforme [(id, habilitado)]."""
+        items = {}
+        while self.modes_list.count():
+            item = self.modes_list.takeItem(0)
+            items[MODE_NAME_TO_ID.get(item.text())] = item  # pyright: ignore
+        for mode_id, enabled in modes:
+            item = items.pop(mode_id, None)
+            if item is None:
+                continue
+            item.setCheckState(
+                Qt_CheckState_Checked if enabled else Qt_CheckState_Unchecked
+            )
+            self.modes_list.addItem(item)
+        # Modos que a configuração não lista ficam no fim
+        for item in items.values():
+            self.modes_list.addItem(item)
+        self.set_current_mode(self._ctx.current_mode)
+
     def on_mode_selected(self, row):
         if row < 0 or row >= self.modes_list.count():
             return
@@ -383,7 +467,6 @@ class PreferencesTab(QWidget):
         if mode_id is not None and mode_id != self._ctx.current_mode:
             self._ctx.current_mode = mode_id
             self._ctx.log(f"> Modo alterado para: {name} (ID: {mode_id})")
-            self.update_context_config()
 
     def on_context_mode_changed(self, mode_id):
         for i in range(self.modes_list.count()):
@@ -435,6 +518,9 @@ class PreferencesTab(QWidget):
         self.magnify_border.setChecked(True)
         self.magnify_shape.setCurrentIndex(0)
         self.magnify_bg_mode.setCurrentIndex(2)
+        self.magnify_filter.setCurrentIndex(1)
+        self.magnify_live.setChecked(False)
+        self.magnify_live_fps.setValue(30)
         self.laser_dot_size.setValue(5)
         self.laser_opacity.setValue(60)
         self.laser_reflection.setChecked(True)
@@ -447,6 +533,8 @@ class PreferencesTab(QWidget):
         self.border_color.setCurrentIndex(7)  # White
         self.general_always_capture_screenshot.setChecked(False)
         self.general_enable_auto_mode.setChecked(True)
+        self.general_passthrough.setChecked(False)
+        self.general_fast_toggle.setChecked(True)
 
     def on_reset_clicked(self):
         resposta = QMessageBox.question(
@@ -502,6 +590,15 @@ class PreferencesTab(QWidget):
         self.magnify_bg_blur.setValue(getint("Magnify", "background_blur", 5))
 
         self.magnify_bg_mode.setCurrentIndex(getint("Magnify", "background_mode", 2))
+        mag_filter = config.get("Magnify", "filter", fallback="bilinear")
+        if mag_filter.lower() == "smooth":
+            # Filtro de versões anteriores, que era bilinear
+            mag_filter = "bilinear"
+        self.magnify_filter.setCurrentIndex(
+            getindex_by_text(self.magnify_filter, mag_filter)
+        )
+        self.magnify_live.setChecked(getbool("Magnify", "live", False))
+        self.magnify_live_fps.setValue(getint("Magnify", "live_fps", 30))
 
         self.laser_dot_size.setValue(getint("Laser", "dot_size", 5))
         self.laser_color.setCurrentIndex(getint("Laser", "color_index", 0))
@@ -523,6 +620,8 @@ class PreferencesTab(QWidget):
             getbool("General", "always_capture", True)
         )
         self.general_enable_auto_mode.setChecked(getbool("General", "auto_mode", True))
+        self.general_passthrough.setChecked(getbool("General", "passthrough", False))
+        self.general_fast_toggle.setChecked(getbool("General", "fast_toggle", True))
 
         # Carrega modos
         self.modes_list.clear()
@@ -550,7 +649,9 @@ class PreferencesTab(QWidget):
                 )
                 self.modes_list.addItem(item)
             except Exception as e:
-                self._ctx.log(f"Erro ao carregar modo '{raw}': {e}")
+                self._ctx.log(
+                    f"Erro ao carregar modo '{raw}': {e}", level=logger.ERROR
+                )
             i += 1
 
     def set_current_mode(self, current_mode: int):
@@ -563,61 +664,3 @@ class PreferencesTab(QWidget):
                 self.modes_list.setCurrentRow(i)
                 self.modes_list.blockSignals(False)
                 break
-
-    def save_config(self, config: configparser.ConfigParser):
-        config["Spotlight"] = {
-            "shape": self.spotlight_shape.currentText(),
-            "size": str(self.spotlight_size.value()),
-            "border": str(self.spotlight_border.isChecked()),
-            "background_mode": str(self.spotlight_bg_mode.currentIndex()),
-            "background_blur": str(self.spotlight_bg_blur.value()),
-        }
-        config["Magnify"] = {
-            "shape": self.magnify_shape.currentText(),
-            "size": str(self.magnify_size.value()),
-            "border": str(self.magnify_border.isChecked()),
-            "background_mode": str(self.magnify_bg_mode.currentIndex()),
-            "background_blur": str(self.magnify_bg_blur.value()),
-            "zoom": str(self.magnify_zoom.value()),
-        }
-        config["Laser"] = {
-            "dot_size": str(self.laser_dot_size.value()),
-            "color_index": str(self.laser_color.currentIndex()),
-            "opacity": str(self.laser_opacity.value()),
-            "reflection": str(self.laser_reflection.isChecked()),
-        }
-        config["Marker"] = {
-            "width": str(self.marker_width.value()),
-            "color_index": str(self.marker_color.currentIndex()),
-            "opacity": str(self.marker_opacity.value()),
-        }
-        config["Shade"] = {
-            "color_index": str(self.shade_color.currentIndex()),
-            "opacity": str(self.shade_opacity.value()),
-        }
-        config["Border"] = {
-            "color_index": str(self.border_color.currentIndex()),
-            "opacity": str(self.border_opacity.value()),
-            "width": str(self.border_width.value()),
-        }
-        config["General"] = {
-            "always_capture": str(self.general_always_capture_screenshot.isChecked()),
-            "auto_mode": str(self.general_enable_auto_mode.isChecked()),
-        }
-
-        config["Modes"] = {}
-
-        for i in range(self.modes_list.count()):
-            item = self.modes_list.item(i)
-            name = item.text()  # pyright: ignore
-            mode_id = MODE_NAME_TO_ID.get(name)
-            if mode_id is not None:
-                enabled = item.checkState() == Qt_CheckState_Checked  # pyright: ignore
-                config["Modes"][f"mode{i}"] = f"{mode_id}|{int(enabled)}"
-
-        selected_items = self.modes_list.selectedItems()
-        if selected_items:
-            selected_name = selected_items[0].text()
-            current_id = MODE_NAME_TO_ID.get(selected_name)
-            if current_id is not None:
-                config["Modes"]["current_mode"] = str(current_id)
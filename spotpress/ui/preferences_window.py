@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import sys
 import os
-import configparser
 from spotpress.qtcompat import (
     SP_QT_VERSION,
     QApplication,
@@ -30,6 +29,8 @@ from spotpress.appcontext import AppContext
 from spotpress.spotlight import SpotlightOverlayWindow
 from spotpress.infoverlay import InfOverlayWindow
 from spotpress.utils import (
+    MODE_CMD_NAMES,
+    MODE_MAP,
     MODES_CMD_LINE_MAP,
     get_screen_geometry,
     ICON_FILE,
@@ -38,9 +39,16 @@ from spotpress.utils import (
 from spotpress.ui.preferences_tab import PreferencesTab
 from spotpress.ui.devices_tab import DevicesTab
 from spotpress.ui.log_tab import LogTab
+from spotpress import logger
 
 
 from spotpress.hw.lnx.devices import DeviceMonitor
+from spotpress.ipcprotocol import CommandError
+from spotpress.hw.lnx.recorder import InputRecorder
+from spotpress.logwriter import DEFAULT_DIR as DEFAULT_LOG_DIR, LogWriter
+from spotpress.windowtracker import start_window_tracker, stop_window_tracker
+from spotpress.x11windows import close_backend
+from spotpress.capture import close_backends as close_capture_backends
 
 
 if SP_QT_VERSION == 5:
@@ -53,13 +61,12 @@ if SP_QT_VERSION == 5:
 
 
 class SpotpressPreferences(QMainWindow):
-    log_signal = pyqtSignal(str)
     info_signal = pyqtSignal(str)
     refresh_devices_signal = pyqtSignal()
     show_overlay_signal = pyqtSignal()
     hide_overlay_signal = pyqtSignal()
 
-    def __init__(self, debug_mode=False):
+    def __init__(self, debug_mode=False, record_path=None, log_dir=None):
         super().__init__()
 
         self.ipc_server = None
@@ -73,18 +80,20 @@ class SpotpressPreferences(QMainWindow):
 
         self._ctx = AppContext(
             screen_index=0,
-            log_function=self.thread_safe_log,
             show_info_function=self.thread_safe_info,
             show_overlay_function=self.thread_safe_show_overlay,
             hide_overlay_function=self.thread_safe_hide_overlay,
             main_window=self,
             debug_mode=debug_mode,
         )
+        # Em modo debug tudo vai para a aba de log; fora dele só avisos e
+        # erros passam do nível e são impressos no stdout
+        logger.configure(level=logger.DEBUG if debug_mode else logger.WARN)
+        logger.set_sink(self.thread_safe_log if debug_mode else None)
 
         self.tabs = QTabWidget()
         self.preferences_tab = PreferencesTab(self, self._ctx)
         self.devices_tab = DevicesTab(self, self._ctx)
-        self.log_tab = LogTab(self, self._ctx)
 
         self.tabs.addTab(self.preferences_tab, "Preferences")
         self.tabs.addTab(self.devices_tab, "Devices")
@@ -141,12 +150,21 @@ class SpotpressPreferences(QMainWindow):
         self._ctx.ui_ready = True
 
         self.load_config()
-        if debug_mode:
-            self.log_signal.connect(self.append_log)
         self.info_signal.connect(self.show_info)
         self.show_overlay_signal.connect(self.show_overlay)
         self.hide_overlay_signal.connect(self.hide_overlay)
 
+        if record_path:
+            self.start_recording(record_path)
+        if log_dir:
+            self.start_log_writer(log_dir)
+
+        # Cache das janelas de apresentação consultado pelos drivers
+        if start_window_tracker() is None:
+            self._ctx.log(
+                "* Window tracker indisponível, usando xdotool/xprop a cada busca"
+            )
+
         self.device_monitor = DeviceMonitor(self._ctx)
         self.device_monitor.start_monitoring()
         self.refresh_devices_signal.connect(self.refresh_devices_list)
@@ -155,6 +173,20 @@ class SpotpressPreferences(QMainWindow):
         )
         self.device_monitor.register_hotplug_callback(self.emit_refresh_devices_signal)
         self.refresh_devices_list()
+
+        # Eventos para os clientes IPC que deram --subscribe
+        self._ctx.currentModeChanged.connect(
+            lambda mode: self.broadcast_event("currentModeChanged", self.mode_state(mode))
+        )
+        self._ctx.configChanged.connect(
+            lambda changes: self.broadcast_event("configChanged", changes)
+        )
+        self.refresh_devices_signal.connect(
+            lambda: self.broadcast_event("devicesChanged", self.devices_state())
+        )
+        self.devices_tab.active_device_changed.connect(
+            lambda _: self.broadcast_event("devicesChanged", self.devices_state())
+        )
         self.preferences_tab.update_modes_list_from_context()
 
         # if debug_mode:
@@ -162,27 +194,123 @@ class SpotpressPreferences(QMainWindow):
         #
         #     set_debug_border(self)
 
+    def mode_state(self, mode=None):
+        if mode is None:
+            mode = self._ctx.current_mode
+        return {
+            "mode": mode,
+            "name": MODE_CMD_NAMES.get(mode),
+            "label": MODE_MAP.get(mode),
+        }
+
+    def device_state(self, dev):
+        if dev is None:
+            return None
+        return {
+            "name": dev.display_name(),
+            "class": dev.__class__.__name__,
+            "paths": sorted(dev._known_paths),
+        }
+
+    def devices_state(self):
+        return {
+            "active": self.device_state(self._ctx.active_device),
+            "devices": [
+                self.device_state(d) for d in self.device_monitor.get_monitored_devices()
+            ],
+        }
+
+    def broadcast_event(self, name, data):
+        if self.ipc_server is not None:
+            self.ipc_server.broadcast(name, data)
+
     def handle_command_from_ipc(self, command: str):
         if command == "--ping":
-            pass  # Used only to check if the instance is alive
+            return "pong"  # Used only to check if the instance is alive
+        elif command == "--get-mode":
+            return self.mode_state()
+        elif command == "--get-active-device":
+            return self.device_state(self._ctx.active_device)
+        elif command == "--get-devices":
+            return self.devices_state()
+        elif command == "--get-config":
+            return self._ctx.config.as_dict()
+        elif command.startswith("--get-config="):
+            key = command.split("=", 1)[1]
+            if key not in self._ctx.config:
+                raise CommandError(f"Chave de configuração desconhecida: {key}")
+            return self._ctx.config[key]
+        elif command == "--get-stats":
+            overlay = self._ctx.overlay_window
+            return overlay.stats() if overlay else None
         elif command == "--show-window":
             self.show_window()
         elif command == "--hide-window":
             self.hide_window()
         elif command == "--quit":
             self.on_quit_clicked()
+        elif command.startswith("--record="):
+            self.start_recording(command.split("=", 1)[1])
+        elif command == "--stop-recording":
+            self.stop_recording()
+        elif command == "--log-file":
+            self.start_log_writer(DEFAULT_LOG_DIR)
+        elif command.startswith("--log-file="):
+            self.start_log_writer(command.split("=", 1)[1])
         elif command.startswith("--set-auto-mode="):
             val = command.split("=", 1)[1] == "on"
             if self._ctx.overlay_window:
                 self._ctx.overlay_window.set_auto_mode(enable=val)
         elif command.startswith("--set-mode="):
             mode = command.split("=", 1)[1]
-            if mode in MODES_CMD_LINE_MAP.keys() and self._ctx.overlay_window:
+            if mode not in MODES_CMD_LINE_MAP.keys():
+                raise CommandError(f"Modo inválido: {mode}")
+            if self._ctx.overlay_window:
                 mode_to_switch = MODES_CMD_LINE_MAP[mode]
                 self._ctx.overlay_window.switch_mode(direct_mode=mode_to_switch)
-                self.thread_safe_log(f"[IPC] Comando: mudar para modo '{mode}'")
+                self._ctx.log(f"[IPC] Comando: mudar para modo '{mode}'")
         else:
-            self.thread_safe_log(f"[IPC] Comando desconhecido: {command}")
+            self._ctx.log(f"[IPC] Comando desconhecido: {command}")
+            raise CommandError(f"Comando desconhecido: {command}")
+
+    def start_recording(self, path):
+        self.stop_recording()
+        try:
+            self._ctx.recorder = InputRecorder(os.path.expanduser(path))
+            self._ctx.log(f"[REC] Gravando entrada em {path}")
+        except OSError as e:
+            self._ctx.log(
+                f"[REC] Não foi possível gravar em {path}: {e}", level=logger.WARN
+            )
+
+    def stop_recording(self):
+        recorder = self._ctx.recorder
+        if recorder is not None:
+            self._ctx.recorder = None
+            recorder.close()
+            self._ctx.log(
+                f"[REC] Gravação finalizada ({recorder.count} registros): {recorder.path}"
+            )
+
+    def start_log_writer(self, directory):
+        self.stop_log_writer()
+        try:
+            writer = LogWriter(os.path.expanduser(directory))
+        except OSError as e:
+            self._ctx.log(
+                f"[LOG] Não foi possível gravar em {directory}: {e}", level=logger.WARN
+            )
+            return
+        self._ctx.log_writer = writer
+        logger.add_sink(writer.log)
+        self._ctx.log(f"[LOG] Gravando log e traces em {writer.directory}")
+
+    def stop_log_writer(self):
+        writer = self._ctx.log_writer
+        if writer is not None:
+            self._ctx.log_writer = None
+            logger.remove_sink(writer.log)
+            writer.close()
 
     def center_on_screen(self):
         screen = QApplication.primaryScreen()
@@ -308,10 +436,10 @@ class SpotpressPreferences(QMainWindow):
 
         msg.exec()
 
-    def append_log(self, message):
+    def append_log(self, message, level=None):
         if self._ctx.debug_mode:
             if hasattr(self, "log_tab"):
-                self.log_tab.append_log_message(message)
+                self.log_tab.append_log_message(message, level)
             print(message)
 
     def show_info(self, mensagem):
@@ -333,8 +461,10 @@ class SpotpressPreferences(QMainWindow):
     def thread_safe_show_overlay(self):
         self.show_overlay_signal.emit()
 
-    def thread_safe_log(self, message):
-        self.log_signal.emit(message)
+    def thread_safe_log(self, message, level=None, subsystem=None):
+        # O LogTab guarda no buffer (com lock) e desenha em lote no timer,
+        # então não é preciso um sinal enfileirado por mensagem
+        self.append_log(message, level)
 
     def thread_safe_info(self, message):
         self.info_signal.emit(message)
@@ -354,6 +484,11 @@ class SpotpressPreferences(QMainWindow):
             self._ctx.overlay_window.close()
         if self._ctx.info_overlay:
             self._ctx.info_overlay.close()
+        self.stop_recording()
+        self.stop_log_writer()
+        stop_window_tracker()
+        close_backend()
+        close_capture_backends()
         self.save_config()
         QApplication.quit()
 
@@ -369,23 +504,25 @@ class SpotpressPreferences(QMainWindow):
             self.append_log(f"> Tela selecionada: {screen_index}")
 
     def load_config(self):
-        if not os.path.exists(CONFIG_PATH):
-            self.preferences_tab.load_defaults()
-            return
-        config = configparser.ConfigParser()
-        config.read(CONFIG_PATH)
-        self.preferences_tab.load_config(config)
-        current_mode = config.getint("Modes", "current_mode", fallback=0)
-        self._ctx.current_mode = current_mode
-        self.preferences_tab.set_current_mode(current_mode)
-        self.preferences_tab.update_context_config()
+        store = self._ctx.config
+        # Cada widget carregado grava a sua chave; o batch junta tudo num
+        # único conjunto de mudanças
+        with store.batch():
+            if not os.path.exists(CONFIG_PATH):
+                self.preferences_tab.load_defaults()
+            else:
+                config = store.load(CONFIG_PATH)
+                self.preferences_tab.load_config(config)
+                current_mode = config.getint("Modes", "current_mode", fallback=0)
+                self._ctx.current_mode = current_mode
+                self.preferences_tab.set_current_mode(current_mode)
+            self.preferences_tab.update_context_config()
+        # A partir daqui cada mudança agenda uma gravação
+        store.autosave = True
 
     def save_config(self):
-        config = configparser.ConfigParser()
-        self.preferences_tab.save_config(config)
-        os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
-        with open(CONFIG_PATH, "w") as configfile:
-            config.write(configfile)
+        self.preferences_tab.update_context_config()
+        self._ctx.config.save(CONFIG_PATH)
 
     def keyPressEvent(self, event):
         key = event.key()
@@ -1,6 +1,4 @@
-import enum
 import os
-import getpass
 import subprocess
 from spotpress.qtcompat import (
     QColor,
@@ -16,7 +14,30 @@ from spotpress.qtcompat import (
 )
 
 
-import uinput
+from spotpress.windowhints import (
+    DEFAULT_SHORTCUT,
+    PRESENTATION_SHORTCUTS,
+    WINDOW_HINTS,
+    get_hint_matcher,
+)
+from spotpress.windowtracker import get_window_source
+from spotpress.capture import get_backend as get_capture_backend
+
+# Reexportados: as tabelas de modos vivem em spotpress.modes (sem Qt)
+from spotpress.modes import (
+    DEFAULT_MODES,
+    MODE_LASER,
+    MODE_MAG_GLASS,
+    MODE_CMD_NAMES,
+    MODE_MAP,
+    MODE_MOUSE,
+    MODE_NAME_TO_ID,
+    MODE_PEN,
+    MODE_SPOTLIGHT,
+    MODES_CMD_LINE_MAP,
+    SOCKET_NAME,
+    Mode,
+)
 
 try:
     import qdarktheme
@@ -26,44 +47,6 @@ except:
     DARK_MODE_AVAILABLE = False
 
 
-MODE_MOUSE = 0
-MODE_SPOTLIGHT = 1
-MODE_LASER = 2
-MODE_PEN = 3
-MODE_MAG_GLASS = 4
-
-
-MODE_MAP = {
-    MODE_MOUSE: "Mouse",
-    MODE_SPOTLIGHT: "Spotlight",
-    MODE_LASER: "Laser",
-    MODE_PEN: "Marcador",
-    MODE_MAG_GLASS: "Lente",
-}
-
-
-class Mode(enum.Enum):
-    MOUSE = MODE_MOUSE
-    SPOTLIGHT = MODE_SPOTLIGHT
-    LASER = MODE_LASER
-    PEN = MODE_PEN
-    MAG_GLASS = MODE_MAG_GLASS
-
-
-MODES_CMD_LINE_MAP = {
-    "mouse": 0,
-    "0": 0,
-    "spotlight": 1,
-    "1": 1,
-    "laser": 2,
-    "2": 2,
-    "pen": 3,
-    "3": 3,
-    "mag_glass": 4,
-    "4": 4,
-}
-
-
 LASER_COLORS = [
     (QColor(255, 0, 0), "Red"),
     (QColor(0, 255, 0), "Green"),
@@ -98,13 +81,6 @@ SHADE_COLORS = [
 ]
 
 
-# Reverter MODE_MAP para obter nome -> valor
-MODE_NAME_TO_ID = {v: k for k, v in MODE_MAP.items()}
-
-# Lista default com todos habilitados
-DEFAULT_MODES = [(name, True) for name in MODE_NAME_TO_ID.keys()]
-
-
 CONFIG_PATH = os.path.expanduser(
     os.path.join("~", ".config", "spotpress", "config.ini")
 )
@@ -114,9 +90,6 @@ ICON_FILE = os.path.join(
 )
 
 
-SOCKET_NAME = f"spotpress_socket_{getpass.getuser()}"
-
-
 class SingletonMeta(type):
     _instances = {}
 
@@ -128,17 +101,6 @@ class SingletonMeta(type):
         return instance
 
 
-class ObservableDict(dict):
-    def __init__(self, *args, callback=None, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._callback = callback
-
-    def __setitem__(self, key, value):
-        super().__setitem__(key, value)
-        if self._callback:
-            self._callback(key, value)
-
-
 def pil_to_qimage(pil_img):
     pil_img = pil_img.convert("RGBA")
     data = pil_img.tobytes("raw", "RGBA")
@@ -199,10 +161,9 @@ def get_screen_geometry(screen_index):
     return geometry
 
 
-def capture_monitor_screenshot(screen_index):
+def capture_monitor_screenshot(screen_index, rect=None, backend="auto", exclude=None):
     screen, _ = get_screen_and_geometry(screen_index)
-    screenshot = screen.grabWindow(0)  # pyright: ignore
-    return screenshot.toImage()
+    return get_capture_backend(backend).grab(screen, rect, exclude)
 
 
 def load_dark_theme(app):
@@ -210,54 +171,50 @@ def load_dark_theme(app):
         app.setStyleSheet(qdarktheme.load_stylesheet())
 
 
-WINDOW_HINTS = [
-    {"class": "libreoffice-impress", "name": "Impress"},
-    {"class": "soffice", "name": "Impress"},
-    {"class": "onlyoffice", "name": "pptx|ppt|odp|pdf"},
-    {"class": "wpsoffice", "name": "WPS Office"},
-    {"class": "okular", "name": "Okular"},
-    {"class": "evince", "name": "Apresentação"},
-    {"class": "atril", "name": "pdf"},
-    {"class": "google-chrome", "name": "Apresentações Google"},
-    {"class": "firefox", "name": "Google Slides"},
-]
-
-PRESENTATION_SHORTCUTS = {
-    "libreoffice-impress": [uinput.KEY_LEFTSHIFT, uinput.KEY_F5],
-    "soffice": [uinput.KEY_LEFTSHIFT, uinput.KEY_F5],
-    "onlyoffice": [uinput.KEY_LEFTCTRL, uinput.KEY_F5],
-    "wpsoffice": [uinput.KEY_LEFTCTRL, uinput.KEY_F5],
-    "atril": [uinput.KEY_F5],
-    "evince": [uinput.KEY_F5],
-    "okular": [uinput.KEY_LEFTCTRL, uinput.KEY_LEFTSHIFT, uinput.KEY_P],
-    "google-chrome": [uinput.KEY_LEFTCTRL, uinput.KEY_F5],
-    # Adicione outros conforme necessário
-}
-
-
 def get_open_window_classes():
+    matcher = get_hint_matcher()
+    source = get_window_source()
+    if source is not None:
+        open_classes = set()
+        for info in source.windows():
+            hint = matcher.hint_for_class(info.wm_class)
+            if hint is not None:
+                open_classes.add(hint.class_name.lower())
+        return open_classes
+
     open_classes = set()
-    for hint in WINDOW_HINTS:
+    for hint in matcher.hints:
         try:
             result = subprocess.run(
-                ["xdotool", "search", "--class", hint["class"]],
+                ["xdotool", "search", "--class", hint.class_name],
                 capture_output=True,
                 text=True,
             )
             if result.returncode == 0 and result.stdout.strip():
-                open_classes.add(hint["class"].lower())
+                open_classes.add(hint.class_name.lower())
         except Exception:
             pass
     return open_classes
 
 
 def get_keychord_for_presentation_program():
+    matcher = get_hint_matcher()
+    source = get_window_source()
+    if source is not None:
+        # Programa da janela mais provável: tela cheia, título, ativa
+        shortcut = matcher.presentation_shortcut(
+            source.windows(),
+            active=source.active_window,
+            special=source.special_windows(),
+        )
+        return shortcut or DEFAULT_SHORTCUT
+
     open_classes = get_open_window_classes()
-    for app_class, keys in PRESENTATION_SHORTCUTS.items():
-        if app_class.lower() in open_classes:
-            return keys
+    for hint in matcher.hints:
+        if hint.shortcut and hint.class_name.lower() in open_classes:
+            return hint.shortcut
     # Padrão se nada identificado: Shift+F5
-    return [uinput.KEY_LEFTSHIFT, uinput.KEY_F5]
+    return DEFAULT_SHORTCUT
 
 
 def get_window_property(window_id, prop):
@@ -274,14 +231,31 @@ def parse_xprop_value(output):
     return ""
 
 
-def find_best_window(wids, class_name):
-    # Encontra o item do WINDOW_HINTS para a classe dada
-    hint = next((h for h in WINDOW_HINTS if h.get("class") == class_name), None)
-    if not hint:
-        return None
+def find_best_cached_window(source, matcher=None):
+    matcher = matcher or get_hint_matcher()
+    windows = source.windows()
+    info, _ = matcher.best_window(
+        windows,
+        active=source.active_window,
+        require_title=True,
+        special=source.special_windows(),
+    )
+    if info is not None:
+        return info.wid
+    # Títulos em cache podem estar desatualizados: relê os candidatos
+    candidates = [w for w in windows if matcher.hint_for_class(w.wm_class)]
+    refreshed = [source.refresh(w.wid) or w for w in candidates]
+    info, _ = matcher.best_window(
+        refreshed, active=source.active_window, require_title=True
+    )
+    return info.wid if info is not None else None
+
 
-    name_keywords = hint.get("name", "")
-    keywords = [k.strip().lower() for k in name_keywords.split("|")]
+def find_best_window(wids, class_name, matcher=None):
+    matcher = matcher or get_hint_matcher()
+    hint = matcher.hint_named(class_name)
+    if hint is None:
+        return None
 
     for wid in wids:
         wm_name = get_window_property(wid, "_NET_WM_NAME") or get_window_property(
@@ -290,24 +264,34 @@ def find_best_window(wids, class_name):
         name_value = parse_xprop_value(wm_name)
 
         # Verifica se alguma keyword está contida no nome
-        if any(keyword in name_value for keyword in keywords):
+        if matcher.title_matches(hint, name_value):
             return wid
 
 
 def refocus_presentation_window():
-    for hint in WINDOW_HINTS:
+    matcher = get_hint_matcher()
+    source = get_window_source()
+    if source is not None:
+        wid = find_best_cached_window(source, matcher)
+        if wid is not None:
+            if source.activate(wid):
+                return True  # PARA aqui, janela ativada
+            print(f"[WARN] Failed to focus window {hex(wid)}")
+        return False
+
+    for hint in matcher.hints:
         try:
-            class_name = hint["class"]
+            class_name = hint.class_name
             cmd = ["xdotool", "search"]
             cmd += ["--class", class_name]
 
             result = subprocess.run(cmd, capture_output=True, text=True)
             if result.returncode == 0 and result.stdout.strip():
                 wids = result.stdout.strip().split("\n")
-                wid = find_best_window(wids, class_name)
+                wid = find_best_window(wids, class_name, matcher)
                 if wid is not None:
                     subprocess.run(["xdotool", "windowactivate", wid])
                     return True  # PARA aqui, janela ativada
         except Exception as e:
-            print(f"[WARN] Failed to focus {hint}: {e}")
+            print(f"[WARN] Failed to focus {hint.class_name}: {e}")
     return False  # Nenhuma janela encontrada
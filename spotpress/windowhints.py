@@ -0,0 +1,301 @@
+import configparser
+import os
+import re
+import threading
+from collections import namedtuple
+from operator import attrgetter
+
+import uinput
+
+from spotpress.logger import get_logger
+
+_logger = get_logger("windowhints")
+
+WINDOW_HINTS = [
+    {"class": "libreoffice-impress", "name": "Impress"},
+    {"class": "soffice", "name": "Impress"},
+    {"class": "onlyoffice", "name": "pptx|ppt|odp|pdf"},
+    {"class": "wpsoffice", "name": "WPS Office"},
+    {"class": "okular", "name": "Okular"},
+    {"class": "evince", "name": "Apresentação"},
+    {"class": "atril", "name": "pdf"},
+    {"class": "google-chrome", "name": "Apresentações Google"},
+    {"class": "firefox", "name": "Google Slides"},
+]
+
+PRESENTATION_SHORTCUTS = {
+    "libreoffice-impress": [uinput.KEY_LEFTSHIFT, uinput.KEY_F5],
+    "soffice": [uinput.KEY_LEFTSHIFT, uinput.KEY_F5],
+    "onlyoffice": [uinput.KEY_LEFTCTRL, uinput.KEY_F5],
+    "wpsoffice": [uinput.KEY_LEFTCTRL, uinput.KEY_F5],
+    "atril": [uinput.KEY_F5],
+    "evince": [uinput.KEY_F5],
+    "okular": [uinput.KEY_LEFTCTRL, uinput.KEY_LEFTSHIFT, uinput.KEY_P],
+    "google-chrome": [uinput.KEY_LEFTCTRL, uinput.KEY_F5],
+    # Adicione outros conforme necessário
+}
+
+DEFAULT_SHORTCUT = [uinput.KEY_LEFTSHIFT, uinput.KEY_F5]
+
+HINTS_PATH = os.path.expanduser(
+    os.path.join("~", ".config", "spotpress", "window_hints.ini")
+)
+
+# Pesos da pontuação: tela cheia > título reconhecido > janela ativa >
+# ordem da dica (prioridade). O título vem antes do foco: um navegador em
+# uso não passa na frente da apresentação aberta em outra janela
+SCORE_FULLSCREEN = 4000
+SCORE_TITLE = 2000
+SCORE_ACTIVE = 1000
+
+WindowHint = namedtuple("WindowHint", "class_name title_re shortcut priority")
+
+_is_fullscreen = attrgetter("fullscreen")
+
+
+def compile_keywords(names):
+    """'pptx|ppt|odp' -> regex única, sem diferenciar maiúsculas."""
+    keywords = [k.strip() for k in names.split("|") if k.strip()]
+    if not keywords:
+        return None
+    # Palavras mais longas primeiro para a alternância não parar no prefixo
+    keywords.sort(key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+
+
+def parse_shortcut(value):
+    """'KEY_LEFTCTRL+KEY_F5' -> [uinput.KEY_LEFTCTRL, uinput.KEY_F5]"""
+    keys = []
+    for name in value.replace(",", "+").split("+"):
+        name = name.strip().upper()
+        if not name:
+            continue
+        if not name.startswith("KEY_"):
+            name = "KEY_" + name
+        key = getattr(uinput, name, None)
+        if key is None:
+            raise ValueError(f"Tecla desconhecida: {name}")
+        keys.append(key)
+    return keys
+
+
+class HintMatcher:
+    """
+    Dicas de janelas compiladas uma vez: uma regex com todas as classes
+    (um grupo nomeado por dica) e uma regex de palavras-chave do título por
+    classe. Escolhe a janela de apresentação com maior pontuação.
+    """
+
+    def __init__(self, hints):
+        self.hints = list(hints)
+        # Maior prioridade possível: teto da pontuação das janelas comuns
+        self._top = max((h.priority for h in self.hints), default=0)
+        self._top_shortcut = max(
+            (h.priority for h in self.hints if h.shortcut), default=0
+        )
+        self._by_group = {}
+        groups = []
+        for i, hint in enumerate(self.hints):
+            group = f"h{i}"
+            self._by_group[group] = hint
+            groups.append(f"(?P<{group}>{re.escape(hint.class_name)})")
+        self._class_re = re.compile("|".join(groups), re.IGNORECASE) if groups else None
+        self._class_cache = {}
+
+    def hint_for_class(self, wm_class):
+        """Dica de maior prioridade para a tupla WM_CLASS, ou None."""
+        cached = self._class_cache.get(wm_class, False)
+        if cached is not False:
+            return cached
+        best = None
+        if self._class_re is not None:
+            for value in wm_class:
+                for m in self._class_re.finditer(value):
+                    hint = self._by_group[m.lastgroup]
+                    if best is None or hint.priority > best.priority:
+                        best = hint
+        if len(self._class_cache) > 1024:
+            self._class_cache.clear()
+        self._class_cache[wm_class] = best
+        return best
+
+    def hint_named(self, class_name):
+        for hint in self.hints:
+            if hint.class_name == class_name:
+                return hint
+        return None
+
+    def title_matches(self, hint, title):
+        return hint.title_re is not None and hint.title_re.search(title) is not None
+
+    def score(self, info, active=None):
+        """
+        Retorna (pontuação, dica, título reconhecido); a dica é None se a
+        janela não for de um programa conhecido.
+        """
+        hint = self.hint_for_class(info.wm_class)
+        if hint is None:
+            return 0, None, False
+        score = hint.priority
+        title_ok = self.title_matches(hint, info.name)
+        if title_ok:
+            score += SCORE_TITLE
+        if info.wid == active:
+            score += SCORE_ACTIVE
+        if getattr(info, "fullscreen", False):
+            score += SCORE_FULLSCREEN
+        return score, hint, title_ok
+
+    def best_window(
+        self,
+        windows,
+        active=None,
+        require_title=False,
+        with_shortcut=False,
+        special=None,
+    ):
+        """
+        Retorna (janela, dica) com maior pontuação, ou (None, None).
+
+        Só as janelas em tela cheia e a ativa passam do teto das demais
+        (maior prioridade + título): avaliadas antes, a busca para na
+        primeira janela comum que chega ao teto. `special` são essas
+        janelas, se quem chama já as conhece (o tracker as mantém); sem ele
+        as em tela cheia são separadas numa passada.
+        """
+        if special is None:
+            special = list(filter(_is_fullscreen, windows))
+        ceiling = (self._top_shortcut if with_shortcut else self._top) + SCORE_TITLE
+        if active is not None and all(w.wid != active for w in special):
+            ceiling += SCORE_ACTIVE
+        best, best_score = self._scan(
+            special, active, require_title, with_shortcut, (None, None), -1, None
+        )
+        if best_score >= ceiling:
+            return best
+        best, _ = self._scan(
+            windows, active, require_title, with_shortcut, best, best_score, ceiling
+        )
+        return best
+
+    def _scan(
+        self, windows, active, require_title, with_shortcut, best, best_score, ceiling
+    ):
+        classes = self._class_cache
+        for info in windows:
+            # Consulta direta ao cache: a maioria das janelas não é de
+            # programa conhecido e sai aqui
+            hint = classes.get(info.wm_class, False)
+            if hint is False:
+                hint = self.hint_for_class(info.wm_class)
+            if hint is None or (with_shortcut and not hint.shortcut):
+                continue
+            score = hint.priority
+            if info.wid == active:
+                score += SCORE_ACTIVE
+            if info.fullscreen:
+                score += SCORE_FULLSCREEN
+            if score + SCORE_TITLE <= best_score:
+                # Nem com o título passaria da melhor: poupa a regex
+                continue
+            if self.title_matches(hint, info.name):
+                score += SCORE_TITLE
+            elif require_title:
+                continue
+            if score > best_score:
+                best = (info, hint)
+                best_score = score
+                if ceiling is not None and best_score >= ceiling:
+                    # Nenhuma janela restante passa desta
+                    break
+        return best, best_score
+
+    def presentation_shortcut(self, windows, active=None, special=None):
+        """
+        Atalho do programa de apresentação mais provável: entre as janelas
+        com título reconhecido e, se não houver, pela classe. None se
+        nenhuma janela conhecida tiver atalho.
+        """
+        if special is None:
+            special = list(filter(_is_fullscreen, windows))
+        _, hint = self.best_window(
+            windows,
+            active=active,
+            require_title=True,
+            with_shortcut=True,
+            special=special,
+        )
+        if hint is None:
+            _, hint = self.best_window(
+                windows, active=active, with_shortcut=True, special=special
+            )
+        return hint.shortcut if hint is not None else None
+
+
+def builtin_hints():
+    total = len(WINDOW_HINTS)
+    return [
+        WindowHint(
+            h["class"],
+            compile_keywords(h.get("name", "")),
+            PRESENTATION_SHORTCUTS.get(h["class"]),
+            total - i,
+        )
+        for i, h in enumerate(WINDOW_HINTS)
+    ]
+
+
+def load_user_hints(path, hints):
+    """
+    Acrescenta ou substitui dicas a partir de um arquivo ini:
+
+        [classe-da-janela]
+        name = palavra|outra palavra
+        shortcut = KEY_LEFTCTRL+KEY_F5
+        priority = 50
+    """
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(path, encoding="utf-8")
+    by_class = {h.class_name: h for h in hints}
+    order = [h.class_name for h in hints]
+    for class_name in config.sections():
+        section = config[class_name]
+        current = by_class.get(class_name)
+        title_re = current.title_re if current else None
+        if "name" in section:
+            title_re = compile_keywords(section["name"])
+        shortcut = current.shortcut if current else None
+        if "shortcut" in section:
+            shortcut = parse_shortcut(section["shortcut"]) or None
+        priority = section.getint(
+            "priority", fallback=current.priority if current else 0
+        )
+        by_class[class_name] = WindowHint(class_name, title_re, shortcut, priority)
+        if class_name not in order:
+            order.append(class_name)
+    return [by_class[c] for c in order]
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_hint_matcher(path=HINTS_PATH):
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            hints = builtin_hints()
+            if path and os.path.exists(path):
+                try:
+                    hints = load_user_hints(path, hints)
+                except (configparser.Error, ValueError) as e:
+                    _logger.warn("Ignorando %s: %s", path, e)
+            _matcher = HintMatcher(hints)
+        return _matcher
+
+
+def reload_hints():
+    global _matcher
+    with _matcher_lock:
+        _matcher = None
+    return get_hint_matcher()
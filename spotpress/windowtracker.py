@@ -0,0 +1,305 @@
+import os
+import shutil
+import subprocess
+import threading
+
+from spotpress.x11windows import get_backend, open_backend, parse_window_ids
+
+
+class WindowTracker:
+    """
+    Mantém em memória as janelas de topo (_NET_CLIENT_LIST) com WM_CLASS e
+    título, de forma que as buscas feitas pelos drivers não disparam
+    processos nem idas ao servidor X.
+
+    Com o backend xcb, uma thread recebe PropertyNotify da raiz e das
+    janelas (títulos); com o fallback, acompanha `xprop -spy -root` e
+    atualiza apenas as janelas novas ou a que acabou de ficar ativa.
+    """
+
+    SPY_COMMAND = [
+        "xprop",
+        "-spy",
+        "-root",
+        "_NET_CLIENT_LIST",
+        "_NET_ACTIVE_WINDOW",
+    ]
+
+    def __init__(self, backend, query_backend=None):
+        self._backend = backend
+        # refresh()/activate() vêm das threads dos drivers: com uma conexão
+        # própria para a thread do tracker, elas não disputam a mesma
+        # conexão xcb (respostas e eventos) com wait_for_changes
+        self._query = query_backend or backend
+        self._lock = threading.Lock()
+        self._windows = {}
+        # Índice das janelas em tela cheia, para special_windows()
+        self._fullscreen = set()
+        self._active = None
+        self._proc = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.updates = 0
+
+    @classmethod
+    def available(cls):
+        return bool(os.environ.get("DISPLAY"))
+
+    @property
+    def running(self):
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        return self._backend.can_watch or (
+            self._proc is not None and self._proc.poll() is None
+        )
+
+    def start(self):
+        if self.running:
+            return True
+        self._stop.clear()
+        if self._backend.can_watch:
+            self._thread = threading.Thread(
+                target=self._run_native, daemon=True, name="window_tracker"
+            )
+            self._thread.start()
+            return True
+        if shutil.which("xprop") is None:
+            return False
+        try:
+            self._proc = subprocess.Popen(
+                self.SPY_COMMAND,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except OSError:
+            self._proc = None
+            return False
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="window_tracker"
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        proc = self._proc
+        self._proc = None
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _run(self):
+        proc = self._proc
+        for line in proc.stdout:
+            self.handle_line(line)
+
+    def _run_native(self):
+        backend = self._backend
+        backend.watch(backend.root)
+        self.update_clients(backend.client_list())
+        self.set_active(backend.active_window())
+        title_atoms = (backend.NET_WM_NAME, backend.WM_NAME, backend.NET_WM_STATE)
+        try:
+            while not self._stop.is_set():
+                changes = backend.wait_for_changes(0.2)
+                clients = active = False
+                titles = set()
+                for window, atom in changes:
+                    if window == backend.root:
+                        clients |= atom == backend.NET_CLIENT_LIST
+                        active |= atom == backend.NET_ACTIVE_WINDOW
+                    elif atom in title_atoms:
+                        titles.add(window)
+                if clients:
+                    self.update_clients(backend.client_list())
+                if active:
+                    self.set_active(backend.active_window())
+                for wid in titles:
+                    self._refresh(wid, backend)
+        except OSError:
+            pass
+
+    def handle_line(self, line):
+        if line.startswith("_NET_CLIENT_LIST("):
+            self.update_clients(parse_window_ids(line))
+        elif line.startswith("_NET_ACTIVE_WINDOW("):
+            ids = parse_window_ids(line)
+            self.set_active(ids[0] if ids and ids[0] else None)
+
+    def update_clients(self, wids):
+        with self._lock:
+            known = dict(self._windows)
+        # Consulta fora do lock: só janelas que ainda não estão no cache
+        new = [wid for wid in wids if wid not in known]
+        if new:
+            if self._backend.can_watch:
+                # Passa a receber as mudanças de título das janelas novas
+                for wid in new:
+                    self._backend.watch(wid)
+            for info in self._backend.query_windows(new):
+                known[info.wid] = info
+        with self._lock:
+            self._windows = {wid: known[wid] for wid in wids if wid in known}
+            self._fullscreen = {
+                wid for wid, info in self._windows.items() if info.fullscreen
+            }
+            self.updates += 1
+
+    def set_active(self, wid):
+        self._active = wid
+        # O título costuma mudar com a janela em uso (documento aberto,
+        # apresentação iniciada); atualiza só a janela ativa
+        if wid is not None and wid in self._windows:
+            self._refresh(wid, self._backend)
+
+    def refresh(self, wid):
+        return self._refresh(wid, self._query)
+
+    def _refresh(self, wid, backend):
+        info = backend.query_window(wid)
+        if info is None:
+            return None
+        with self._lock:
+            if wid in self._windows:
+                self._windows[wid] = info
+                if info.fullscreen:
+                    self._fullscreen.add(wid)
+                else:
+                    self._fullscreen.discard(wid)
+        return info
+
+    def activate(self, wid):
+        return self._query.activate(wid)
+
+    @property
+    def active_window(self):
+        return self._active
+
+    def windows(self):
+        with self._lock:
+            return list(self._windows.values())
+
+    def special_windows(self):
+        """Janelas em tela cheia e a ativa (ver HintMatcher.best_window)."""
+        with self._lock:
+            special = [self._windows[wid] for wid in self._fullscreen]
+            active = self._windows.get(self._active)
+        if active is not None:
+            special.append(active)
+        return special
+
+    def windows_for_class(self, class_name):
+        class_name = class_name.lower()
+        with self._lock:
+            return [
+                info
+                for info in self._windows.values()
+                if any(class_name in c for c in info.wm_class)
+            ]
+
+
+_tracker = None
+
+
+def start_window_tracker():
+    global _tracker
+    if _tracker is None and WindowTracker.available():
+        shared = get_backend()
+        if shared is None:
+            return None
+        backend = shared
+        if shared.can_watch:
+            # A thread do tracker fica com uma conexão só dela
+            backend = open_backend()
+            if backend is None or not backend.can_watch:
+                return None
+        tracker = WindowTracker(backend, shared)
+        if tracker.start():
+            _tracker = tracker
+        elif backend is not shared:
+            backend.close()
+    return _tracker
+
+
+def stop_window_tracker():
+    global _tracker
+    if _tracker is not None:
+        _tracker.stop()
+        if _tracker._backend is not _tracker._query:
+            _tracker._backend.close()
+        _tracker = None
+
+
+def get_window_tracker():
+    """Retorna o tracker se estiver rodando, senão None (usar subprocess)."""
+    if _tracker is not None and _tracker.running:
+        return _tracker
+    return None
+
+
+class WindowSnapshot:
+    """
+    Lista de janelas lida na hora, com a mesma interface de consulta do
+    WindowTracker. Usada quando o tracker não está rodando mas o backend
+    nativo está disponível.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+        self._windows = {
+            info.wid: info for info in backend.query_windows(backend.client_list())
+        }
+        self._active = backend.active_window()
+
+    def windows(self):
+        return list(self._windows.values())
+
+    def special_windows(self):
+        special = [info for info in self._windows.values() if info.fullscreen]
+        active = self._windows.get(self._active)
+        if active is not None:
+            special.append(active)
+        return special
+
+    def windows_for_class(self, class_name):
+        class_name = class_name.lower()
+        return [
+            info
+            for info in self._windows.values()
+            if any(class_name in c for c in info.wm_class)
+        ]
+
+    def refresh(self, wid):
+        return self._windows.get(wid)
+
+    @property
+    def active_window(self):
+        return self._active
+
+    def activate(self, wid):
+        return self._backend.activate(wid)
+
+
+def get_window_source():
+    """
+    Fonte das consultas de janelas: o tracker em memória, um snapshot via
+    xcb ou None quando só resta o caminho antigo com xdotool/xprop.
+    """
+    tracker = get_window_tracker()
+    if tracker is not None:
+        return tracker
+    backend = get_backend()
+    if backend is not None and backend.can_watch:
+        try:
+            return WindowSnapshot(backend)
+        except OSError:
+            return None
+    return None
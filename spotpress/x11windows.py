@@ -0,0 +1,432 @@
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import shutil
+import struct
+import subprocess
+import threading
+from collections import namedtuple
+
+WindowInfo = namedtuple(
+    "WindowInfo", "wid wm_class name fullscreen", defaults=(False,)
+)
+
+# Átomos pré-definidos do protocolo X11
+ATOM_ANY = 0
+ATOM_STRING = 31
+ATOM_WINDOW = 33
+ATOM_WM_NAME = 39
+ATOM_WM_CLASS = 67
+
+XCB_PROP_MODE_REPLACE = 0
+XCB_CW_EVENT_MASK = 2048
+XCB_EVENT_MASK_SUBSTRUCTURE_NOTIFY = 1 << 19
+XCB_EVENT_MASK_SUBSTRUCTURE_REDIRECT = 1 << 20
+XCB_EVENT_MASK_PROPERTY_CHANGE = 1 << 22
+XCB_PROPERTY_NOTIFY = 28
+XCB_CLIENT_MESSAGE = 33
+
+# Valores longos o suficiente para títulos e listas de janelas (em words)
+_MAX_PROPERTY_LENGTH = 4096
+
+_WINDOW_ID_RE = re.compile(r"0x[0-9a-fA-F]+")
+_QUOTED_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+def parse_window_ids(line):
+    # _NET_CLIENT_LIST(WINDOW): window id # 0x1a00003, 0x2200007
+    if "#" not in line:
+        return []
+    return [int(x, 16) for x in _WINDOW_ID_RE.findall(line.split("#", 1)[1])]
+
+
+def split_wm_class(value):
+    # WM_CLASS: "instância\0classe\0"
+    return tuple(v.lower() for v in value.decode("latin-1").split("\0") if v)
+
+
+class _Cookie(ctypes.Structure):
+    _fields_ = [("sequence", ctypes.c_uint)]
+
+
+class _ScreenIterator(ctypes.Structure):
+    _fields_ = [
+        ("data", ctypes.c_void_p),
+        ("rem", ctypes.c_int),
+        ("index", ctypes.c_int),
+    ]
+
+
+class _InternAtomReply(ctypes.Structure):
+    _fields_ = [
+        ("response_type", ctypes.c_uint8),
+        ("pad0", ctypes.c_uint8),
+        ("sequence", ctypes.c_uint16),
+        ("length", ctypes.c_uint32),
+        ("atom", ctypes.c_uint32),
+    ]
+
+
+class _PropertyNotifyEvent(ctypes.Structure):
+    _fields_ = [
+        ("response_type", ctypes.c_uint8),
+        ("pad0", ctypes.c_uint8),
+        ("sequence", ctypes.c_uint16),
+        ("window", ctypes.c_uint32),
+        ("atom", ctypes.c_uint32),
+        ("time", ctypes.c_uint32),
+        ("state", ctypes.c_uint8),
+    ]
+
+
+def _load_xcb():
+    path = ctypes.util.find_library("xcb") or "libxcb.so.1"
+    xcb = ctypes.CDLL(path)
+    c_p = ctypes.c_void_p
+    u8, u16, u32 = ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint32
+
+    signatures = {
+        "xcb_connect": (c_p, [ctypes.c_char_p, ctypes.POINTER(ctypes.c_int)]),
+        "xcb_connection_has_error": (ctypes.c_int, [c_p]),
+        "xcb_disconnect": (None, [c_p]),
+        "xcb_flush": (ctypes.c_int, [c_p]),
+        "xcb_get_file_descriptor": (ctypes.c_int, [c_p]),
+        "xcb_get_setup": (c_p, [c_p]),
+        "xcb_setup_roots_iterator": (_ScreenIterator, [c_p]),
+        "xcb_screen_next": (None, [ctypes.POINTER(_ScreenIterator)]),
+        "xcb_intern_atom": (_Cookie, [c_p, u8, u16, ctypes.c_char_p]),
+        "xcb_intern_atom_reply": (c_p, [c_p, _Cookie, c_p]),
+        "xcb_get_property": (_Cookie, [c_p, u8, u32, u32, u32, u32, u32]),
+        "xcb_get_property_reply": (c_p, [c_p, _Cookie, c_p]),
+        "xcb_get_property_value": (c_p, [c_p]),
+        "xcb_get_property_value_length": (ctypes.c_int, [c_p]),
+        "xcb_change_property": (_Cookie, [c_p, u8, u32, u32, u32, u8, u32, c_p]),
+        "xcb_change_window_attributes": (_Cookie, [c_p, u32, u32, c_p]),
+        "xcb_send_event": (_Cookie, [c_p, u8, u32, u32, ctypes.c_char_p]),
+        "xcb_poll_for_event": (c_p, [c_p]),
+        "xcb_generate_id": (u32, [c_p]),
+    }
+    for name, (restype, argtypes) in signatures.items():
+        func = getattr(xcb, name)
+        func.restype = restype
+        func.argtypes = argtypes
+    return xcb
+
+
+_libc = ctypes.CDLL(None)
+_libc.free.argtypes = [ctypes.c_void_p]
+_libc.free.restype = None
+
+
+class XcbBackend:
+    """
+    Consulta e ativa janelas direto no servidor X via libxcb (ctypes).
+
+    As requisições de propriedades de todas as janelas são enviadas antes
+    de ler a primeira resposta, então consultar N janelas custa uma única
+    ida e volta ao servidor, sem processos externos.
+    """
+
+    can_watch = True
+
+    def __init__(self, display=None):
+        self._xcb = _load_xcb()
+        screen_num = ctypes.c_int(0)
+        name = display.encode() if display else None
+        self._conn = self._xcb.xcb_connect(name, ctypes.byref(screen_num))
+        if not self._conn or self._xcb.xcb_connection_has_error(self._conn):
+            if self._conn:
+                self._xcb.xcb_disconnect(self._conn)
+            self._conn = None
+            raise OSError("Não foi possível conectar ao servidor X via xcb")
+
+        it = self._xcb.xcb_setup_roots_iterator(self._xcb.xcb_get_setup(self._conn))
+        for _ in range(screen_num.value):
+            self._xcb.xcb_screen_next(ctypes.byref(it))
+        # xcb_screen_t começa com o id da janela raiz
+        self.root = ctypes.c_uint32.from_address(it.data).value
+
+        atoms = self.intern_atoms(
+            [
+                "_NET_CLIENT_LIST",
+                "_NET_ACTIVE_WINDOW",
+                "_NET_WM_NAME",
+                "_NET_WM_STATE",
+                "_NET_WM_STATE_FULLSCREEN",
+                "UTF8_STRING",
+            ]
+        )
+        self.NET_CLIENT_LIST = atoms["_NET_CLIENT_LIST"]
+        self.NET_ACTIVE_WINDOW = atoms["_NET_ACTIVE_WINDOW"]
+        self.NET_WM_NAME = atoms["_NET_WM_NAME"]
+        self.NET_WM_STATE = atoms["_NET_WM_STATE"]
+        self.NET_WM_STATE_FULLSCREEN = atoms["_NET_WM_STATE_FULLSCREEN"]
+        self.UTF8_STRING = atoms["UTF8_STRING"]
+        self.WM_NAME = ATOM_WM_NAME
+        self.WM_CLASS = ATOM_WM_CLASS
+
+    def close(self):
+        if self._conn:
+            self._xcb.xcb_disconnect(self._conn)
+            self._conn = None
+
+    def intern_atoms(self, names):
+        xcb = self._xcb
+        cookies = [
+            (name, xcb.xcb_intern_atom(self._conn, 0, len(name), name.encode()))
+            for name in names
+        ]
+        atoms = {}
+        for name, cookie in cookies:
+            reply = xcb.xcb_intern_atom_reply(self._conn, cookie, None)
+            if reply:
+                atoms[name] = _InternAtomReply.from_address(reply).atom
+                _libc.free(reply)
+        return atoms
+
+    def _request_property(self, window, prop, prop_type=ATOM_ANY):
+        return self._xcb.xcb_get_property(
+            self._conn, 0, window, prop, prop_type, 0, _MAX_PROPERTY_LENGTH
+        )
+
+    def _property_reply(self, cookie):
+        xcb = self._xcb
+        reply = xcb.xcb_get_property_reply(self._conn, cookie, None)
+        if not reply:
+            return None
+        try:
+            size = xcb.xcb_get_property_value_length(reply)
+            if size <= 0:
+                return None
+            return ctypes.string_at(xcb.xcb_get_property_value(reply), size)
+        finally:
+            _libc.free(reply)
+
+    def get_property(self, window, prop, prop_type=ATOM_ANY):
+        return self._property_reply(self._request_property(window, prop, prop_type))
+
+    def _window_list(self, prop):
+        value = self.get_property(self.root, prop, ATOM_WINDOW)
+        if not value:
+            return []
+        return list(struct.unpack(f"={len(value) // 4}I", value[: len(value) // 4 * 4]))
+
+    def client_list(self):
+        return self._window_list(self.NET_CLIENT_LIST)
+
+    def active_window(self):
+        wids = self._window_list(self.NET_ACTIVE_WINDOW)
+        return wids[0] if wids and wids[0] else None
+
+    def query_windows(self, wids):
+        """WM_CLASS e título de todas as janelas em uma ida e volta."""
+        props = (self.WM_CLASS, self.NET_WM_NAME, self.WM_NAME, self.NET_WM_STATE)
+        cookies = [
+            (wid, [self._request_property(wid, prop) for prop in props])
+            for wid in wids
+        ]
+        fullscreen_atom = struct.pack("=I", self.NET_WM_STATE_FULLSCREEN)
+        result = []
+        for wid, (c_class, c_net_name, c_name, c_state) in cookies:
+            wm_class = self._property_reply(c_class)
+            net_name = self._property_reply(c_net_name)
+            name = self._property_reply(c_name)
+            state = self._property_reply(c_state) or b""
+            title = net_name.decode("utf-8", "replace") if net_name else ""
+            if not title and name:
+                title = name.decode("latin-1")
+            fullscreen = any(
+                state[i : i + 4] == fullscreen_atom for i in range(0, len(state), 4)
+            )
+            result.append(
+                WindowInfo(
+                    wid,
+                    split_wm_class(wm_class) if wm_class else (),
+                    title,
+                    fullscreen,
+                )
+            )
+        return result
+
+    def query_window(self, wid):
+        return self.query_windows([wid])[0]
+
+    def activate(self, wid):
+        # Mensagem _NET_ACTIVE_WINDOW para o window manager (EWMH), com
+        # origem 2 (pager) para não ser barrada pela prevenção de roubo de foco
+        event = struct.pack(
+            "=BBHII5I",
+            XCB_CLIENT_MESSAGE,
+            32,
+            0,
+            wid,
+            self.NET_ACTIVE_WINDOW,
+            2,
+            0,
+            self.active_window() or 0,
+            0,
+            0,
+        )
+        self._xcb.xcb_send_event(
+            self._conn,
+            0,
+            self.root,
+            XCB_EVENT_MASK_SUBSTRUCTURE_NOTIFY | XCB_EVENT_MASK_SUBSTRUCTURE_REDIRECT,
+            event,
+        )
+        self._xcb.xcb_flush(self._conn)
+        return True
+
+    def change_property(self, window, prop, prop_type, fmt, data):
+        count = len(data) // (fmt // 8)
+        self._xcb.xcb_change_property(
+            self._conn,
+            XCB_PROP_MODE_REPLACE,
+            window,
+            prop,
+            prop_type,
+            fmt,
+            count,
+            data,
+        )
+        self._xcb.xcb_flush(self._conn)
+
+    def watch(self, window):
+        """Passa a receber PropertyNotify da janela."""
+        mask = ctypes.c_uint32(XCB_EVENT_MASK_PROPERTY_CHANGE)
+        self._xcb.xcb_change_window_attributes(
+            self._conn, window, XCB_CW_EVENT_MASK, ctypes.byref(mask)
+        )
+        self._xcb.xcb_flush(self._conn)
+
+    def wait_for_changes(self, timeout):
+        """
+        Espera até `timeout` segundos por PropertyNotify e retorna a lista
+        de pares (janela, átomo) alterados.
+        """
+        xcb = self._xcb
+        changes = self._poll_changes()
+        if changes:
+            return changes
+        fd = xcb.xcb_get_file_descriptor(self._conn)
+        select.select([fd], [], [], timeout)
+        return self._poll_changes()
+
+    def _poll_changes(self):
+        xcb = self._xcb
+        changes = []
+        while True:
+            event = xcb.xcb_poll_for_event(self._conn)
+            if not event:
+                break
+            ev = _PropertyNotifyEvent.from_address(event)
+            if ev.response_type & 0x7F == XCB_PROPERTY_NOTIFY:
+                changes.append((ev.window, ev.atom))
+            _libc.free(event)
+        if xcb.xcb_connection_has_error(self._conn):
+            raise OSError("Conexão com o servidor X perdida")
+        return changes
+
+
+class SubprocessBackend:
+    """Fallback com xprop/xdotool, um processo por consulta."""
+
+    can_watch = False
+
+    @classmethod
+    def available(cls):
+        return shutil.which("xprop") is not None
+
+    def close(self):
+        pass
+
+    def client_list(self):
+        try:
+            output = subprocess.run(
+                ["xprop", "-root", "_NET_CLIENT_LIST"],
+                capture_output=True,
+                text=True,
+                timeout=1,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return []
+        return parse_window_ids(output)
+
+    def query_window(self, wid):
+        """Lê WM_CLASS e título de uma janela com um único xprop."""
+        try:
+            output = subprocess.run(
+                [
+                    "xprop",
+                    "-id",
+                    hex(wid),
+                    "WM_CLASS",
+                    "_NET_WM_NAME",
+                    "WM_NAME",
+                    "_NET_WM_STATE",
+                ],
+                capture_output=True,
+                text=True,
+                timeout=1,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        wm_class = ()
+        net_name = name = ""
+        fullscreen = False
+        for line in output.splitlines():
+            values = _QUOTED_RE.findall(line)
+            if line.startswith("WM_CLASS("):
+                wm_class = tuple(v.lower() for v in values)
+            elif line.startswith("_NET_WM_NAME(") and values:
+                net_name = values[0]
+            elif line.startswith("WM_NAME(") and values:
+                name = values[0]
+            elif line.startswith("_NET_WM_STATE("):
+                fullscreen = "_NET_WM_STATE_FULLSCREEN" in line
+        return WindowInfo(wid, wm_class, net_name or name, fullscreen)
+
+    def query_windows(self, wids):
+        infos = (self.query_window(wid) for wid in wids)
+        return [info for info in infos if info is not None]
+
+    def activate(self, wid):
+        try:
+            result = subprocess.run(["xdotool", "windowactivate", hex(wid)])
+            return result.returncode == 0
+        except OSError:
+            return False
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def open_backend(display=None):
+    """Abre o backend nativo; se não houver libxcb ou servidor, o fallback."""
+    if display or os.environ.get("DISPLAY"):
+        try:
+            return XcbBackend(display)
+        except OSError:
+            pass
+    if SubprocessBackend.available():
+        return SubprocessBackend()
+    return None
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = open_backend()
+        return _backend
+
+
+def close_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+            _backend = None
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import sys
-import subprocess
 import os
-from spotpress.ipc import send_command_to_existing_instance
-from spotpress.utils import MODES_CMD_LINE_MAP
+import json
+from spotpress.ipcclient import IpcClient, send_command
+from spotpress.ipcprotocol import CommandError
+from spotpress.modes import MODES_CMD_LINE_MAP
 
 VALID_BASE_COMMANDS = {
     "--show-window",
@@ -12,6 +13,15 @@ VALID_BASE_COMMANDS = {
     "--set-auto-mode=on",
     "--set-auto-mode=off",
     "--start",
+    "--stop-recording",
+}
+
+QUERY_COMMANDS = {
+    "--get-mode",
+    "--get-active-device",
+    "--get-devices",
+    "--get-config",
+    "--get-stats",
 }
 
 
@@ -26,19 +36,36 @@ def print_usage():
         "  --set-mode=MODE         Set mode to one of: mouse, spotlight, laser, pen, mag_glass or 0-4"
     )
     print("  --set-auto-mode=on|off  Enable or disable automatic mode switching")
+    print("  --record=FILE           Record raw device input to FILE")
+    print("  --stop-recording        Stop recording device input")
+    print("  --get-mode              Print the current mode as JSON")
+    print("  --get-active-device     Print the active device as JSON")
+    print("  --get-devices           Print the monitored devices as JSON")
+    print("  --get-config[=KEY]      Print the configuration (or one key) as JSON")
+    print("  --get-stats             Print overlay frame-time statistics as JSON")
+    print("  --subscribe[=EVENTS]    Print events as JSON lines until interrupted")
     sys.exit(1)
 
 
 def is_valid_command(command):
-    if command in VALID_BASE_COMMANDS:
+    if command in VALID_BASE_COMMANDS or command in QUERY_COMMANDS:
+        return True
+    if command.startswith("--get-config="):
+        return bool(command.split("=", 1)[1].strip())
+    if command == "--subscribe" or command.startswith("--subscribe="):
         return True
     if command.startswith("--set-mode="):
         mode = command.split("=", 1)[1].strip().lower()
         return mode in MODES_CMD_LINE_MAP
+    if command.startswith("--record="):
+        return bool(command.split("=", 1)[1].strip())
     return False
 
 
 def launch_spotpress():
+    # Importado aqui: só o --start precisa, e subprocess pesa na partida
+    import subprocess
+
     try:
         base_dir = os.path.dirname(os.path.realpath(__file__))
         main_script = os.path.join(base_dir, "main.py")
@@ -59,6 +86,27 @@ def launch_spotpress():
         return False
 
 
+def run_query(command):
+    """Envia uma consulta (ou --subscribe) e imprime o resultado em JSON."""
+    with IpcClient() as client:
+        if not client.connected:
+            return None
+        try:
+            result = client.request(command)
+        except (CommandError, TimeoutError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        if not command.startswith("--subscribe"):
+            print(json.dumps(result, ensure_ascii=False))
+            return 0
+        try:
+            for event in client.events():
+                print(json.dumps(event, ensure_ascii=False), flush=True)
+        except (KeyboardInterrupt, ConnectionError):
+            pass
+        return 0
+
+
 def main():
     if len(sys.argv) <= 1:
         print_usage()
@@ -70,15 +118,25 @@ def main():
         print_usage()
 
     if command == "--start":
-        if send_command_to_existing_instance("--ping"):
+        if send_command("--ping"):
             print("SpotPress is already running.")
             sys.exit(0)
         else:
             success = launch_spotpress()
             sys.exit(0 if success else 1)
 
-    if send_command_to_existing_instance(command):
-        sys.exit(0)
+    if command.startswith("--record="):
+        # O arquivo é aberto pela instância em execução, em outro diretório
+        path = command.split("=", 1)[1].strip()
+        command = "--record=" + os.path.abspath(os.path.expanduser(path))
+
+    if command.startswith(("--get-", "--subscribe")):
+        status = run_query(command)
+    else:
+        status = 0 if send_command(command) else None
+
+    if status is not None:
+        sys.exit(status)
     else:
         print("SpotPress is not running. Use spotpressctl --start to run SpotPress")
         sys.exit(1)